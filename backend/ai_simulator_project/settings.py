@@ -103,6 +103,24 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": False,
 }
 
+# Pathfinding result cache - in-process LRU bounded in bytes, optionally shared
+# across workers through a Django cache alias from CACHES (e.g. a Redis cache)
+ALGORITHM_RESULT_CACHE = {
+    "MAX_BYTES": int(
+        os.environ.get("ALGORITHM_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    ),
+    "BACKEND": os.environ.get("ALGORITHM_RESULT_CACHE_BACKEND") or None,
+    "TIMEOUT": int(os.environ.get("ALGORITHM_RESULT_CACHE_TIMEOUT", 3600)),
+}
+
+# Longest a single pathfinding search may run before it is stopped and its
+# best answer so far returned; requests can ask for less with time_budget_ms
+ALGORITHM_TIME_BUDGET_MS = (
+    int(os.environ["ALGORITHM_TIME_BUDGET_MS"])
+    if os.environ.get("ALGORITHM_TIME_BUDGET_MS")
+    else None
+)
+
 # CORS Settings - Allow all origins in development
 CORS_ALLOW_ALL_ORIGINS = True  # For development only
 CORS_ALLOW_CREDENTIALS = True
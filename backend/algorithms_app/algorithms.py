@@ -2,28 +2,130 @@
 Algorithm implementations for pathfinding and search
 """
 
+import heapq
 import math
+import random
+import sys
 from collections import deque
-from heapq import heappop, heappush
+from contextlib import closing
+from functools import cached_property
+
+import numpy as np
+
+from .budget import SearchBudget, SearchBudgetExceeded
+from .cost_model import choose_algorithm
+from .flow_field import flow_field
+from .genetic import (
+    GA_GENERATIONS,
+    GA_MUTATION_RATE,
+    GA_POPULATION_SIZE,
+    GeneticPathEngine,
+)
+from .grid_engine import UNREACHABLE, GridEngine
+from .hierarchy import abstract_graph, cluster_search
+from .landmarks import landmark_table
+from .local_search import hill_climbing_batch, simulated_annealing_batch
+from .multi_agent import plan_agents
+from .priority_queues import BucketQueue, FifoQueue, IndexedHeap
+from .search_state import INT32_MAX, NO_PARENT, SearchState
+from .step_trace import EXPLORING, FORWARD, VISITING, StepTrace, encode_trace
+
+# Steps per chunk when a search is streamed
+STREAM_CHUNK_STEPS = 5000
+
+# Largest terrain cost for which Dial's bucket queue is used instead of a heap
+BUCKET_QUEUE_MAX_COST = 1024
+
+# ARA* starts at this heuristic inflation and lowers it by the step each search
+ARA_INITIAL_EPSILON = 3.0
+ARA_EPSILON_STEP = 0.5
+
+# Cap on the cells IDA*'s transposition table remembers
+IDA_TRANSPOSITION_ENTRIES = 1 << 20
+
+# Per-algorithm tuning accepted by run_algorithm and passed as ``options``
+RUNNER_OPTIONS = (
+    "population_size",
+    "generations",
+    "mutation_rate",
+    "workers",
+    "restarts",
+    "epsilon",
+    "time_budget_ms",
+    "max_nodes",
+)
 
 
 class AlgorithmRunner:
-    """Main class to execute different search algorithms"""
-
-    def __init__(self, algorithm, grid, start, goal, heuristic="manhattan"):
+    """Main class to execute different search algorithms
+
+    The grid is held by a :class:`GridEngine` and every search works on flat
+    integer cell ids; positions are only converted back to ``[row, col]``
+    lists when the result is built. ``grid`` may also be an already built
+    engine, which runners on the same grid can share.
+    """
+
+    def __init__(
+        self,
+        algorithm,
+        grid,
+        start,
+        goal,
+        heuristic="manhattan",
+        trace_format="steps",
+        seed=None,
+        options=None,
+    ):
         self.algorithm = algorithm
         self.grid = grid
-        self.start = start
-        self.goal = goal
+        self.engine = grid if isinstance(grid, GridEngine) else GridEngine(grid)
+        self.rows = self.engine.rows
+        self.cols = self.engine.cols
         self.heuristic_type = heuristic
-        self.rows = len(grid)
-        self.cols = len(grid[0]) if grid else 0
+        self.trace_format = trace_format
+        # Stochastic searches draw from this generator; a seed makes them
+        # reproducible
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.options = options or {}
+        self.budget = SearchBudget.from_options(self.options)
+        self.chunk_size = sys.maxsize
+        self.landmarks = None
+        # Set when ``auto`` picks the algorithm; see cost_model.choose_algorithm
+        self.selection = None
+
+        for name, pos in (("start", start), ("goal", goal)):
+            if not self.engine.contains(pos):
+                raise ValueError(
+                    f"{name.capitalize()} position {list(pos)} is outside the grid"
+                )
+        self.start = self.engine.to_id(start)
+        self.goal = self.engine.to_id(goal)
+        self.goal_row, self.goal_col = divmod(self.goal, self.cols)
+
+    def search(self):
+        """Start the selected search as a generator
+
+        Every search is a generator that yields its :class:`StepTrace` each
+        time ``chunk_size`` steps are buffered and returns the result dict.
+        Searches may also yield between those points; :meth:`run` uses every
+        yield to check the budget. ``auto`` first picks the optimal engine
+        the cost model predicts to be fastest on this grid.
+        """
+        if self.algorithm == "auto":
+            self.selection = choose_algorithm(self.engine, self.start, self.goal)
+            self.algorithm = self.selection["algorithm"]
 
-    def execute(self):
-        """Execute the selected algorithm"""
         algorithm_map = {
             "astar": self.astar,
+            "ara_star": self.ara_star,
+            "ida_star": self.ida_star,
+            "fringe": self.fringe,
+            "jps": self.jps,
+            "hpa": self.hpa,
             "bfs": self.bfs,
+            "bidirectional_bfs": self.bidirectional_bfs,
+            "bidirectional_astar": self.bidirectional_astar,
             "dfs": self.dfs,
             "dijkstra": self.dijkstra,
             "hill_climbing": self.hill_climbing,
@@ -37,245 +139,1469 @@ class AlgorithmRunner:
 
         return algo_func()
 
-    def get_neighbors(self, pos):
+    def execute(self):
+        """Execute the selected algorithm"""
+        run = self.run()
+        try:
+            while True:
+                next(run)
+        except StopIteration as stop:
+            return stop.value
+
+    def stream(self, chunk_size=STREAM_CHUNK_STEPS):
+        """Execute the selected algorithm, yielding events as steps are produced
+
+        Yields ``{"event": "steps", ...}`` records of roughly ``chunk_size``
+        steps each (encoded in the configured ``trace_format``) while the
+        search runs, then a final ``{"event": "result", ...}`` summary that
+        carries no steps. Only one chunk of steps is held in memory at a time.
+        """
+        run = self.run(chunk_size)
+        streamed = 0
+        while True:
+            try:
+                chunk = next(run)
+            except StopIteration as stop:
+                result = stop.value
+                break
+            streamed += len(chunk)
+            yield {"event": "steps", **self.encode_steps(chunk)}
+
+        # Steps recorded after the last full chunk are encoded in the result
+        last_chunk = {
+            key: result.pop(key) for key in ("steps", "trace") if key in result
+        }
+        if result["nodes_explored"] > streamed:
+            yield {"event": "steps", **last_chunk}
+        yield {"event": "result", **result}
+
+    def run(self, chunk_size=sys.maxsize):
+        """Drive the search, yielding drained chunks of ``chunk_size`` steps
+
+        Returns the result dict. With a budget the search is paused at least
+        every ``BUDGET_CHECK_STEPS`` steps to check it; once it runs out,
+        :class:`SearchBudgetExceeded` is thrown into the search, and a search
+        that does not return a partial answer is reported as finding no path.
+        """
+        budget = self.budget
+        self.chunk_size = chunk_size
+        if budget is not None:
+            budget.start()
+            self.chunk_size = min(chunk_size, budget.steps_until_check(0))
+        search = self.search()
+        trace = None
+        exceeded = None
+        while True:
+            try:
+                if exceeded is None:
+                    trace = next(search)
+                else:
+                    trace, exceeded = search.throw(exceeded), None
+            except StopIteration as stop:
+                result = stop.value
+                break
+            except SearchBudgetExceeded:
+                result = self.build_result(False, None, trace, 0)
+                break
+
+            if len(trace.cells) >= chunk_size:
+                yield trace.drain()
+            trace.chunk_size = chunk_size
+            if budget is not None and budget.exhausted is None:
+                try:
+                    budget.check(len(trace))
+                except SearchBudgetExceeded as error:
+                    exceeded = error
+                trace.chunk_size = min(
+                    chunk_size,
+                    len(trace.cells) + budget.steps_until_check(len(trace)),
+                )
+
+        if budget is not None:
+            result["budget"] = budget.report()
+        if self.selection is not None:
+            result["selection"] = self.selection
+        return result
+
+    def new_trace(self, sided=False):
+        """Create the step trace a search records into"""
+        return StepTrace(sided=sided, chunk_size=self.chunk_size)
+
+    def get_neighbors(self, cell):
         """Get valid neighboring cells (4-directional)"""
-        row, col = pos
-        neighbors = []
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Right, Down, Left, Up
-
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if (
-                0 <= new_row < self.rows
-                and 0 <= new_col < self.cols
-                and self.grid[new_row][new_col] != 1
-            ):  # 1 represents obstacle
-                neighbors.append((new_row, new_col))
-
-        return neighbors
-
-    def heuristic(self, pos):
+        return self.engine.neighbors(cell)
+
+    def heuristic(self, cell):
         """Calculate heuristic distance to goal"""
+        if self.heuristic_type == "alt":
+            return self.alt_bounds[cell]
+        row, col = divmod(cell, self.cols)
         if self.heuristic_type == "manhattan":
-            return abs(pos[0] - self.goal[0]) + abs(pos[1] - self.goal[1])
+            return abs(row - self.goal_row) + abs(col - self.goal_col)
         elif self.heuristic_type == "euclidean":
-            return math.sqrt(
-                (pos[0] - self.goal[0]) ** 2 + (pos[1] - self.goal[1]) ** 2
-            )
+            return math.sqrt((row - self.goal_row) ** 2 + (col - self.goal_col) ** 2)
         return 0
 
-    def reconstruct_path(self, came_from, current):
-        """Reconstruct path from start to goal"""
-        path = [list(current)]
-        while current in came_from:
-            current = came_from[current]
-            if current is None:
-                break
-            path.append(list(current))
+    def heuristic_values(self):
+        """The configured heuristic towards the goal for every cell, as floats"""
+        if self.heuristic_type == "alt":
+            return np.asarray(self.alt_bounds, dtype=np.float64)
+        distances = self.engine.manhattan_distances(self.goal)
+        if self.heuristic_type == "manhattan":
+            return distances.astype(np.float64)
+        elif self.heuristic_type == "euclidean":
+            rows, cols = np.divmod(np.arange(self.engine.size), self.cols)
+            return np.hypot(rows - self.goal_row, cols - self.goal_col)
+        return np.zeros(self.engine.size)
+
+    @cached_property
+    def alt_bounds(self):
+        """Per-cell ALT lower bounds on the cost to the goal"""
+        return self.landmark_bounds(self.goal)
+
+    def landmark_bounds(self, cell, towards=True):
+        """ALT lower bounds on d(v, cell), or d(cell, v), for every cell v
+
+        Landmark tables come from the per-grid cache; the bounds are never
+        below the Manhattan distance, which is also admissible here.
+        """
+        table = landmark_table(self.engine)
+        self.landmarks = table.landmarks
+        bounds = np.maximum(
+            table.lower_bounds(cell, towards), self.engine.manhattan_distances(cell)
+        )
+        return bounds.astype(np.int32).data
+
+    def heuristic_towards(self, target, towards=True):
+        """Heuristic of the configured type towards an arbitrary target cell
+
+        ``towards=False`` estimates the cost *from* ``target`` instead, which
+        only matters for the ALT heuristic on weighted grids.
+        """
+        cols = self.cols
+        target_row, target_col = divmod(target, cols)
+        if self.heuristic_type == "alt":
+            return self.landmark_bounds(target, towards).__getitem__
+        elif self.heuristic_type == "manhattan":
+
+            def estimate(cell):
+                row, col = divmod(cell, cols)
+                return abs(row - target_row) + abs(col - target_col)
+
+        elif self.heuristic_type == "euclidean":
+
+            def estimate(cell):
+                row, col = divmod(cell, cols)
+                return math.sqrt((row - target_row) ** 2 + (col - target_col) ** 2)
+
+        else:
+
+            def estimate(cell):
+                return 0
+
+        return estimate
+
+    def new_state(self, size=None):
+        """Flat search state over the grid's cells, or over ``size`` nodes"""
+        return SearchState(
+            self.engine.size if size is None else size,
+            wide=self.engine.total_cost >= INT32_MAX,
+        )
+
+    def reconstruct_path(self, parents, current):
+        """Follow parent links back from ``current``; the path comes root first
+
+        ``parents`` is a :class:`SearchState` parent array, or a dict for
+        small local searches, holding ``NO_PARENT`` at the root.
+        """
+        path = [current]
+        current = parents[current]
+        while current != NO_PARENT:
+            path.append(current)
+            current = parents[current]
         path.reverse()
         return path
 
+    def build_result(self, path_found, path, steps, path_cost=None, **extra):
+        """Convert cell ids back to ``[row, col]`` lists in the response shape
+
+        ``path`` is a list of cell ids and ``steps`` the :class:`StepTrace`
+        recorded by the search. When ``path_cost`` is omitted it is the
+        terrain cost of ``path``. With a compact ``trace_format`` the steps
+        are returned as a columnar ``trace`` and no per-step dicts are built.
+        """
+        if path_found and path_cost is None:
+            path_cost = self.engine.path_cost(path)
+        to_pos = self.engine.to_pos
+        result = {
+            "path_found": path_found,
+            "path": [to_pos(cell) for cell in path] if path_found else None,
+        }
+        result.update(self.encode_steps(steps))
+        result["nodes_explored"] = len(steps)
+        result["path_cost"] = path_cost if path_found else 0
+        if self.landmarks is not None:
+            result["landmarks"] = [to_pos(cell) for cell in self.landmarks]
+        result.update(extra)
+        return result
+
+    def encode_steps(self, steps):
+        """Encode a trace as ``{"steps": [...]}`` or a compact ``{"trace": {...}}``"""
+        return encode_trace(steps, self.cols, self.trace_format)
+
+    def make_priority_queue(self, heuristic_step):
+        """Pick the open-list structure for Dijkstra/A*
+
+        Dial's bucket queue is used when every priority is an integer and
+        consecutive pops differ by at most the largest terrain cost plus
+        ``heuristic_step`` (0 for Dijkstra, 1 for A* with Manhattan distance);
+        otherwise an indexed binary heap. Both support decrease-key, so each
+        cell is queued at most once. Dijkstra on a unit-cost grid never
+        decreases a key and gets a plain FIFO queue.
+        """
+        if heuristic_step == 0 and not self.engine.weighted:
+            return FifoQueue()
+        if heuristic_step is not None and self.engine.max_cost <= BUCKET_QUEUE_MAX_COST:
+            return BucketQueue(self.engine.max_cost + heuristic_step)
+        return IndexedHeap()
+
     def astar(self):
-        """A* Search Algorithm"""
-        open_set = []
-        heappush(open_set, (0, self.start))
-        came_from = {}
-        g_score = {self.start: 0}
-        f_score = {self.start: self.heuristic(self.start)}
-        steps = []
+        """A* Search Algorithm
+
+        Edges cost the terrain value of the cell being entered, so the
+        Manhattan and Euclidean heuristics stay admissible on weighted grids.
+        """
+        engine = self.engine
+        offsets, indices, costs = engine._offsets, engine._indices, engine._costs
+        heuristic = self.heuristic
+        goal = self.goal
+
+        # How far f can grow along one edge beyond the terrain cost
+        if self.heuristic_type == "euclidean":
+            heuristic_step = None
+        elif self.heuristic_type == "alt":
+            heuristic_step = self.engine.max_cost
+        else:
+            heuristic_step = 1
+        open_set = self.make_priority_queue(heuristic_step)
+        open_set.push(heuristic(self.start), self.start)
+        state = self.new_state()
+        came_from, g_score, closed = state.parents, state.distances, state.visited
+        g_score[self.start] = 0
+        steps = self.new_trace()
 
         while open_set:
-            _, current = heappop(open_set)
-            steps.append({"position": list(current), "type": "visiting"})
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
+            _, current = open_set.pop()
+            closed[current] = 1
+            steps.visit(current)
 
-            if current == self.goal:
+            if current == goal:
                 path = self.reconstruct_path(came_from, current)
-                return {
-                    "path_found": True,
-                    "path": path,
-                    "steps": steps,
-                    "nodes_explored": len(steps),
-                    "path_cost": g_score[current],
-                }
+                return self.build_result(
+                    True,
+                    path,
+                    steps,
+                    g_score[current],
+                    priority_queue=open_set.kind,
+                    stale_pops_avoided=open_set.decrease_keys,
+                )
+
+            current_g_score = g_score[current]
+            for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                if closed[neighbor]:
+                    continue
+                tentative_g_score = current_g_score + costs[neighbor]
+                if tentative_g_score < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    open_set.push(tentative_g_score + heuristic(neighbor), neighbor)
+                    steps.explore(neighbor)
+
+        return self.build_result(
+            False,
+            None,
+            steps,
+            0,
+            priority_queue=open_set.kind,
+            stale_pops_avoided=open_set.decrease_keys,
+        )
+
+    def ara_star(self):
+        """Anytime Repairing A* (ARA*)
+
+        Weighted A* whose heuristic inflation starts at the ``epsilon``
+        option and shrinks by ``ARA_EPSILON_STEP`` after each search, down
+        to 1. Each search reuses the previous one: only the open cells and
+        those whose cost improved since they were expanded (INCONS) are
+        queued again. The smallest unweighted f-cost over both is kept as
+        the search goes, so after every search the path costs at most
+        ``suboptimality_bound`` times the optimum without a rescan; under a
+        budget the best path so far is returned.
+        """
+        engine = self.engine
+        offsets, indices, costs = engine._offsets, engine._indices, engine._costs
+        heuristic = self.heuristic
+        start, goal = self.start, self.goal
+
+        epsilon = float(self.options.get("epsilon", ARA_INITIAL_EPSILON))
+        # Priorities are (g + epsilon * h, -g): among equal f-scores the
+        # deeper cell goes first instead of the search fanning out
+        open_set = IndexedHeap()
+        open_set.push((epsilon * heuristic(start), 0), start)
+        # (g + h, g, cell) of cells pushed onto OPEN, for the suboptimality
+        # bound; entries of cells since expanded or improved are stale and
+        # dropped when they reach the top
+        open_bounds = [(heuristic(start), 0, start)]
+        state = self.new_state()
+        came_from, g_score, closed = state.parents, state.distances, state.visited
+        infinity = state.unreached
+        g_score[start] = 0
+        closed_cells = []
+        inconsistent = set()  # Improved after being expanded in this search
+        inconsistent_bound = infinity  # Least g + h in INCONS; g only falls
+        steps = self.new_trace()
+        bound = None
+        searches = 0
+
+        def priority(cell):
+            return g_score[cell] + epsilon * heuristic(cell), -g_score[cell]
+
+        try:
+            while True:
+                goal_g_score = g_score[goal]
+                while open_set and open_set.peek_priority()[0] < goal_g_score:
+                    if len(steps.cells) >= steps.chunk_size:
+                        yield steps
+                    _, current = open_set.pop()
+                    closed[current] = 1
+                    closed_cells.append(current)
+                    steps.visit(current)
+
+                    current_g_score = g_score[current]
+                    for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                        tentative_g_score = current_g_score + costs[neighbor]
+                        if tentative_g_score < g_score[neighbor]:
+                            came_from[neighbor] = current
+                            g_score[neighbor] = tentative_g_score
+                            neighbor_heuristic = heuristic(neighbor)
+                            neighbor_bound = tentative_g_score + neighbor_heuristic
+                            if closed[neighbor]:
+                                inconsistent.add(neighbor)
+                                if neighbor_bound < inconsistent_bound:
+                                    inconsistent_bound = neighbor_bound
+                                continue
+                            open_set.push(
+                                (
+                                    tentative_g_score + epsilon * neighbor_heuristic,
+                                    -tentative_g_score,
+                                ),
+                                neighbor,
+                            )
+                            heapq.heappush(
+                                open_bounds,
+                                (neighbor_bound, tentative_g_score, neighbor),
+                            )
+                            steps.explore(neighbor)
+                    goal_g_score = g_score[goal]
+                searches += 1
+
+                if goal_g_score == infinity:
+                    break
+                # Every cheaper path still runs through a queued cell
+                while open_bounds and (
+                    open_bounds[0][2] not in open_set
+                    or open_bounds[0][1] != g_score[open_bounds[0][2]]
+                ):
+                    heapq.heappop(open_bounds)
+                lower_bound = min(
+                    open_bounds[0][0] if open_bounds else infinity, inconsistent_bound
+                )
+                if goal_g_score > lower_bound:
+                    bound = min(epsilon, goal_g_score / lower_bound)
+                else:
+                    bound = 1.0
+                if bound == 1.0:
+                    break
+
+                epsilon = max(1.0, epsilon - ARA_EPSILON_STEP)
+                open_set.reprioritize(priority, inconsistent)
+                for cell in inconsistent:
+                    heapq.heappush(
+                        open_bounds,
+                        (g_score[cell] + heuristic(cell), g_score[cell], cell),
+                    )
+                inconsistent_bound = infinity
+                for cell in closed_cells:
+                    closed[cell] = 0
+                closed_cells.clear()
+                inconsistent.clear()
+        except SearchBudgetExceeded:
+            pass  # Fall back on the best path found so far
+
+        extra = {
+            "epsilon": epsilon,
+            "suboptimality_bound": bound,
+            "searches": searches,
+        }
+        if g_score[goal] == infinity:
+            return self.build_result(False, None, steps, 0, **extra)
+        path = self.reconstruct_path(came_from, goal)
+        return self.build_result(True, path, steps, g_score[goal], **extra)
+
+    def ida_star(self):
+        """Iterative Deepening A* (IDA*)
+
+        Depth-first searches bounded by an f-cost threshold that rises to
+        the smallest f-cost over the bound after each iteration. A
+        transposition table, kept across iterations and capped at
+        ``IDA_TRANSPOSITION_ENTRIES`` cells, holds the cheapest cost each
+        cell was reached at: a cell reached at a higher cost is cut off, and
+        so is one reached again at the same cost in the same iteration.
+
+        Memory is the current path plus the table. Only the reachability
+        check made before deepening, one wavefront over the grid, briefly
+        needs an array the size of the grid; without it an unreachable goal
+        would deepen until every reachable path had been enumerated.
+        Re-expansions are recorded too, so the trace grows with the work
+        done; stream it or set ``max_nodes`` on large grids.
+        """
+        engine = self.engine
+        offsets, indices, costs = engine._offsets, engine._indices, engine._costs
+        heuristic = self.heuristic
+        start, goal = self.start, self.goal
+        infinity = math.inf
+
+        steps = self.new_trace()
+        iterations = 0
+        cutoffs = 0
+        peak_depth = 0
+        found = False
+        if engine.wavefront_distances(start)[goal] == UNREACHABLE:
+            return self.build_result(
+                False,
+                None,
+                steps,
+                0,
+                iterations=iterations,
+                transposition_cutoffs=cutoffs,
+                peak_depth=peak_depth,
+                peak_transposition_entries=0,
+            )
+
+        # Cheapest cost each cell was reached at, and the iteration that
+        # last expanded it at that cost
+        best_g_scores = {start: 0}
+        expanded_in = {}
+        threshold = heuristic(start)
+
+        while True:
+            iterations += 1
+            next_threshold = infinity
+            path, g_scores, cursors = [start], [0], [offsets[start]]
+            on_path = {start}
+            expanded_in[start] = iterations
+            steps.visit(start)
+
+            while path:
+                if len(steps.cells) >= steps.chunk_size:
+                    yield steps
+                current = path[-1]
+                if current == goal:
+                    found = True
+                    break
+                index = cursors[-1]
+                if index == offsets[current + 1]:
+                    on_path.discard(current)
+                    path.pop()
+                    g_scores.pop()
+                    cursors.pop()
+                    continue
+                cursors[-1] = index + 1
+
+                neighbor = indices[index]
+                if neighbor in on_path:
+                    continue
+                g_score = g_scores[-1] + costs[neighbor]
+                best_g_score = best_g_scores.get(neighbor)
+                if best_g_score is not None and (
+                    best_g_score < g_score
+                    or (
+                        best_g_score == g_score
+                        and expanded_in.get(neighbor) == iterations
+                    )
+                ):
+                    cutoffs += 1
+                    continue
+                f_score = g_score + heuristic(neighbor)
+                if f_score > threshold:
+                    if f_score < next_threshold:
+                        next_threshold = f_score
+                    continue
+                if (
+                    best_g_score is not None
+                    or len(best_g_scores) < IDA_TRANSPOSITION_ENTRIES
+                ):
+                    best_g_scores[neighbor] = g_score
+                    expanded_in[neighbor] = iterations
+
+                path.append(neighbor)
+                g_scores.append(g_score)
+                cursors.append(offsets[neighbor])
+                on_path.add(neighbor)
+                steps.visit(neighbor)
+                if len(path) > peak_depth:
+                    peak_depth = len(path)
+
+            if found or next_threshold == infinity:
+                break
+            threshold = next_threshold
 
-            for neighbor in self.get_neighbors(current):
-                tentative_g_score = g_score[current] + 1
+        extra = {
+            "iterations": iterations,
+            "transposition_cutoffs": cutoffs,
+            "peak_depth": peak_depth,
+            "peak_transposition_entries": len(best_g_scores),
+        }
+        if not found:
+            return self.build_result(False, None, steps, 0, **extra)
+        return self.build_result(True, path, steps, g_scores[-1], **extra)
+
+    def fringe(self):
+        """Fringe Search
+
+        Like IDA*, passes over the frontier are bounded by an f-cost limit
+        that rises between passes, but the frontier ("fringe") and the best
+        cost of every cell are kept, so nothing is expanded twice at the
+        same cost and no priority queue is needed. The fringe is a doubly
+        linked list; a cell's children are inserted right after it and
+        expanded within the same pass. All state lives in dicts keyed by the
+        cells the search has reached, so memory grows with the explored
+        region rather than the grid.
+        """
+        engine = self.engine
+        offsets, indices, costs = engine._offsets, engine._indices, engine._costs
+        heuristic = self.heuristic
+        start, goal = self.start, self.goal
+        infinity = math.inf
+
+        came_from = {start: NO_PARENT}
+        g_score = {start: 0}
+        # Links of the fringe list; a cell is in the fringe while it has a
+        # previous link, and the list ends in NO_PARENT
+        head = -2  # Sentinel before the first fringe cell
+        next_cell = {head: start, start: NO_PARENT}
+        previous_cell = {start: head}
+        peak_fringe = 1
+
+        steps = self.new_trace()
+        f_limit = heuristic(start)
+        iterations = 0
+        found = False
+
+        while not found and next_cell[head] != NO_PARENT:
+            iterations += 1
+            f_min = infinity
+            current = next_cell[head]
+            while current != NO_PARENT:
+                if len(steps.cells) >= steps.chunk_size:
+                    yield steps
+                current_g_score = g_score[current]
+                f_score = current_g_score + heuristic(current)
+                if f_score > f_limit:
+                    if f_score < f_min:
+                        f_min = f_score
+                    current = next_cell[current]
+                    continue
+                steps.visit(current)
+                if current == goal:
+                    found = True
+                    break
 
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current
+                # Insert children after the current cell, first child first
+                after = current
+                for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                    tentative_g_score = current_g_score + costs[neighbor]
+                    if tentative_g_score >= g_score.get(neighbor, infinity):
+                        continue
+                    if neighbor in previous_cell:
+                        before, following = previous_cell[neighbor], next_cell[neighbor]
+                        next_cell[before] = following
+                        if following != NO_PARENT:
+                            previous_cell[following] = before
+                    following = next_cell[after]
+                    next_cell[neighbor], previous_cell[neighbor] = following, after
+                    if following != NO_PARENT:
+                        previous_cell[following] = neighbor
+                    next_cell[after] = neighbor
+                    after = neighbor
                     g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = tentative_g_score + self.heuristic(neighbor)
-                    heappush(open_set, (f_score[neighbor], neighbor))
-                    steps.append({"position": list(neighbor), "type": "exploring"})
+                    came_from[neighbor] = current
+                    steps.explore(neighbor)
+                if len(previous_cell) > peak_fringe:
+                    peak_fringe = len(previous_cell)
+
+                # Expanded: unlink the current cell and carry on after it
+                before, following = previous_cell.pop(current), next_cell.pop(current)
+                next_cell[before] = following
+                if following != NO_PARENT:
+                    previous_cell[following] = before
+                current = following
+            f_limit = f_min
+
+        extra = {
+            "iterations": iterations,
+            "peak_fringe": peak_fringe,
+            "stored_cells": len(g_score),
+        }
+        if not found:
+            return self.build_result(False, None, steps, 0, **extra)
+        path = self.reconstruct_path(came_from, goal)
+        return self.build_result(True, path, steps, g_score[goal], **extra)
+
+    def jps(self):
+        """Jump Point Search (4-connected, uniform cost)
+
+        A* over jump points only: straight runs are skipped until a forced
+        neighbour or the goal is met, so symmetric paths never reach the open
+        list. Vertical runs stop wherever a horizontal run from a side cell
+        would stop, which keeps the search optimal on 4-connected grids.
+        """
+        engine = self.engine
+        if engine.weighted:
+            raise ValueError("Jump Point Search requires a uniform-cost grid")
+        rows, cols = self.rows, self.cols
+        passable = engine._passable
+        forced_right, forced_left, right_event, left_event = (
+            engine.horizontal_jump_tables()
+        )
+        heuristic = self.heuristic
+        goal, goal_row, goal_col = self.goal, self.goal_row, self.goal_col
+
+        def jump_horizontal(row, col, dx):
+            """First jump point reached moving along a row, or None"""
+            cell = row * cols + col
+            if not passable[cell]:
+                return None
+            if dx > 0:
+                event = right_event[cell]
+                if row == goal_row and col <= goal_col < event:
+                    return goal
+                if event < cols and forced_right[row * cols + event]:
+                    return row * cols + event
+            else:
+                event = left_event[cell]
+                if row == goal_row and event < goal_col <= col:
+                    return goal
+                if event >= 0 and forced_left[row * cols + event]:
+                    return row * cols + event
+            return None
+
+        def jump_vertical(row, col, dy):
+            """First jump point reached moving along a column, or None"""
+            while 0 <= row < rows:
+                cell = row * cols + col
+                if not passable[cell]:
+                    return None
+                if cell == goal:
+                    return cell
+                behind = cell - dy * cols
+                if col > 0 and passable[cell - 1] and not passable[behind - 1]:
+                    return cell
+                if col < cols - 1 and passable[cell + 1] and not passable[behind + 1]:
+                    return cell
+                if col < cols - 1 and jump_horizontal(row, col + 1, 1) is not None:
+                    return cell
+                if col > 0 and jump_horizontal(row, col - 1, -1) is not None:
+                    return cell
+                row += dy
+            return None
+
+        def jump(cell, dr, dc):
+            row, col = divmod(cell, cols)
+            row, col = row + dr, col + dc
+            if not (0 <= row < rows and 0 <= col < cols):
+                return None
+            if dc:
+                return jump_horizontal(row, col, dc)
+            return jump_vertical(row, col, dr)
+
+        # Among equal f-scores prefer the deeper jump point; otherwise ties go
+        # to the lowest cell id and the search fans out over open areas
+        open_set = IndexedHeap()
+        open_set.push((heuristic(self.start), 0), self.start)
+        state = self.new_state()
+        came_from, g_score, closed = state.parents, state.distances, state.visited
+        g_score[self.start] = 0
+        steps = self.new_trace()
 
-        return {
-            "path_found": False,
-            "path": None,
-            "steps": steps,
-            "nodes_explored": len(steps),
-            "path_cost": 0,
+        while open_set:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
+            _, current = open_set.pop()
+            closed[current] = 1
+            steps.visit(current)
+
+            if current == goal:
+                path = self.expand_jump_path(self.reconstruct_path(came_from, current))
+                return self.build_result(
+                    True,
+                    path,
+                    steps,
+                    g_score[current],
+                    stale_pops_avoided=open_set.decrease_keys,
+                )
+
+            # Prune to the natural and forced directions given the parent
+            if came_from[current] != NO_PARENT:
+                parent_row, parent_col = divmod(came_from[current], cols)
+                row, col = divmod(current, cols)
+                dr = (row > parent_row) - (row < parent_row)
+                dc = (col > parent_col) - (col < parent_col)
+                if dc:
+                    directions = ((0, dc), (1, 0), (-1, 0))
+                else:
+                    directions = ((dr, 0), (0, 1), (0, -1))
+            else:
+                directions = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+            for dr, dc in directions:
+                jump_point = jump(current, dr, dc)
+                if jump_point is None or closed[jump_point]:
+                    continue
+                row, col = divmod(jump_point, cols)
+                current_row, current_col = divmod(current, cols)
+                tentative_g_score = (
+                    g_score[current] + abs(row - current_row) + abs(col - current_col)
+                )
+                if tentative_g_score < g_score[jump_point]:
+                    came_from[jump_point] = current
+                    g_score[jump_point] = tentative_g_score
+                    open_set.push(
+                        (
+                            tentative_g_score + heuristic(jump_point),
+                            -tentative_g_score,
+                        ),
+                        jump_point,
+                    )
+                    steps.explore(jump_point)
+
+        return self.build_result(
+            False, None, steps, 0, stale_pops_avoided=open_set.decrease_keys
+        )
+
+    def expand_jump_path(self, jump_points):
+        """Fill in the straight runs between consecutive jump points"""
+        cols = self.cols
+        path = jump_points[:1]
+        for cell in jump_points[1:]:
+            previous = path[-1]
+            stride = cols if abs(cell - previous) >= cols else 1
+            if cell < previous:
+                stride = -stride
+            path.extend(range(previous + stride, cell + stride, stride))
+        return path
+
+    def hpa(self):
+        """Hierarchical Pathfinding A* (HPA*, uniform cost)
+
+        Searches the cached abstract graph of cluster entrances (see
+        ``hierarchy``) after linking the start and goal to the entrances of
+        their own clusters, then refines each abstract edge of the result
+        into grid cells. Only the refined segments are searched at cell
+        level. Paths are near-optimal; ``path_cost`` is the exact cost of
+        the path returned.
+        """
+        engine = self.engine
+        if engine.weighted:
+            raise ValueError("HPA* requires a uniform-cost grid")
+        start, goal = self.start, self.goal
+        graph, cached = abstract_graph(engine)
+        node_cells = graph.node_cells.tolist()
+        steps = self.new_trace()
+        extra = {
+            "cluster_size": graph.cluster_size,
+            "abstract_nodes": len(node_cells),
+            "abstract_graph_cached": cached,
+        }
+
+        if start == goal:
+            steps.visit(start)
+            return self.build_result(True, [start], steps, 0, **extra)
+        if not engine.is_passable(goal):
+            return self.build_result(False, None, steps, 0, **extra)
+
+        # Link the start and goal to the entrances of their clusters
+        same_cluster = graph.cluster_of(start) == graph.cluster_of(goal)
+        start_nodes = graph.cluster_nodes(graph.cluster_of(start))
+        goal_nodes = graph.cluster_nodes(graph.cluster_of(goal))
+        start_parents, start_distances = cluster_search(
+            engine,
+            graph,
+            start,
+            [node_cells[node] for node in start_nodes] + [goal] * same_cluster,
+        )
+        # Uniform costs: distances to the goal equal distances from it
+        goal_parents, goal_distances = cluster_search(
+            engine, graph, goal, [node_cells[node] for node in goal_nodes]
+        )
+        goal_links = {
+            node: goal_distances[node_cells[node]]
+            for node in goal_nodes
+            if node_cells[node] in goal_distances
         }
 
+        # The start and goal join the abstract graph as two extra nodes
+        start_node, goal_node = len(node_cells), len(node_cells) + 1
+        cell_of = node_cells + [start, goal]
+        # Among equal f-scores prefer the deeper node: abstract edges are long,
+        # and ties are common
+        open_set = IndexedHeap()
+        open_set.push((self.heuristic(start), 0), start_node)
+        state = self.new_state(len(cell_of))
+        came_from, g_score, closed = state.parents, state.distances, state.visited
+        g_score[start_node] = 0
+
+        while open_set:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
+            _, node = open_set.pop()
+            closed[node] = 1
+            steps.visit(cell_of[node])
+            if node == goal_node:
+                break
+
+            if node == start_node:
+                edges = [
+                    (target, start_distances[node_cells[target]])
+                    for target in start_nodes
+                    if node_cells[target] in start_distances
+                ]
+                if same_cluster and goal in start_distances:
+                    edges.append((goal_node, start_distances[goal]))
+            else:
+                edges = list(graph.edges(node))
+                if node in goal_links:
+                    edges.append((goal_node, goal_links[node]))
+
+            current_g_score = g_score[node]
+            for target, cost in edges:
+                if closed[target]:
+                    continue
+                tentative_g_score = current_g_score + cost
+                if tentative_g_score < g_score[target]:
+                    came_from[target] = node
+                    g_score[target] = tentative_g_score
+                    cell = cell_of[target]
+                    open_set.push(
+                        (tentative_g_score + self.heuristic(cell), -tentative_g_score),
+                        target,
+                    )
+                    steps.explore(cell)
+        else:
+            return self.build_result(False, None, steps, 0, **extra)
+
+        # Refine every abstract edge into grid cells
+        abstract_path = self.reconstruct_path(came_from, goal_node)
+        path = [start]
+        refined_segments = 0
+        for node, next_node in zip(abstract_path, abstract_path[1:]):
+            cell, next_cell = cell_of[node], cell_of[next_node]
+            if node == start_node:
+                segment = self.reconstruct_path(start_parents, next_cell)
+            elif next_node == goal_node:
+                segment = self.reconstruct_path(goal_parents, cell)[::-1]
+            elif graph.cluster_of(cell) == graph.cluster_of(next_cell):
+                parents, _ = cluster_search(engine, graph, cell, [next_cell])
+                segment = self.reconstruct_path(parents, next_cell)
+                refined_segments += 1
+            else:
+                segment = [cell, next_cell]  # Crossing an entrance
+            path.extend(segment[1:])
+
+        return self.build_result(
+            True,
+            path,
+            steps,
+            abstract_path_length=len(abstract_path),
+            refined_segments=refined_segments,
+            **extra,
+        )
+
     def bfs(self):
         """Breadth-First Search Algorithm"""
+        offsets, indices = self.engine._offsets, self.engine._indices
+        goal = self.goal
+
         queue = deque([self.start])
-        came_from = {self.start: None}
-        steps = []
+        state = self.new_state()
+        came_from, discovered = state.parents, state.visited
+        discovered[self.start] = 1
+        steps = self.new_trace()
 
         while queue:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
             current = queue.popleft()
-            steps.append({"position": list(current), "type": "visiting"})
+            steps.visit(current)
 
-            if current == self.goal:
+            if current == goal:
                 path = self.reconstruct_path(came_from, current)
-                return {
-                    "path_found": True,
-                    "path": path,
-                    "steps": steps,
-                    "nodes_explored": len(steps),
-                    "path_cost": len(path) - 1,
-                }
+                return self.build_result(True, path, steps)
 
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in came_from:
+            for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                if not discovered[neighbor]:
+                    discovered[neighbor] = 1
                     came_from[neighbor] = current
                     queue.append(neighbor)
-                    steps.append({"position": list(neighbor), "type": "exploring"})
+                    steps.explore(neighbor)
 
-        return {
-            "path_found": False,
-            "path": None,
-            "steps": steps,
-            "nodes_explored": len(steps),
-            "path_cost": 0,
-        }
+        return self.build_result(False, None, steps, 0)
+
+    def join_bidirectional_path(self, forward_parents, backward_parents, meeting):
+        """Join the start->meeting and meeting->goal halves of a bidirectional search"""
+        forward = self.reconstruct_path(forward_parents, meeting)
+        backward = self.reconstruct_path(backward_parents, meeting)
+        backward.reverse()
+        return forward + backward[1:]
+
+    def bidirectional_bfs(self):
+        """Bidirectional Breadth-First Search
+
+        Grows one BFS level at a time from whichever side has the smaller
+        frontier. Once the frontiers touch, the level being expanded is
+        finished and the cheapest meeting cell is kept, which preserves
+        optimality.
+        """
+        offsets, indices = self.engine._offsets, self.engine._indices
+        start, goal = self.start, self.goal
+
+        steps = self.new_trace(sided=True)
+        if start == goal:
+            steps.record(start, VISITING, FORWARD)
+            return self.build_result(True, [start], steps, 0)
+        if not self.engine.is_passable(goal):
+            return self.build_result(False, None, steps, 0)
+
+        states = (self.new_state(), self.new_state())
+        parents = (states[0].parents, states[1].parents)
+        distances = (states[0].distances, states[1].distances)
+        distances[0][start] = distances[1][goal] = 0
+        unreached = states[0].unreached
+        frontiers = [[start], [goal]]
+        best_cost, meeting = None, None
+
+        while frontiers[0] and frontiers[1] and meeting is None:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            parent, distance = parents[side], distances[side]
+            other_distance = distances[1 - side]
+            next_frontier = []
+
+            for current in frontiers[side]:
+                if len(steps.cells) >= steps.chunk_size:
+                    yield steps
+                steps.record(current, VISITING, side)
+                new_distance = distance[current] + 1
+
+                for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                    if distance[neighbor] != unreached:
+                        continue
+                    distance[neighbor] = new_distance
+                    parent[neighbor] = current
+                    next_frontier.append(neighbor)
+                    steps.record(neighbor, EXPLORING, side)
+
+                    if other_distance[neighbor] != unreached:
+                        cost = new_distance + other_distance[neighbor]
+                        if best_cost is None or cost < best_cost:
+                            best_cost, meeting = cost, neighbor
+
+            frontiers[side] = next_frontier
+
+        if meeting is None:
+            return self.build_result(False, None, steps, 0)
+
+        path = self.join_bidirectional_path(parents[0], parents[1], meeting)
+        return self.build_result(
+            True, path, steps, meeting_point=self.engine.to_pos(meeting)
+        )
+
+    def bidirectional_astar(self):
+        """Bidirectional A* Search
+
+        Runs A* from the start towards the goal and from the goal towards the
+        start, always expanding the side with the smaller open list. The best
+        meeting cost is tracked as frontiers touch; search stops once either
+        open list's smallest f-score can no longer beat it, which keeps the
+        path optimal for consistent heuristics. A cell one side pops after the
+        other side has settled it is not expanded again, since every path
+        through it is already accounted for. Terrain costs are honoured: the
+        backward side pays the cost of the cell it steps out of.
+        """
+        engine = self.engine
+        offsets, indices, costs = engine._offsets, engine._indices, engine._costs
+        start, goal = self.start, self.goal
+
+        steps = self.new_trace(sided=True)
+        if start == goal:
+            steps.record(start, VISITING, FORWARD)
+            return self.build_result(True, [start], steps, 0)
+        if not self.engine.is_passable(goal):
+            return self.build_result(False, None, steps, 0)
+
+        heuristics = (
+            self.heuristic_towards(goal),
+            self.heuristic_towards(start, towards=False),
+        )
+        # Priorities are (f, -g): among equal f-scores the deeper node goes
+        # first, so each side runs towards the other instead of widening
+        open_sets = (IndexedHeap(), IndexedHeap())
+        open_sets[0].push((heuristics[0](start), 0), start)
+        open_sets[1].push((heuristics[1](goal), 0), goal)
+        states = (self.new_state(), self.new_state())
+        parents = (states[0].parents, states[1].parents)
+        g_scores = (states[0].distances, states[1].distances)
+        closed_sets = (states[0].visited, states[1].visited)
+        g_scores[0][start] = g_scores[1][goal] = 0
+        unreached = states[0].unreached
+        best_cost, meeting = None, None
+
+        while open_sets[0] and open_sets[1]:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
+            if best_cost is not None and (
+                open_sets[0].peek_priority()[0] >= best_cost
+                or open_sets[1].peek_priority()[0] >= best_cost
+            ):
+                break
+
+            side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+            open_set, parent, g_score = open_sets[side], parents[side], g_scores[side]
+            closed = closed_sets[side]
+            other_g_score = g_scores[1 - side]
+            heuristic = heuristics[side]
+
+            _, current = open_set.pop()
+            closed[current] = 1
+            steps.record(current, VISITING, side)
+            # A cell the other side has settled is already counted as a
+            # meeting point; nothing beyond it can lead to a cheaper path
+            if closed_sets[1 - side][current]:
+                continue
+
+            current_g_score = g_score[current]
+            for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                if closed[neighbor]:
+                    continue
+                tentative_g_score = current_g_score + (
+                    costs[neighbor] if side == 0 else costs[current]
+                )
+                if tentative_g_score < g_score[neighbor]:
+                    parent[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    open_set.push(
+                        (tentative_g_score + heuristic(neighbor), -tentative_g_score),
+                        neighbor,
+                    )
+                    steps.record(neighbor, EXPLORING, side)
+
+                    if other_g_score[neighbor] != unreached:
+                        cost = tentative_g_score + other_g_score[neighbor]
+                        if best_cost is None or cost < best_cost:
+                            best_cost, meeting = cost, neighbor
+
+        stale_pops_avoided = open_sets[0].decrease_keys + open_sets[1].decrease_keys
+        if meeting is None:
+            return self.build_result(
+                False, None, steps, 0, stale_pops_avoided=stale_pops_avoided
+            )
+
+        path = self.join_bidirectional_path(parents[0], parents[1], meeting)
+        return self.build_result(
+            True,
+            path,
+            steps,
+            best_cost,
+            meeting_point=self.engine.to_pos(meeting),
+            stale_pops_avoided=stale_pops_avoided,
+        )
 
     def dfs(self):
         """Depth-First Search Algorithm"""
+        offsets, indices = self.engine._offsets, self.engine._indices
+        goal = self.goal
+
         stack = [self.start]
-        came_from = {self.start: None}
-        visited = set()
-        steps = []
+        state = self.new_state()
+        came_from, discovered = state.parents, state.visited
+        discovered[self.start] = 1
+        steps = self.new_trace()
 
         while stack:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
+            # A cell is pushed once, when first discovered, so never twice
             current = stack.pop()
+            steps.visit(current)
 
-            if current in visited:
-                continue
-
-            visited.add(current)
-            steps.append({"position": list(current), "type": "visiting"})
-
-            if current == self.goal:
+            if current == goal:
                 path = self.reconstruct_path(came_from, current)
-                return {
-                    "path_found": True,
-                    "path": path,
-                    "steps": steps,
-                    "nodes_explored": len(steps),
-                    "path_cost": len(path) - 1,
-                }
+                return self.build_result(True, path, steps)
 
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in visited and neighbor not in came_from:
+            for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                if not discovered[neighbor]:
+                    discovered[neighbor] = 1
                     came_from[neighbor] = current
                     stack.append(neighbor)
-                    steps.append({"position": list(neighbor), "type": "exploring"})
+                    steps.explore(neighbor)
 
-        return {
-            "path_found": False,
-            "path": None,
-            "steps": steps,
-            "nodes_explored": len(steps),
-            "path_cost": 0,
-        }
+        return self.build_result(False, None, steps, 0)
 
     def dijkstra(self):
-        """Dijkstra's Algorithm (similar to A* but without heuristic)"""
-        open_set = []
-        heappush(open_set, (0, self.start))
-        came_from = {}
-        cost_so_far = {self.start: 0}
-        steps = []
+        """Dijkstra's Algorithm (similar to A* but without heuristic)
+
+        Honours terrain costs; with integer costs up to
+        ``BUCKET_QUEUE_MAX_COST`` the open list is a bucket queue, making
+        each queue operation O(1).
+        """
+        engine = self.engine
+        offsets, indices, costs = engine._offsets, engine._indices, engine._costs
+        goal = self.goal
+
+        open_set = self.make_priority_queue(0)
+        open_set.push(0, self.start)
+        state = self.new_state()
+        came_from, cost_so_far, closed = state.parents, state.distances, state.visited
+        cost_so_far[self.start] = 0
+        steps = self.new_trace()
 
         while open_set:
-            _, current = heappop(open_set)
-            steps.append({"position": list(current), "type": "visiting"})
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
+            _, current = open_set.pop()
+            closed[current] = 1
+            steps.visit(current)
 
-            if current == self.goal:
+            if current == goal:
                 path = self.reconstruct_path(came_from, current)
-                return {
-                    "path_found": True,
-                    "path": path,
-                    "steps": steps,
-                    "nodes_explored": len(steps),
-                    "path_cost": cost_so_far[current],
+                return self.build_result(
+                    True,
+                    path,
+                    steps,
+                    cost_so_far[current],
+                    priority_queue=open_set.kind,
+                    stale_pops_avoided=open_set.decrease_keys,
+                )
+
+            current_cost = cost_so_far[current]
+            for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                if closed[neighbor]:
+                    continue
+                new_cost = current_cost + costs[neighbor]
+                if new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    open_set.push(new_cost, neighbor)
+                    steps.explore(neighbor)
+
+        return self.build_result(
+            False,
+            None,
+            steps,
+            0,
+            priority_queue=open_set.kind,
+            stale_pops_avoided=open_set.decrease_keys,
+        )
+
+    def shortest_path_tree(self, root, targets, state, reverse=False):
+        """Grow one BFS/Dijkstra tree from ``root`` until every target is settled
+
+        Uses BFS when ``self.algorithm`` is ``"bfs"`` and Dijkstra otherwise.
+        The tree's parents and costs are written into ``state``, a fresh
+        :class:`SearchState`. With ``reverse=True`` the tree holds paths
+        *into* ``root`` (each parent is the next cell towards it). Returns
+        the number of expanded cells.
+        """
+        engine = self.engine
+        offsets, indices, costs = engine._offsets, engine._indices, engine._costs
+        pending = set(targets)
+        parents, cost_so_far = state.parents, state.distances
+        cost_so_far[root] = 0
+        settled = 0
+
+        if self.algorithm == "bfs":
+            discovered = state.visited
+            discovered[root] = 1
+            queue = deque([root])
+            while queue and pending:
+                current = queue.popleft()
+                pending.discard(current)
+                settled += 1
+                for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                    if not discovered[neighbor]:
+                        discovered[neighbor] = 1
+                        parents[neighbor] = current
+                        cost_so_far[neighbor] = cost_so_far[current] + 1
+                        queue.append(neighbor)
+            return settled
+
+        open_set = self.make_priority_queue(0)
+        open_set.push(0, root)
+        while open_set and pending:
+            cost, current = open_set.pop()
+            pending.discard(current)
+            settled += 1
+            for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                new_cost = cost + (costs[current] if reverse else costs[neighbor])
+                if new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    parents[neighbor] = current
+                    open_set.push(new_cost, neighbor)
+        return settled
+
+    def execute_batch(self, pairs):
+        """Answer many (start, goal) queries with one search tree per shared endpoint
+
+        Pairs are grouped greedily: the start or goal shared by the most
+        unanswered pairs becomes the root of a forward (from a start) or
+        reverse (into a goal) tree, and every pair in that group reads its
+        path from the tree. N queries cost one search per distinct root.
+        """
+        engine = self.engine
+        for start, goal in pairs:
+            for name, pos in (("start", start), ("goal", goal)):
+                if not engine.contains(pos):
+                    raise ValueError(
+                        f"{name.capitalize()} position {list(pos)} is outside the grid"
+                    )
+        queries = [(engine.to_id(start), engine.to_id(goal)) for start, goal in pairs]
+
+        remaining = set(range(len(queries)))
+        results = [None] * len(queries)
+        searches = []
+        nodes_explored = 0
+        state = self.new_state()  # Reset and reused by every tree
+
+        while remaining:
+            start_counts, goal_counts = {}, {}
+            for index in remaining:
+                start, goal = queries[index]
+                start_counts[start] = start_counts.get(start, 0) + 1
+                # A search may leave an obstacle start but never enter one, so
+                # such pairs are only answered by forward trees
+                if engine.is_passable(start) or start == goal:
+                    goal_counts[goal] = goal_counts.get(goal, 0) + 1
+            best_start = max(start_counts, key=start_counts.get)
+            best_goal = max(goal_counts, key=goal_counts.get, default=None)
+            reverse = (
+                best_goal is not None
+                and goal_counts[best_goal] > start_counts[best_start]
+            )
+            root = best_goal if reverse else best_start
+            if reverse:
+                group = [
+                    i
+                    for i in remaining
+                    if queries[i][1] == root
+                    and (engine.is_passable(queries[i][0]) or queries[i][0] == root)
+                ]
+            else:
+                group = [i for i in remaining if queries[i][0] == root]
+            remaining.difference_update(group)
+
+            others = {queries[i][0 if reverse else 1] for i in group}
+            if searches:
+                state.reset()
+            if reverse and not engine.is_passable(root):
+                # Nothing can enter an obstacle goal
+                state.distances[root] = 0
+                settled = 0
+            else:
+                settled = self.shortest_path_tree(root, others, state, reverse)
+            nodes_explored += settled
+            searches.append(
+                {
+                    "root": engine.to_pos(root),
+                    "direction": "reverse" if reverse else "forward",
+                    "queries": len(group),
+                    "nodes_explored": settled,
                 }
+            )
 
-            for neighbor in self.get_neighbors(current):
-                new_cost = cost_so_far[current] + 1
+            for index in group:
+                start, goal = queries[index]
+                other = start if reverse else goal
+                found = state.reached(other)
+                path = self.reconstruct_path(state.parents, other) if found else None
+                if found and reverse:
+                    path.reverse()
+                results[index] = {
+                    "start": engine.to_pos(start),
+                    "goal": engine.to_pos(goal),
+                    "path_found": found,
+                    "path": [engine.to_pos(cell) for cell in path] if found else None,
+                    "path_cost": engine.path_cost(path) if found else 0,
+                }
 
-                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                    cost_so_far[neighbor] = new_cost
-                    came_from[neighbor] = current
-                    heappush(open_set, (new_cost, neighbor))
-                    steps.append({"position": list(neighbor), "type": "exploring"})
+        return {
+            "results": results,
+            "searches": searches,
+            "nodes_explored": nodes_explored,
+        }
+
+    def execute_flow_field(self, starts):
+        """Route agents from each of ``starts`` to the goal along a flow field
+
+        The field comes from one reverse search out of the goal and is cached
+        per grid and goal (see :mod:`.flow_field`), so each agent only walks
+        its own path. ``nodes_explored`` is 0 when the field was cached, and
+        ``field`` is the :class:`FlowField` itself.
+        """
+        engine = self.engine
+        for start in starts:
+            if not engine.contains(start):
+                raise ValueError(f"Start position {list(start)} is outside the grid")
+
+        field, cached = flow_field(engine, self.goal)
+        results = []
+        for start in starts:
+            path = field.walk(engine.to_id(start))
+            if path is not None:
+                # Agent paths are long; convert them to positions in one go
+                path = np.array(path, dtype=np.int64)
+            results.append(
+                {
+                    "start": list(start),
+                    "path_found": path is not None,
+                    "path": (
+                        np.column_stack(np.divmod(path, self.cols)).tolist()
+                        if path is not None
+                        else None
+                    ),
+                    "path_cost": engine.path_cost(path) if path is not None else 0,
+                }
+            )
 
         return {
-            "path_found": False,
-            "path": None,
-            "steps": steps,
-            "nodes_explored": len(steps),
-            "path_cost": 0,
+            "goal": engine.to_pos(self.goal),
+            "results": results,
+            "cached": cached,
+            "nodes_explored": 0 if cached else field.nodes_explored,
+            "field": field,
+        }
+
+    def execute_multi_agent(self, agents, solver="cooperative", horizon=None):
+        """Plan conflict-free timed paths for many (start, goal) pairs
+
+        ``solver`` is ``"cooperative"`` (cooperative A* over a space-time
+        reservation table) or ``"cbs"`` (conflict-based search, for small
+        groups); see :mod:`.multi_agent`. Each path lists one position per
+        time step, repeating a cell while the agent waits. The runner's time
+        and node budgets apply to the whole plan.
+        """
+        engine = self.engine
+        for start, goal in agents:
+            for name, pos in (("start", start), ("goal", goal)):
+                if not engine.contains(pos):
+                    raise ValueError(
+                        f"{name.capitalize()} position {list(pos)} is outside the grid"
+                    )
+        budget = self.budget
+        if budget is not None:
+            budget.start()
+        paths, nodes_explored = plan_agents(
+            engine,
+            [(engine.to_id(start), engine.to_id(goal)) for start, goal in agents],
+            solver,
+            horizon,
+            budget,
+        )
+
+        results = []
+        for (start, goal), path in zip(agents, paths):
+            results.append(
+                {
+                    "start": list(start),
+                    "goal": list(goal),
+                    "path_found": path is not None,
+                    "path": [engine.to_pos(cell) for cell in path] if path else None,
+                    "arrival_time": len(path) - 1 if path else None,
+                    "path_cost": engine.path_cost(path) if path else 0,
+                }
+            )
+        arrivals = [len(path) - 1 for path in paths if path is not None]
+        result = {
+            "solver": solver,
+            "results": results,
+            "all_paths_found": len(arrivals) == len(paths),
+            "makespan": max(arrivals, default=0),
+            "sum_of_costs": sum(arrivals),
+            "nodes_explored": nodes_explored,
         }
+        if budget is not None:
+            result["budget"] = budget.report()
+        return result
 
     def hill_climbing(self):
-        """Hill Climbing Algorithm (simple local search)"""
+        """Hill Climbing Algorithm (simple local search)
+
+        With a ``restarts`` option above 1, runs that many stochastic
+        climbs at once and returns the best (see ``local_search``).
+        """
+        if self.options.get("restarts", 1) > 1:
+            return (yield from self.restart_local_search(hill_climbing_batch))
         current = self.start
-        steps = [{"position": list(current), "type": "visiting"}]
-        path = [list(current)]
+        steps = self.new_trace()
+        steps.visit(current)
+        path = [current]
 
         max_iterations = 1000
         iteration = 0
 
         while current != self.goal and iteration < max_iterations:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
             neighbors = self.get_neighbors(current)
             if not neighbors:
                 break
 
             # Choose neighbor with best heuristic
-            next_node = min(neighbors, key=lambda n: self.heuristic(n))
+            next_node = min(neighbors, key=self.heuristic)
 
             # If no improvement, stop
             if self.heuristic(next_node) >= self.heuristic(current):
                 break
 
             current = next_node
-            path.append(list(current))
-            steps.append({"position": list(current), "type": "visiting"})
+            path.append(current)
+            steps.visit(current)
             iteration += 1
 
-        return {
-            "path_found": current == self.goal,
-            "path": path if current == self.goal else None,
-            "steps": steps,
-            "nodes_explored": len(steps),
-            "path_cost": len(path) - 1 if current == self.goal else 0,
-        }
+        return self.build_result(current == self.goal, path, steps)
 
     def simulated_annealing(self):
-        """Simulated Annealing Algorithm"""
-        import random
+        """Simulated Annealing Algorithm
+
+        With a ``restarts`` option above 1, runs that many seeded annealing
+        trajectories at once and returns the best (see ``local_search``).
+        """
+        if self.options.get("restarts", 1) > 1:
+            return (yield from self.restart_local_search(simulated_annealing_batch))
+        random = self.random
 
         current = self.start
-        steps = [{"position": list(current), "type": "visiting"}]
-        path = [list(current)]
+        steps = self.new_trace()
+        steps.visit(current)
+        path = [current]
 
         temperature = 100.0
         cooling_rate = 0.95
         min_temp = 0.01
 
         while temperature > min_temp and current != self.goal:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
             neighbors = self.get_neighbors(current)
             if not neighbors:
                 break
@@ -289,191 +1615,90 @@ class AlgorithmRunner:
             # Accept better solutions or worse with probability
             if delta < 0 or random.random() < math.exp(-delta / temperature):
                 current = next_node
-                path.append(list(current))
-                steps.append({"position": list(current), "type": "visiting"})
+                path.append(current)
+                steps.visit(current)
 
             temperature *= cooling_rate
 
-        return {
-            "path_found": current == self.goal,
-            "path": path if current == self.goal else None,
-            "steps": steps,
-            "nodes_explored": len(steps),
-            "path_cost": len(path) - 1 if current == self.goal else 0,
-        }
+        return self.build_result(current == self.goal, path, steps)
+
+    def restart_local_search(self, batch_search):
+        """Run a batched local search and report its best restart"""
+        batch = batch_search(
+            self.engine.neighbour_table,
+            self.heuristic_values(),
+            self.start,
+            self.goal,
+            self.options["restarts"],
+            self.seed,
+        )
+        stats, best = batch.stats(self.engine.path_cost)
+        steps = self.new_trace()
+        path = batch.path(best)
+        for cell in path:
+            if len(steps.cells) >= steps.chunk_size:
+                yield steps
+            steps.visit(cell)
+
+        reached = sum(stat["reached_goal"] for stat in stats)
+        return self.build_result(
+            stats[best]["reached_goal"],
+            path,
+            steps,
+            restarts=len(stats),
+            best_restart=best,
+            success_rate=reached / len(stats),
+            restart_stats=stats,
+        )
 
     def genetic_algorithm(self):
         """
         Genetic Algorithm for pathfinding
-        Uses evolutionary approach with population, selection, crossover, and mutation
+        Evolves a NumPy population of direction-code genomes (see ``genetic``);
+        population size, generations, mutation rate and worker processes
+        come from the runner options
         """
-        import random
-
-        population_size = 50
-        generations = 100
-        mutation_rate = 0.1
-        elite_size = 5
-
-        steps = []
-
-        # Generate initial population of random paths
-        def generate_random_path():
-            """Generate a random path from start to goal"""
-            path = [self.start]
-            current = self.start
-            visited = {self.start}
-            max_steps = self.rows * self.cols
-
-            for _ in range(max_steps):
-                if current == self.goal:
-                    break
-
-                neighbors = [n for n in self.get_neighbors(current) if n not in visited]
-                if not neighbors:
-                    # Backtrack or try unvisited neighbors
-                    neighbors = self.get_neighbors(current)
-                    if not neighbors:
-                        break
-
-                # Prefer neighbors closer to goal
-                if random.random() < 0.7:  # 70% greedy
-                    next_node = min(neighbors, key=lambda n: self.heuristic(n))
-                else:  # 30% random exploration
-                    next_node = random.choice(neighbors)
-
-                path.append(next_node)
-                visited.add(next_node)
-                current = next_node
-
-            return path
-
-        # Fitness function - lower is better (distance to goal + path length)
-        def fitness(path):
-            if not path:
-                return float("inf")
-            last = path[-1]
-            distance_to_goal = self.heuristic(last)
-            path_length = len(path)
-            reached_goal = 1 if last == self.goal else 0
-
-            # Reward reaching goal, penalize distance and length
-            return distance_to_goal + path_length * 0.5 - reached_goal * 1000
-
-        # Selection - tournament selection
-        def select_parent(population, fitnesses, tournament_size=3):
-            tournament = random.sample(
-                list(zip(population, fitnesses)), tournament_size
-            )
-            return min(tournament, key=lambda x: x[1])[0]
-
-        # Crossover - combine two parent paths
-        def crossover(parent1, parent2):
-            if len(parent1) < 2 or len(parent2) < 2:
-                return parent1.copy()
-
-            # Find common nodes
-            common = set(parent1) & set(parent2)
-            if not common or self.start not in common:
-                return parent1.copy()
-
-            # Pick a crossover point from common nodes
-            common_nodes = [n for n in parent1 if n in common]
-            if len(common_nodes) < 2:
-                return parent1.copy()
-
-            crossover_point = random.choice(common_nodes[1:])
-
-            # Build child path
-            idx1 = parent1.index(crossover_point)
-            idx2 = parent2.index(crossover_point)
-
-            child = parent1[: idx1 + 1] + parent2[idx2 + 1 :]
-            return child
-
-        # Mutation - randomly change part of path
-        def mutate(path):
-            if len(path) < 3 or random.random() > mutation_rate:
-                return path
-
-            # Pick a random point in path and regenerate from there
-            mutation_point = random.randint(1, len(path) - 1)
-            mutated = path[:mutation_point]
-            current = mutated[-1]
-
-            # Generate a few random steps
-            for _ in range(random.randint(1, 5)):
-                neighbors = self.get_neighbors(current)
-                if not neighbors:
-                    break
-                next_node = random.choice(neighbors)
-                mutated.append(next_node)
-                current = next_node
-                if current == self.goal:
-                    break
-
-            return mutated
-
-        # Initialize population
-        population = [generate_random_path() for _ in range(population_size)]
-        best_path = None
-        best_fitness = float("inf")
-
-        # Evolution
-        for generation in range(generations):
-            # Calculate fitness for all individuals
-            fitnesses = [fitness(path) for path in population]
-
-            # Track best solution
-            gen_best_idx = fitnesses.index(min(fitnesses))
-            if fitnesses[gen_best_idx] < best_fitness:
-                best_fitness = fitnesses[gen_best_idx]
-                best_path = population[gen_best_idx].copy()
-
-                # Record steps for visualization
-                for pos in best_path:
-                    steps.append({"position": list(pos), "type": "visiting"})
-
-            # Check if goal is reached
-            if best_path and best_path[-1] == self.goal:
-                break
-
-            # Selection and reproduction
-            # Keep elite individuals
-            elite_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i])[
-                :elite_size
-            ]
-            new_population = [population[i].copy() for i in elite_indices]
-
-            # Generate rest of population through crossover and mutation
-            while len(new_population) < population_size:
-                parent1 = select_parent(population, fitnesses)
-                parent2 = select_parent(population, fitnesses)
-
-                child = crossover(parent1, parent2)
-                child = mutate(child)
-
-                new_population.append(child)
-
-            population = new_population
-
-        # Return best solution found
-        if best_path:
-            path_found = best_path[-1] == self.goal
-            return {
-                "path_found": path_found,
-                "path": best_path if path_found else None,
-                "steps": (
-                    steps[-200:] if len(steps) > 200 else steps
-                ),  # Limit steps for performance
-                "nodes_explored": len(steps),
-                "path_cost": len(best_path) - 1 if path_found else 0,
-                "generations": generation + 1,
-            }
-
-        return {
-            "path_found": False,
-            "path": None,
-            "steps": [],
-            "nodes_explored": 0,
-            "path_cost": 0,
+        options = self.options
+        evolution = GeneticPathEngine(
+            self.engine,
+            self.start,
+            self.goal,
+            population_size=options.get("population_size", GA_POPULATION_SIZE),
+            generations=options.get("generations", GA_GENERATIONS),
+            mutation_rate=options.get("mutation_rate", GA_MUTATION_RATE),
+            seed=self.seed,
+            workers=options.get("workers", 0),
+        )
+        steps = self.new_trace()
+
+        # Evaluate no more genomes than fit in the trace before its next
+        # yield, so budgets are checked every few evaluations
+        def batch_size():
+            return max(1, steps.chunk_size - len(steps.cells))
+
+        with closing(evolution.evolve(batch_size)) as generations:
+            try:
+                for ends, improved in generations:
+                    # Where each evaluated genome ended up
+                    for cell in ends.tolist():
+                        steps.explore(cell)
+                    if improved:
+                        # Record the new best path for visualization
+                        for cell in evolution.best_path():
+                            steps.visit(cell)
+                    if len(steps.cells) >= steps.chunk_size:
+                        yield steps
+            except SearchBudgetExceeded:
+                pass  # Keep the best genome evolved so far
+
+        extra = {
+            "generations": evolution.generations_run,
+            "population_size": evolution.population_size,
+            "genome_length": evolution.genome_length,
+            "evaluations": evolution.evaluations,
         }
+        if evolution.best_genome is None:
+            return self.build_result(False, None, steps, 0, **extra)
+        return self.build_result(
+            evolution.best_arrived, evolution.best_path(), steps, **extra
+        )
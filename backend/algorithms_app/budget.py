@@ -0,0 +1,76 @@
+"""
+Time and node budgets shared by every search in AlgorithmRunner.
+
+The runner checks the budget each time a search yields its step trace,
+which it makes happen at least every ``BUDGET_CHECK_STEPS`` steps while a
+budget is set. When the budget runs out, :class:`SearchBudgetExceeded` is
+thrown into the search at that yield. Anytime searches (ARA*, the genetic
+algorithm) catch it and return the best answer found so far. Any other
+search simply stops, and the runner reports it found no path.
+"""
+
+import time
+
+# Steps between budget checks
+BUDGET_CHECK_STEPS = 1024
+
+
+class SearchBudgetExceeded(Exception):
+    """Thrown into a search whose time or node budget has run out"""
+
+    def __init__(self, reason):
+        super().__init__(f"Search {reason} budget exhausted")
+        self.reason = reason
+
+
+class SearchBudget:
+    """A wall-clock deadline and/or a cap on nodes explored
+
+    The clock starts at :meth:`start`. ``exhausted`` is set to ``"time"``
+    or ``"nodes"`` once :meth:`check` finds that limit passed.
+    """
+
+    def __init__(self, time_budget_ms=None, max_nodes=None):
+        self.time_budget_ms = time_budget_ms
+        self.max_nodes = max_nodes
+        self.started = None
+        self.deadline = None
+        self.exhausted = None
+
+    @classmethod
+    def from_options(cls, options):
+        """The budget requested in runner options, or None if there is none"""
+        time_budget_ms = options.get("time_budget_ms")
+        max_nodes = options.get("max_nodes")
+        if time_budget_ms is None and max_nodes is None:
+            return None
+        return cls(time_budget_ms, max_nodes)
+
+    def start(self):
+        self.started = time.monotonic()
+        if self.time_budget_ms is not None:
+            self.deadline = self.started + self.time_budget_ms / 1000
+
+    def steps_until_check(self, nodes):
+        """Steps a search may record before the budget must be checked again"""
+        if self.max_nodes is None:
+            return BUDGET_CHECK_STEPS
+        return max(1, min(BUDGET_CHECK_STEPS, self.max_nodes - nodes))
+
+    def check(self, nodes):
+        """Raise :class:`SearchBudgetExceeded` if a limit has been passed"""
+        if self.max_nodes is not None and nodes >= self.max_nodes:
+            self.exhausted = "nodes"
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.exhausted = "time"
+        if self.exhausted:
+            raise SearchBudgetExceeded(self.exhausted)
+
+    def report(self):
+        """Summary added to the result of a budgeted search"""
+        return {
+            "time_budget_ms": self.time_budget_ms,
+            "max_nodes": self.max_nodes,
+            "exhausted": self.exhausted,
+            "elapsed_ms": round((time.monotonic() - self.started) * 1000, 3),
+        }
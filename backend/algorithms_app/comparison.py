@@ -0,0 +1,115 @@
+"""
+Side-by-side runs of several pathfinding algorithms on one grid.
+
+The grid is parsed into a :class:`GridEngine` once and sent with each
+algorithm to a module-level process pool, started on first use with one
+worker per CPU and shared by every comparison. Up to ``processes``
+algorithms run at once, so the total latency approaches that of the
+slowest algorithm rather than the sum.
+
+Peak memory is how far the worker's resident set grew while an algorithm
+ran. It is read from ``/proc`` after resetting the kernel's high-water
+mark, so it is only available on Linux (elsewhere it is None), and only
+in pool workers: the serving process's own accounting is never reset.
+Memory an earlier algorithm in the same worker freed and this one reused
+is not counted again.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .algorithms import AlgorithmRunner
+
+# Result keys always kept in a comparison row
+SUMMARY_KEYS = ("path_found", "path_cost", "nodes_explored", "budget")
+
+# Result keys that are only kept when traces are requested
+TRACE_KEYS = ("path", "steps", "trace")
+
+_pool = None
+
+
+def _shared_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(os.cpu_count() or 1)
+    return _pool
+
+
+def _status_bytes(field):
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    raise OSError(f"{field} missing from /proc/self/status")
+
+
+def _reset_peak_memory():
+    """Reset the resident-set high-water mark; the current RSS, or None
+
+    Only a pool worker resets its mark, never the serving process.
+    """
+    if multiprocessing.parent_process() is None:
+        return None
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return _status_bytes("VmRSS")
+    except OSError:
+        return None
+
+
+def compare_one(engine, algorithm, params, include_traces=False):
+    """Run one algorithm and summarise it as a comparison row
+
+    ``params`` holds the keyword arguments of :class:`AlgorithmRunner`
+    other than the algorithm and grid. Errors are reported in the row
+    instead of being raised, so one algorithm that cannot handle the grid
+    does not sink the others.
+    """
+    row = {"algorithm": algorithm}
+    baseline = _reset_peak_memory()
+    started = time.perf_counter()
+    try:
+        result = AlgorithmRunner(algorithm, engine, **params).execute()
+    except Exception as e:
+        row["error"] = str(e)
+        return row
+    row["wall_time"] = time.perf_counter() - started
+    row["peak_memory_bytes"] = (
+        max(_status_bytes("VmHWM") - baseline, 0) if baseline is not None else None
+    )
+
+    path = result.get("path")
+    row["path_length"] = len(path) if path else 0
+    keys = SUMMARY_KEYS + TRACE_KEYS if include_traces else SUMMARY_KEYS
+    row.update((key, result[key]) for key in keys if key in result)
+    return row
+
+
+def run_comparison(engine, algorithms, params, include_traces=False, processes=None):
+    """Run ``algorithms`` on one engine; returns the rows and the processes used
+
+    Rows come back in the order of ``algorithms``. ``processes`` is how
+    many run at once in the shared pool; it defaults to one per algorithm,
+    capped at the CPU count.
+    """
+    global _pool
+    processes = min(processes or len(algorithms), len(algorithms), os.cpu_count() or 1)
+    pool = _shared_pool()
+    futures, running = [], set()
+    try:
+        for algorithm in algorithms:
+            if len(running) == processes:
+                _, running = wait(running, return_when=FIRST_COMPLETED)
+            future = pool.submit(compare_one, engine, algorithm, params, include_traces)
+            futures.append(future)
+            running.add(future)
+        return [future.result() for future in futures], processes
+    except BrokenProcessPool:
+        # A worker died; the next comparison starts a fresh pool
+        _pool = None
+        raise
@@ -0,0 +1,229 @@
+"""
+Cost model behind the ``auto`` algorithm.
+
+A few cheap grid statistics (size, obstacle density, mean terrain cost, the
+start/goal Manhattan distance and how diagonal it is, how much of the grid
+lies within that distance of each end, and whether either end is sealed in
+a small pocket) predict how many nodes each optimal engine would explore
+and how long that takes; ``auto`` runs the engine with the lowest predicted
+time.
+
+The constants were fitted to measured runs of every engine on random
+obstacle grids from 64x64 to 1024x1024 at 0-40% density, with
+corner-to-corner, interior, random and short queries, on weighted terrain
+of several mixes and on backtracker, Prim and Kruskal mazes. Node counts on
+random grids scatter by about a factor of two around the fit, so the choice
+is sometimes not the fastest engine; comparing a run's ``selection``
+against its measured ``execution_time`` shows how far off it was.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+# Microseconds per explored node, and per grid cell of one-off setup
+# (search state arrays, and JPS's jump tables for the whole grid)
+ENGINE_COSTS = {
+    "bfs": (0.56, 0.0024),
+    "bidirectional_bfs": (0.71, 0.0037),
+    "astar": (1.41, 0.0024),
+    "bidirectional_astar": (2.92, 0.0038),
+    "jps": (4.4, 0.018),
+    "dijkstra": (1.33, 0.0024),
+}
+
+# The heuristic engines pay more per node for heap entries on weighted grids
+WEIGHTED_ENGINE_COSTS = {
+    **ENGINE_COSTS,
+    "astar": (1.57, 0.0024),
+    "bidirectional_astar": (3.54, 0.0039),
+}
+
+# Every cell a search settles is traced once when discovered and once when
+# expanded, and nodes_explored counts both
+NODES_PER_CELL = 2
+
+# A* and bidirectional A* explore about
+# exp(a + b*p + g*p*s) * d**(c + e*p + f*p²) nodes for a goal d steps away
+# at obstacle density p, where s is the diagonal share of the distance: on
+# open grids the Manhattan heuristic leads almost straight to the goal,
+# obstacles make the search sweep wider the further it has to go, and least
+# so on diagonal queries, which many equally short paths can take
+HEURISTIC_NODE_FITS = {
+    "astar": (0.63, 0.27, -7.37, 1.19, 1.45, 0.46),
+    "bidirectional_astar": (1.78, -0.07, -13.0, 0.95, 0.62, 4.36),
+}
+
+# JPS explores about this share of A*'s nodes, and next to none on open
+# grids, where a handful of jumps cross the whole grid
+JPS_NODE_SHARE = 0.5
+JPS_SHARE_PER_DENSITY = 50.0
+
+# Random grids stop percolating around 40% density, so denser grids are
+# mazes or rooms: paths wind through corridors regardless of the distance
+# and each engine explores about this share of the open cells
+MAZE_DENSITY = 0.45
+MAZE_NODE_SHARE = {
+    "bfs": 0.6,
+    "bidirectional_bfs": 0.38,
+    "astar": 0.38,
+    "bidirectional_astar": 0.35,
+    "jps": 0.1,
+}
+
+# Cells flooded from each end to tell whether it is sealed in a pocket
+POCKET_LIMIT = 256
+
+
+def cells_within(engine, cell, radius):
+    """Grid cells within Manhattan ``radius`` of ``cell``, clipped to the grid"""
+    row, col = divmod(cell, engine.cols)
+    half = radius - np.abs(np.arange(engine.rows) - row)
+    left = np.maximum(col - half, 0)
+    right = np.minimum(col + half, engine.cols - 1)
+    return int(np.clip(right - left + 1, 0, None)[half >= 0].sum())
+
+
+def pocket(engine, cell, limit=POCKET_LIMIT):
+    """Cells reachable from ``cell`` if there are at most ``limit``, else None"""
+    reached = {cell}
+    queue = deque([cell])
+    while queue:
+        for neighbor in engine.neighbors(queue.popleft()):
+            if neighbor not in reached:
+                if len(reached) == limit:
+                    return None
+                reached.add(neighbor)
+                queue.append(neighbor)
+    return reached
+
+
+def grid_features(engine, start, goal):
+    """The statistics the model works from
+
+    O(cells) NumPy reductions plus two floods of at most ``POCKET_LIMIT`` cells.
+    """
+    open_cells = int(engine.passable.sum())
+    open_fraction = open_cells / engine.size
+    start_row, start_col = divmod(start, engine.cols)
+    goal_row, goal_col = divmod(goal, engine.cols)
+    rows_apart, cols_apart = abs(start_row - goal_row), abs(start_col - goal_col)
+    distance = rows_apart + cols_apart
+    start_pocket = pocket(engine, start)
+    # Searches never settle an obstacle goal, and bidirectional ones stop at once
+    goal_pocket = pocket(engine, goal) if engine.is_passable(goal) else ()
+    return {
+        "cells": engine.size,
+        "open_cells": open_cells,
+        "obstacle_density": round(1 - open_fraction, 4),
+        "weighted": engine.weighted,
+        "mean_cost": (round(engine.total_cost / open_cells, 4) if open_cells else 1.0),
+        "distance": distance,
+        "diagonal": round(min(rows_apart, cols_apart) / max(distance, 1), 4),
+        # Open cells a search from the start floods before reaching the goal,
+        # and the two searches of a bidirectional engine before they meet
+        "flood_cells": round(
+            min(open_fraction * cells_within(engine, start, distance), open_cells)
+        ),
+        "meeting_cells": round(
+            min(
+                open_fraction
+                * (
+                    cells_within(engine, start, distance / 2)
+                    + cells_within(engine, goal, distance / 2)
+                ),
+                open_cells,
+            )
+        ),
+        # Size of the region each end lies in, when it is a small pocket
+        "start_pocket": None if start_pocket is None else len(start_pocket),
+        "goal_pocket": None if goal_pocket is None else len(goal_pocket),
+    }
+
+
+def heuristic_nodes(algorithm, features):
+    """Nodes A* or bidirectional A* explore on a random grid, by the fit"""
+    fit = HEURISTIC_NODE_FITS[algorithm]
+    base, base_density, base_diagonal, power, power_density, power_density2 = fit
+    density = features["obstacle_density"]
+    scale = math.exp(
+        base + (base_density + base_diagonal * features["diagonal"]) * density
+    )
+    return scale * max(features["distance"], 1) ** (
+        power + power_density * density + power_density2 * density**2
+    )
+
+
+def predicted_nodes(features):
+    """Expected nodes explored by each optimal engine for these features"""
+    flood = NODES_PER_CELL * max(features["flood_cells"], 1)
+    if features["weighted"]:
+        # The Manhattan heuristic counts every step as cost 1, so on costly
+        # terrain A* settles a growing share of the cells Dijkstra would.
+        # BFS ignores terrain costs and JPS refuses them.
+        share = 1 - 1 / features["mean_cost"]
+        nodes = {
+            algorithm: min(
+                max(heuristic_nodes(algorithm, features), flood * share), flood
+            )
+            for algorithm in HEURISTIC_NODE_FITS
+        }
+        nodes["dijkstra"] = flood
+    elif features["obstacle_density"] >= MAZE_DENSITY:
+        nodes = {
+            algorithm: NODES_PER_CELL * features["open_cells"] * share
+            for algorithm, share in MAZE_NODE_SHARE.items()
+        }
+    else:
+        nodes = {
+            algorithm: min(heuristic_nodes(algorithm, features), flood)
+            for algorithm in HEURISTIC_NODE_FITS
+        }
+        nodes["bfs"] = flood
+        nodes["bidirectional_bfs"] = NODES_PER_CELL * max(features["meeting_cells"], 1)
+        nodes["jps"] = (
+            nodes["astar"]
+            * min(JPS_NODE_SHARE, JPS_SHARE_PER_DENSITY * features["obstacle_density"])
+            + 1
+        )
+
+    if features["start_pocket"] is not None:
+        # Nothing can explore beyond the start's pocket
+        cap = NODES_PER_CELL * features["start_pocket"]
+        nodes = {algorithm: min(expanded, cap) for algorithm, expanded in nodes.items()}
+    elif features["goal_pocket"] is not None:
+        # The goal is cut off: one-directional engines flood the start's whole
+        # region, bidirectional ones give up once the goal's side runs dry
+        for algorithm in nodes:
+            if algorithm.startswith("bidirectional_"):
+                nodes[algorithm] = 2 * NODES_PER_CELL * features["goal_pocket"]
+            else:
+                nodes[algorithm] = NODES_PER_CELL * features["open_cells"]
+    return nodes
+
+
+def choose_algorithm(engine, start, goal):
+    """Pick the optimal engine with the lowest predicted time
+
+    Returns the chosen algorithm with its predicted nodes and milliseconds,
+    the features it was based on and the predicted milliseconds of every
+    candidate.
+    """
+    features = grid_features(engine, start, goal)
+    nodes = predicted_nodes(features)
+    costs = WEIGHTED_ENGINE_COSTS if features["weighted"] else ENGINE_COSTS
+    candidates = {}
+    for algorithm, expanded in nodes.items():
+        per_node, per_cell = costs[algorithm]
+        candidates[algorithm] = (
+            expanded * per_node + features["cells"] * per_cell
+        ) / 1000
+    algorithm = min(candidates, key=candidates.get)
+    return {
+        "algorithm": algorithm,
+        "predicted_nodes": round(nodes[algorithm]),
+        "predicted_ms": round(candidates[algorithm], 3),
+        "features": features,
+        "candidates_ms": {name: round(ms, 3) for name, ms in candidates.items()},
+    }
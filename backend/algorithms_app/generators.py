@@ -0,0 +1,236 @@
+"""
+Seeded procedural grids: mazes and random obstacle fields.
+
+Every generator is deterministic in its seed and writes a flat mask that
+is packed into a :class:`~.grid_codec.PackedGrid`, up to 4096x4096 cells.
+
+Mazes put rooms on even coordinates and walls between them, so ``(0, 0)``
+is always open; with odd dimensions so is the bottom-right corner. Every
+room is reachable from every other along exactly one path.
+
+``backtracker``
+    Recursive backtracker (randomized depth-first search): long, winding
+    corridors with few dead ends.
+``prim``
+    Randomized Prim's algorithm: grows from one room by opening a random
+    frontier room each step, giving many short dead ends.
+``kruskal``
+    Randomized Kruskal's algorithm: the minimum spanning tree of randomly
+    ordered walls. The tree is computed with vectorized Borůvka rounds,
+    which pick exactly the tree Kruskal's algorithm would for the same wall
+    order, without a Python-level union-find over millions of walls.
+``random``
+    Independent obstacles at a given density, with the top-left and
+    bottom-right corners kept open.
+"""
+
+import numpy as np
+
+from .caching import ByteBoundedLRU
+from .grid_codec import MAX_PACKED_CELLS, PackedGrid
+
+GENERATORS = ("backtracker", "prim", "kruskal", "random")
+MAX_GENERATED_SIDE = 4096
+# Largest side of a spec sent inline as a request's grid: it is generated
+# while the request waits, in under a tenth of a second at this size
+MAX_INLINE_GENERATED_SIDE = 512
+GENERATED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Rows of random obstacles drawn per block; a multiple of 8 so blocks pack
+# into whole bytes
+RANDOM_BLOCK_ROWS = 256
+
+_generated_grids = ByteBoundedLRU(GENERATED_CACHE_MAX_BYTES)
+
+
+def _room_grid(rows, cols):
+    """Rooms per column and row of a maze, and its all-walls open mask"""
+    return (rows + 1) // 2, (cols + 1) // 2, bytearray(rows * cols)
+
+
+def _room_cell(room, room_cols, cols):
+    row, col = divmod(room, room_cols)
+    return 2 * row * cols + 2 * col
+
+
+def backtracker_maze(rows, cols, seed):
+    """Flat open mask of a recursive-backtracker maze"""
+    room_rows, room_cols, open_cells = _room_grid(rows, cols)
+    rooms = room_rows * room_cols
+    draws = np.random.default_rng(seed).random(rooms).tolist()
+    visited = bytearray(rooms)
+    visited[0] = 1
+    open_cells[0] = 1
+    stack = [0]
+    carved = 0
+    while stack:
+        room = stack[-1]
+        row, col = divmod(room, room_cols)
+        options = []
+        if col + 1 < room_cols and not visited[room + 1]:
+            options.append(room + 1)
+        if row + 1 < room_rows and not visited[room + room_cols]:
+            options.append(room + room_cols)
+        if col and not visited[room - 1]:
+            options.append(room - 1)
+        if row and not visited[room - room_cols]:
+            options.append(room - room_cols)
+        if not options:
+            stack.pop()
+            continue
+        following = options[int(draws[carved] * len(options))]
+        carved += 1
+        visited[following] = 1
+        here = 2 * row * cols + 2 * col
+        there = _room_cell(following, room_cols, cols)
+        open_cells[there] = 1
+        open_cells[(here + there) // 2] = 1
+        stack.append(following)
+    return open_cells
+
+
+def prim_maze(rows, cols, seed):
+    """Flat open mask of a randomized Prim's maze"""
+    room_rows, room_cols, open_cells = _room_grid(rows, cols)
+    rooms = room_rows * room_cols
+    draws = np.random.default_rng(seed).random((rooms, 2)).tolist()
+    # 0 = not reached, 1 = on the frontier, 2 = part of the maze
+    state = bytearray(rooms)
+    state[0] = 2
+    open_cells[0] = 1
+    frontier = []
+    room = 0
+    for pick, link in draws:
+        # Move the new room's unreached neighbours onto the frontier and
+        # collect the ones already in the maze
+        row, col = divmod(room, room_cols)
+        inside = []
+        for neighbour, exists in (
+            (room + 1, col + 1 < room_cols),
+            (room + room_cols, row + 1 < room_rows),
+            (room - 1, col > 0),
+            (room - room_cols, row > 0),
+        ):
+            if exists:
+                if not state[neighbour]:
+                    state[neighbour] = 1
+                    frontier.append(neighbour)
+                elif state[neighbour] == 2:
+                    inside.append(neighbour)
+        here = 2 * row * cols + 2 * col
+        if inside:
+            joined = inside[int(link * len(inside))]
+            open_cells[(here + _room_cell(joined, room_cols, cols)) // 2] = 1
+        open_cells[here] = 1
+        state[room] = 2
+        if not frontier:
+            break
+        # Swap-remove a random frontier room; it joins the maze next
+        index = int(pick * len(frontier))
+        room = frontier[index]
+        frontier[index] = frontier[-1]
+        frontier.pop()
+    return open_cells
+
+
+def kruskal_maze(rows, cols, seed):
+    """Flat open mask of a randomized Kruskal's maze"""
+    room_rows, room_cols, _ = _room_grid(rows, cols)
+    rooms = np.arange(room_rows * room_cols, dtype=np.int64).reshape(
+        room_rows, room_cols
+    )
+    # Walls between horizontally, then vertically, adjacent rooms, shuffled;
+    # a wall's position in the list is its weight
+    first = np.concatenate((rooms[:, :-1].ravel(), rooms[:-1, :].ravel()))
+    second = np.concatenate((rooms[:, 1:].ravel(), rooms[1:, :].ravel()))
+    order = np.random.default_rng(seed).permutation(len(first))
+    first, second = first[order], second[order]
+
+    component = np.arange(rooms.size, dtype=np.int64)
+    opened = np.zeros(len(first), dtype=bool)
+    walls = np.arange(len(first), dtype=np.int64)
+    while len(walls):
+        a, b = component[first[walls]], component[second[walls]]
+        between = a != b
+        walls, a, b = walls[between], a[between], b[between]
+        if not len(walls):
+            break
+        # Each component opens its lightest wall to another component
+        lightest = np.full(rooms.size, len(first), dtype=np.int64)
+        np.minimum.at(lightest, a, walls)
+        np.minimum.at(lightest, b, walls)
+        owners = np.flatnonzero(lightest < len(first))
+        chosen = lightest[owners]
+        opened[chosen] = True
+
+        # Merge along the chosen walls: point each component at the other
+        # side, break the two-cycles of shared walls, then jump to the roots
+        pointer = np.arange(rooms.size, dtype=np.int64)
+        ends_a, ends_b = component[first[chosen]], component[second[chosen]]
+        pointer[owners] = np.where(ends_a == owners, ends_b, ends_a)
+        mutual = (pointer[pointer[owners]] == owners) & (owners < pointer[owners])
+        pointer[owners[mutual]] = owners[mutual]
+        while True:
+            jumped = pointer[pointer]
+            if np.array_equal(jumped, pointer):
+                break
+            pointer = jumped
+        component = pointer[component]
+
+    open_cells = np.zeros(rows * cols, dtype=bool)
+    room_row, room_col = np.divmod(rooms.ravel(), room_cols)
+    open_cells[2 * room_row * cols + 2 * room_col] = True
+    ends = []
+    for side in (first[opened], second[opened]):
+        side_row, side_col = np.divmod(side, room_cols)
+        ends.append(2 * side_row * cols + 2 * side_col)
+    open_cells[(ends[0] + ends[1]) // 2] = True
+    return open_cells
+
+
+def random_obstacles(rows, cols, seed, density):
+    """Packed bits of independent obstacles, drawn a block of rows at a time"""
+    rng = np.random.default_rng(seed)
+    bits = np.zeros(-(-rows * cols // 8), dtype=np.uint8)
+    for top in range(0, rows, RANDOM_BLOCK_ROWS):
+        block = rng.random((min(RANDOM_BLOCK_ROWS, rows - top), cols)) < density
+        packed = np.packbits(block.reshape(-1))
+        first = top * cols // 8
+        bits[first : first + len(packed)] = packed
+    grid = PackedGrid(rows, cols, bits)
+    for cell in (0, rows * cols - 1):
+        bits[cell >> 3] &= ~np.uint8(0x80 >> (cell & 7))
+    return grid
+
+
+def generate_grid(kind, rows, cols, seed=0, density=0.3):
+    """A seeded grid of the given kind as a :class:`PackedGrid`
+
+    Raises ValueError for an unknown kind or an unsupported size.
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Generator must be one of {list(GENERATORS)}")
+    if not (1 <= rows <= MAX_GENERATED_SIDE and 1 <= cols <= MAX_GENERATED_SIDE):
+        raise ValueError(f"Grid sides must be between 1 and {MAX_GENERATED_SIDE}")
+    if rows * cols > MAX_PACKED_CELLS:
+        raise ValueError(f"Grid of {rows * cols} cells exceeds {MAX_PACKED_CELLS}")
+    if kind == "random":
+        return random_obstacles(rows, cols, seed, density)
+
+    maze = {
+        "backtracker": backtracker_maze,
+        "prim": prim_maze,
+        "kruskal": kruskal_maze,
+    }[kind]
+    open_cells = np.asarray(maze(rows, cols, seed), dtype=bool)
+    return PackedGrid.from_mask(~open_cells.reshape(rows, cols))
+
+
+def generated_grid(kind, rows, cols, seed=0, density=0.3):
+    """:func:`generate_grid`, cached so repeated requests for a seed are free"""
+    key = (kind, rows, cols, seed, density if kind == "random" else None)
+    grid = _generated_grids.get(key)
+    if grid is None:
+        grid = generate_grid(kind, rows, cols, seed, density)
+        _generated_grids.put(key, grid, grid.nbytes)
+    return grid
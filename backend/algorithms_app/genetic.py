@@ -0,0 +1,324 @@
+"""
+Vectorized genetic algorithm for grid pathfinding.
+
+An individual is a fixed-length array of direction codes (indices into
+``grid_engine.DIRECTIONS``) and the population is one ``(size, length)``
+uint8 array. Fitness is evaluated for the whole population at once by
+replaying every genome in lock step: one NumPy step per gene, over all
+individuals. Moves into walls or off the grid are skipped. Each individual
+stops at the goal. Selection, crossover and mutation are array operations
+as well.
+
+The first generation is seeded with randomised walks down the goal's
+distance field: each individual takes the cheapest way on with its own
+probability and a random direction otherwise, so the population starts
+spread between near-optimal paths and wide detours.
+
+Fitness is the terrain cost walked plus a weighted exact distance still
+left to the goal (from a reverse distance field), with a flat penalty for
+not arriving, so any genome that reaches the goal beats every genome that
+does not. Lower is better.
+
+With ``workers > 1`` the population is split across a process pool whose
+workers receive the grid once, when the pool starts.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .grid_engine import DIRECTIONS, UNREACHABLE
+
+GA_POPULATION_SIZE = 200
+GA_GENERATIONS = 200
+GA_MUTATION_RATE = 0.02  # Per gene
+GA_ELITE_FRACTION = 0.05
+GA_TOURNAMENT_SIZE = 3
+
+# Upper bound on population_size * genome_length held in memory at once
+GA_MAX_GENES = 64 * 1024 * 1024
+
+# Stop once the goal is reached and the best fitness stalls this long
+GA_STALL_GENERATIONS = 20
+
+# Weight of each unit of remaining distance relative to cost already walked
+REMAINING_WEIGHT = 2
+
+# Seeded walks take the cheapest way on with a probability drawn per
+# individual from this range, and a random direction otherwise
+GA_MIN_GREED = 0.6
+GA_MAX_GREED = 1.0
+
+# Genomes hold this many times the steps of the cheapest path, so that
+# walks with random detours still have the genes to arrive
+GA_GENOME_SLACK = 2
+
+_worker_context = None
+
+
+class PaddedGrid:
+    """Grid arrays padded with a ring of obstacles, for bounds-free stepping"""
+
+    def __init__(self, engine, goal):
+        rows, cols = engine.rows, engine.cols
+        self.cols = cols
+        self.width = cols + 2
+        shape = (rows + 2, self.width)
+
+        passable = np.zeros(shape, dtype=bool)
+        passable[1:-1, 1:-1] = engine.passable.reshape(rows, cols)
+        costs = np.zeros(shape, dtype=np.int64)
+        costs[1:-1, 1:-1] = engine.costs.reshape(rows, cols)
+
+        # Exact cost still needed to reach the goal; unreachable cells weigh
+        # more than crossing the whole grid
+        remaining = engine.distances_from(goal, reverse=True).astype(np.int64)
+        worst = int(engine.costs.sum()) + 1
+        remaining[remaining == UNREACHABLE] = worst
+        padded_remaining = np.full(shape, worst, dtype=np.int64)
+        padded_remaining[1:-1, 1:-1] = remaining.reshape(rows, cols)
+
+        self.passable = passable.reshape(-1)
+        self.costs = costs.reshape(-1)
+        self.remaining = padded_remaining.reshape(-1)
+        self.miss_penalty = worst * (REMAINING_WEIGHT + 1)
+        self.offsets = np.array(
+            [dr * self.width + dc for dr, dc in DIRECTIONS], dtype=np.int64
+        )
+
+    def padded(self, cell):
+        row, col = divmod(cell, self.cols)
+        return (row + 1) * self.width + col + 1
+
+    def unpadded(self, cell):
+        """Unpadded id of ``cell``, or of every cell in an array of them"""
+        row, col = divmod(cell, self.width)
+        return (row - 1) * self.cols + col - 1
+
+    def descent(self, start, limit):
+        """Steps on the cheapest path from ``start``, 0 if there is none
+
+        Counting stops at ``limit``.
+        """
+        worst = self.miss_penalty // (REMAINING_WEIGHT + 1)
+        position, steps = start, 0
+        while self.remaining[position] and steps < limit:
+            if self.remaining[position] >= worst:
+                return 0
+            targets = position + self.offsets
+            position = int(targets[self.step_costs(targets).argmin()])
+            steps += 1
+        return steps
+
+    def step_costs(self, targets):
+        """Cost of reaching the goal through each target cell, walls excluded"""
+        return np.where(
+            self.passable[targets],
+            self.costs[targets] + self.remaining[targets],
+            self.miss_penalty,
+        )
+
+    def seeded_genomes(self, start, count, length, rng):
+        """Genomes of randomised walks from ``start`` down the distance field"""
+        genomes = rng.integers(0, len(DIRECTIONS), (count, length), dtype=np.uint8)
+        greed = rng.uniform(GA_MIN_GREED, GA_MAX_GREED, count)
+        position = np.full(count, start, dtype=np.int64)
+        individuals = np.arange(count)
+        for step in range(length):
+            targets = position[:, None] + self.offsets
+            cheapest = self.step_costs(targets).argmin(axis=1)
+            genes = np.where(rng.random(count) < greed, cheapest, genomes[:, step])
+            genomes[:, step] = genes
+            target = targets[individuals, genes]
+            position = np.where(self.passable[target], target, position)
+        return genomes
+
+    def evaluate(self, genomes, start, goal):
+        """Fitness (lower is better), arrival and end cell of every genome"""
+        size = len(genomes)
+        position = np.full(size, start, dtype=np.int64)
+        walked = np.zeros(size, dtype=np.int64)
+        arrived = position == goal
+        for gene in genomes.T:
+            if arrived.all():
+                break
+            target = position + self.offsets[gene]
+            moves = self.passable[target] & ~arrived
+            position = np.where(moves, target, position)
+            walked += np.where(moves, self.costs[target], 0)
+            arrived |= position == goal
+
+        fitness = walked + REMAINING_WEIGHT * self.remaining[position]
+        fitness += np.where(arrived, 0, self.miss_penalty)
+        return fitness, arrived, position
+
+    def walk(self, genome, start, goal):
+        """Cells visited by one genome, with loops cut out, as unpadded ids"""
+        path = [start]
+        first_visit = {start: 0}
+        position = start
+        for gene in genome.tolist():
+            if position == goal:
+                break
+            target = position + int(self.offsets[gene])
+            if not self.passable[target]:
+                continue
+            position = target
+            if position in first_visit:
+                # Returned to an earlier cell: drop the loop
+                del path[first_visit[position] + 1 :]
+                first_visit = {cell: index for index, cell in enumerate(path)}
+            else:
+                first_visit[position] = len(path)
+                path.append(position)
+        return [self.unpadded(cell) for cell in path]
+
+
+def _init_worker(grid, start, goal):
+    global _worker_context
+    _worker_context = (grid, start, goal)
+
+
+def _evaluate_in_worker(genomes):
+    grid, start, goal = _worker_context
+    return grid.evaluate(genomes, start, goal)
+
+
+class GeneticPathEngine:
+    """Evolves direction-code genomes from ``start`` towards ``goal``"""
+
+    def __init__(
+        self,
+        engine,
+        start,
+        goal,
+        population_size=GA_POPULATION_SIZE,
+        generations=GA_GENERATIONS,
+        mutation_rate=GA_MUTATION_RATE,
+        seed=None,
+        workers=0,
+        genome_length=None,
+    ):
+        self.grid = PaddedGrid(engine, goal)
+        self.start = self.grid.padded(start)
+        self.goal = self.grid.padded(goal)
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.workers = min(workers, os.cpu_count() or 1)
+        if genome_length is None:
+            # Enough genes to go around a few obstacles on the way, and to
+            # follow a winding cheapest path with detours, within the limit
+            most = GA_MAX_GENES // population_size
+            genome_length = min(
+                max(
+                    2 * (engine.rows + engine.cols),
+                    GA_GENOME_SLACK * self.grid.descent(self.start, most),
+                ),
+                most,
+            )
+        self.genome_length = genome_length
+        if population_size * self.genome_length > GA_MAX_GENES:
+            raise ValueError(
+                f"Population of {population_size} genomes of {self.genome_length} "
+                f"genes exceeds the limit of {GA_MAX_GENES} genes"
+            )
+        self.elite_size = max(1, int(population_size * GA_ELITE_FRACTION))
+        self.rng = np.random.default_rng(seed)
+
+        self.best_genome = None
+        self.best_fitness = None
+        self.best_arrived = False
+        self.generations_run = 0
+        self.evaluations = 0
+
+    def evaluate(self, population, pool):
+        if pool is None:
+            return self.grid.evaluate(population, self.start, self.goal)
+        chunks = np.array_split(population, min(self.workers, len(population)))
+        results = list(pool.map(_evaluate_in_worker, chunks))
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+
+    def next_generation(self, population, fitness):
+        """Elites plus tournament-selected, crossed-over and mutated children"""
+        rng, size, length = self.rng, self.population_size, self.genome_length
+        elites = population[np.argsort(fitness, kind="stable")[: self.elite_size]]
+
+        children = size - self.elite_size
+        contenders = rng.integers(0, size, (2, children, GA_TOURNAMENT_SIZE))
+        winners = np.take_along_axis(
+            contenders, fitness[contenders].argmin(axis=2)[..., None], axis=2
+        )[..., 0]
+        mothers, fathers = population[winners[0]], population[winners[1]]
+
+        # Single-point crossover
+        cuts = rng.integers(1, length, children)
+        from_mother = np.arange(length) < cuts[:, None]
+        offspring = np.where(from_mother, mothers, fathers)
+
+        mutations = rng.random(offspring.shape) < self.mutation_rate
+        offspring[mutations] = rng.integers(
+            0, len(DIRECTIONS), int(mutations.sum()), dtype=np.uint8
+        )
+        return np.concatenate((elites, offspring))
+
+    def evolve(self, batch_size):
+        """Run the generations, evaluating ``batch_size()`` genomes at a time
+
+        Yields after every batch the cells its genomes ended on (unpadded)
+        and whether the batch completed a generation that improved the best
+        genome.
+        """
+        size = self.population_size
+        population = self.grid.seeded_genomes(
+            self.start, size, self.genome_length, self.rng
+        )
+        fitness = np.empty(size, dtype=np.int64)
+        arrived = np.empty(size, dtype=bool)
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(self.grid, self.start, self.goal),
+            )
+        try:
+            stalled = 0
+            for generation in range(self.generations):
+                done = 0
+                while True:
+                    batch = slice(done, min(done + batch_size(), size))
+                    fitness[batch], arrived[batch], ends = self.evaluate(
+                        population[batch], pool
+                    )
+                    self.evaluations += batch.stop - done
+                    done = batch.stop
+                    if done == size:
+                        break
+                    yield self.grid.unpadded(ends), False
+                self.generations_run = generation + 1
+
+                best = int(fitness.argmin())
+                improved = (
+                    self.best_fitness is None or fitness[best] < self.best_fitness
+                )
+                if improved:
+                    self.best_genome = population[best].copy()
+                    self.best_fitness = int(fitness[best])
+                    self.best_arrived = bool(arrived[best])
+                    stalled = 0
+                else:
+                    stalled += 1
+                yield self.grid.unpadded(ends), improved
+
+                if self.best_arrived and stalled >= GA_STALL_GENERATIONS:
+                    break
+                population = self.next_generation(population, fitness)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def best_path(self):
+        """The best genome's walk as unpadded cell ids"""
+        return self.grid.walk(self.best_genome, self.start, self.goal)
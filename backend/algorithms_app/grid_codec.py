@@ -0,0 +1,124 @@
+"""
+Compact wire format for obstacle grids.
+
+Instead of nested lists, a grid can be sent (and stored) as::
+
+    {"rows": R, "cols": C, "encoding": "bitpacked" | "rle", "data": "<base64>"}
+
+``bitpacked``
+    One bit per cell in row-major order, 1 for an obstacle, most significant
+    bit first within each byte; ``ceil(R * C / 8)`` bytes.
+``rle``
+    Little-endian uint32 run lengths that alternate between free and obstacle
+    cells, starting with free (the first run may be 0); they sum to ``R * C``.
+
+Both decode straight into a :class:`PackedGrid`, which keeps the mask at one
+bit per cell and is accepted wherever a grid of lists is, without a Python
+int ever being created per cell. Compact grids hold obstacles only, so every
+free cell costs 1.
+
+Packing saves transfer, parsing and storage, not search memory: a
+:class:`~.grid_engine.GridEngine` unpacks the mask once into its per-cell
+arrays, whose neighbour table dominates its footprint either way.
+"""
+
+import base64
+import binascii
+
+import numpy as np
+
+GRID_ENCODINGS = ("bitpacked", "rle")
+
+# Largest grid a compact payload may describe; RLE can name huge grids in a
+# few bytes
+MAX_PACKED_CELLS = 4096 * 4096
+
+
+class PackedGrid:
+    """Obstacle mask of a ``rows`` x ``cols`` grid packed eight cells per byte"""
+
+    def __init__(self, rows, cols, bits):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.bits = bits
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    @classmethod
+    def from_mask(cls, obstacles):
+        """Pack a 2-D boolean obstacle mask"""
+        obstacles = np.asarray(obstacles, dtype=bool)
+        rows, cols = obstacles.shape
+        return cls(rows, cols, np.packbits(obstacles.reshape(-1)))
+
+    @classmethod
+    def decode(cls, payload):
+        """Decode the wire format; raises ValueError if it is malformed"""
+        try:
+            rows, cols = int(payload["rows"]), int(payload["cols"])
+            encoding, data = payload["encoding"], payload["data"]
+        except (KeyError, TypeError) as e:
+            raise ValueError(
+                "A compact grid needs rows, cols, encoding and data"
+            ) from e
+        if rows < 1 or cols < 1:
+            raise ValueError("Grid dimensions must be positive")
+        size = rows * cols
+        if size > MAX_PACKED_CELLS:
+            raise ValueError(
+                f"Grid of {size} cells exceeds the limit of {MAX_PACKED_CELLS}"
+            )
+        if encoding not in GRID_ENCODINGS:
+            raise ValueError(f"Grid encoding must be one of {list(GRID_ENCODINGS)}")
+        try:
+            raw = base64.b64decode(data, validate=True)
+        except (binascii.Error, TypeError) as e:
+            raise ValueError("Grid data is not valid base64") from e
+
+        if encoding == "bitpacked":
+            if len(raw) != -(-size // 8):
+                raise ValueError(
+                    f"A bit-packed {rows}x{cols} grid needs {-(-size // 8)} bytes, "
+                    f"got {len(raw)}"
+                )
+            return cls(rows, cols, np.frombuffer(raw, dtype=np.uint8).copy())
+
+        if len(raw) % 4:
+            raise ValueError("RLE grid data must be a whole number of uint32 runs")
+        runs = np.frombuffer(raw, dtype="<u4").astype(np.int64)
+        if runs.sum() != size:
+            raise ValueError(f"RLE runs cover {runs.sum()} cells, expected {size}")
+        obstacles = np.repeat(np.arange(len(runs)) % 2 == 1, runs)
+        return cls(rows, cols, np.packbits(obstacles))
+
+    def encode(self, encoding="bitpacked"):
+        """The wire-format dict for this grid"""
+        if encoding == "bitpacked":
+            raw = self.bits.tobytes()
+        elif encoding == "rle":
+            obstacles = self.obstacles()
+            changes = np.flatnonzero(obstacles[1:] != obstacles[:-1]) + 1
+            bounds = np.concatenate(([0], changes, [self.size]))
+            runs = np.diff(bounds)
+            if obstacles[0]:
+                runs = np.concatenate(([0], runs))
+            raw = runs.astype("<u4").tobytes()
+        else:
+            raise ValueError(f"Grid encoding must be one of {list(GRID_ENCODINGS)}")
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "encoding": encoding,
+            "data": base64.b64encode(raw).decode("ascii"),
+        }
+
+    def obstacles(self):
+        """Flat boolean obstacle mask, one entry per cell"""
+        return np.unpackbits(self.bits, count=self.size).astype(bool)
+
+    def cells(self):
+        """Flat int32 cell values (0 free, 1 obstacle) for :class:`GridEngine`"""
+        return np.unpackbits(self.bits, count=self.size).astype(np.int32)
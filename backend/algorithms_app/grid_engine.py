@@ -0,0 +1,298 @@
+"""
+Flat NumPy grid representation shared by the pathfinding searches.
+
+Cells are addressed by integer ids (``row * cols + col``) and the passable
+neighbours of every cell are stored once per request in CSR form: the
+neighbours of cell ``c`` are ``indices[offsets[c]:offsets[c + 1]]``.
+
+Grid values are 0 (free, cost 1), 1 (obstacle) or 2..K, a terrain cost paid
+when a path enters the cell. A :class:`~.grid_codec.PackedGrid` obstacle mask
+may be given instead of nested lists.
+"""
+
+import hashlib
+from functools import cached_property
+from heapq import heappop, heappush
+
+import numpy as np
+
+from .grid_codec import PackedGrid
+
+FREE = 0
+OBSTACLE = 1
+
+# Right, Down, Left, Up - the order the searches have always expanded in
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+# Distance recorded for cells a single-source search never reaches
+UNREACHABLE = -1
+
+
+def grid_fingerprint(cells, rows, cols):
+    """Stable hex digest of a grid given its cell values in row-major order"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{rows}x{cols}:".encode())
+    digest.update(np.ascontiguousarray(cells, dtype="<i4").tobytes())
+    return digest.hexdigest()
+
+
+# Frontiers smaller than this are expanded in Python; NumPy's per-call
+# overhead only pays off on wide wavefronts
+WAVEFRONT_VECTOR_MIN = 64
+
+
+def wavefront_distances(passable, sources):
+    """BFS level of every cell of a 2-D boolean grid from the given flat ids
+
+    The grid is padded with a ring of obstacles so the neighbours of flat id
+    ``c`` in the padded grid are simply ``c ± 1`` and ``c ± width``. Each
+    wide wavefront is then expanded with a handful of whole-array NumPy
+    operations; narrow ones (corridors, mazes) fall back to a Python loop.
+    Sources may be obstacles: the wave still leaves them but never enters
+    one. Returns an int32 array of ``passable``'s shape holding
+    ``UNREACHABLE`` for cells the wave never reaches.
+    """
+    rows, cols = passable.shape
+    width = cols + 2
+    open_cells = np.zeros((rows + 2, width), dtype=bool)
+    open_cells[1:-1, 1:-1] = passable
+    open_cells = open_cells.reshape(-1)
+    distances = np.full(open_cells.size, UNREACHABLE, dtype=np.int32)
+
+    rows_of, cols_of = np.divmod(np.asarray(sources, dtype=np.int64), cols)
+    frontier = np.unique((rows_of + 1) * width + cols_of + 1)
+    open_cells[frontier] = False
+    distances[frontier] = 0
+
+    slot = np.empty(open_cells.size, dtype=np.int64)
+    is_open, dist = open_cells.data, distances.data
+    steps = (1, width, -1, -width)
+    level = 0
+    while len(frontier):
+        level += 1
+        if len(frontier) >= WAVEFRONT_VECTOR_MIN:
+            if isinstance(frontier, list):
+                frontier = np.array(frontier, dtype=np.int64)
+            candidates = np.concatenate([frontier + step for step in steps])
+            candidates = candidates[open_cells[candidates]]
+            # Drop duplicates without sorting: keep the last write per cell
+            order = np.arange(len(candidates))
+            slot[candidates] = order
+            candidates = candidates[slot[candidates] == order]
+            open_cells[candidates] = False
+            distances[candidates] = level
+            frontier = candidates
+        else:
+            if not isinstance(frontier, list):
+                frontier = frontier.tolist()
+            wave = []
+            for cell in frontier:
+                for step in steps:
+                    neighbor = cell + step
+                    if is_open[neighbor]:
+                        is_open[neighbor] = False
+                        dist[neighbor] = level
+                        wave.append(neighbor)
+            frontier = wave
+
+    return distances.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+
+class GridEngine:
+    """Grid stored as a flat array with precomputed passable-neighbour adjacency"""
+
+    def __init__(self, grid):
+        if isinstance(grid, PackedGrid):
+            self.rows, self.cols = grid.rows, grid.cols
+            cells = grid.cells()
+        else:
+            self.rows = len(grid)
+            self.cols = len(grid[0]) if len(grid) else 0
+            try:
+                cells = np.asarray(grid, dtype=np.int32)
+            except ValueError as e:
+                raise ValueError("Grid rows must all have the same length") from e
+        self.size = self.rows * self.cols
+        self.cells = cells.reshape(self.size)
+        if self.size and self.cells.min() < 0:
+            raise ValueError(
+                "Grid values must be 0 (free), 1 (obstacle) or a terrain cost >= 2"
+            )
+
+        self.passable = self.cells != OBSTACLE
+        self.costs = np.where(
+            self.passable, np.where(self.cells == FREE, 1, self.cells), 0
+        ).astype(np.int32)
+        self.max_cost = int(self.costs.max()) if self.size else 1
+        self.weighted = self.max_cost > 1
+        self.offsets, self.indices = self._build_adjacency()
+        self._jump_tables = None
+        self._bind_views()
+
+    def _bind_views(self):
+        # Zero-copy views used by the search loops; indexing a memoryview
+        # yields plain ints and is several times faster than indexing NumPy.
+        self._offsets = self.offsets.data
+        self._indices = self.indices.data
+        self._passable = self.passable.data
+        self._costs = self.costs.data
+
+    def __getstate__(self):
+        """Pickle the arrays only; memoryviews cannot be pickled"""
+        state = self.__dict__.copy()
+        for name in ("_offsets", "_indices", "_passable", "_costs"):
+            del state[name]
+        state["_jump_tables"] = None  # Rebuilt on first use
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_views()
+
+    def _neighbour_table(self):
+        """``(size, 4)`` passable neighbours in Right, Down, Left, Up order, or -1"""
+        rows, cols = self.rows, self.cols
+        ids = np.arange(self.size, dtype=np.int32).reshape(rows, cols)
+        passable = self.passable.reshape(rows, cols)
+        candidates = np.where(passable, ids, -1)
+
+        neighbours = np.full((rows, cols, len(DIRECTIONS)), -1, dtype=np.int32)
+        neighbours[:, :-1, 0] = candidates[:, 1:]  # Right
+        neighbours[:-1, :, 1] = candidates[1:, :]  # Down
+        neighbours[:, 1:, 2] = candidates[:, :-1]  # Left
+        neighbours[1:, :, 3] = candidates[:-1, :]  # Up
+        return neighbours.reshape(self.size, len(DIRECTIONS))
+
+    @cached_property
+    def total_cost(self):
+        """Sum of all terrain costs, an upper bound on any simple path's cost"""
+        return int(self.costs.sum(dtype=np.int64))
+
+    @cached_property
+    def neighbour_table(self):
+        """Dense neighbour table for vectorized walks; built on first use"""
+        return self._neighbour_table()
+
+    def _build_adjacency(self):
+        """Build the CSR offsets and indices of every cell's passable neighbours"""
+        neighbours = self._neighbour_table()
+        valid = neighbours >= 0
+        offsets = np.zeros(self.size + 1, dtype=np.int32)
+        np.cumsum(valid.sum(axis=1), out=offsets[1:])
+        # Boolean masking walks row-major, so each cell keeps the direction order
+        indices = np.ascontiguousarray(neighbours[valid], dtype=np.int32)
+        return offsets, indices
+
+    def horizontal_jump_tables(self):
+        """Forced-neighbour masks and next-event columns for Jump Point Search
+
+        For a horizontal move in direction ``dx`` a cell is *forced* when a
+        vertical neighbour is open but the cell diagonally behind it is not.
+        ``right_event[c]`` is the column of the first forced-or-blocked cell at
+        or after cell ``c`` moving right (``cols`` if the row ends first), and
+        ``left_event[c]`` the same moving left (``-1`` if the row ends first).
+        Built lazily with NumPy and cached for the lifetime of the engine.
+        """
+        if self._jump_tables is None:
+            rows, cols = self.rows, self.cols
+            passable = self.passable.reshape(rows, cols)
+            padded = np.zeros((rows + 2, cols + 2), dtype=bool)
+            padded[1:-1, 1:-1] = passable
+
+            above = padded[:-2, 1:-1]
+            below = padded[2:, 1:-1]
+            forced_right = passable & (
+                (above & ~padded[:-2, :-2]) | (below & ~padded[2:, :-2])
+            )
+            forced_left = passable & (
+                (above & ~padded[:-2, 2:]) | (below & ~padded[2:, 2:])
+            )
+
+            columns = np.arange(cols, dtype=np.int32)
+            events = np.where(forced_right | ~passable, columns, cols)
+            right_event = np.minimum.accumulate(events[:, ::-1], axis=1)[:, ::-1]
+            events = np.where(forced_left | ~passable, columns, -1)
+            left_event = np.maximum.accumulate(events, axis=1)
+
+            self._jump_tables = tuple(
+                np.ascontiguousarray(table.reshape(self.size)).data
+                for table in (
+                    forced_right,
+                    forced_left,
+                    right_event.astype(np.int32),
+                    left_event.astype(np.int32),
+                )
+            )
+        return self._jump_tables
+
+    @cached_property
+    def fingerprint(self):
+        """Stable hash of the grid's shape and contents, for per-grid caches"""
+        return grid_fingerprint(self.cells, self.rows, self.cols)
+
+    def distances_from(self, source, reverse=False):
+        """Exact path cost from ``source`` to every cell as an int32 array
+
+        With ``reverse=True`` the costs are *to* ``source`` instead; the two
+        only differ on weighted grids, where a move pays for the cell it
+        enters. Unreachable cells hold ``UNREACHABLE``.
+        """
+        if not self.weighted:
+            return self.wavefront_distances(source)
+
+        offsets, indices, costs = self._offsets, self._indices, self._costs
+        distances = np.full(self.size, UNREACHABLE, dtype=np.int64)
+        distances[source] = 0
+        dist = distances.data
+
+        open_set = [(0, source)]
+        while open_set:
+            distance, current = heappop(open_set)
+            if distance > dist[current]:
+                continue
+            for neighbor in indices[offsets[current] : offsets[current + 1]]:
+                new_distance = distance + (
+                    costs[current] if reverse else costs[neighbor]
+                )
+                if dist[neighbor] == UNREACHABLE or new_distance < dist[neighbor]:
+                    dist[neighbor] = new_distance
+                    heappush(open_set, (new_distance, neighbor))
+        return distances.astype(np.int32)
+
+    def wavefront_distances(self, sources):
+        """Unweighted BFS levels from one or more cells as a flat int32 array"""
+        passable = self.passable.reshape(self.rows, self.cols)
+        return wavefront_distances(passable, np.atleast_1d(sources)).reshape(-1)
+
+    def manhattan_distances(self, cell):
+        """Manhattan distance from ``cell`` to every cell as an int32 array"""
+        rows, cols = np.divmod(np.arange(self.size, dtype=np.int32), self.cols)
+        row, col = divmod(cell, self.cols)
+        return np.abs(rows - row) + np.abs(cols - col)
+
+    def contains(self, pos):
+        """Check whether a (row, col) position lies inside the grid"""
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def to_id(self, pos):
+        """Convert a (row, col) position to a flat cell id"""
+        return pos[0] * self.cols + pos[1]
+
+    def to_pos(self, cell):
+        """Convert a flat cell id to a [row, col] list as used in responses"""
+        return list(divmod(cell, self.cols))
+
+    def neighbors(self, cell):
+        """Passable neighbours of a cell, in Right, Down, Left, Up order"""
+        offsets = self._offsets
+        return self._indices[offsets[cell] : offsets[cell + 1]]
+
+    def path_cost(self, path):
+        """Total terrain cost of a path of cell ids (the start cell is free)"""
+        if len(path) < 2:
+            return 0
+        return int(self.costs[np.asarray(path[1:], dtype=np.int64)].sum())
+
+    def is_passable(self, cell):
+        """Check whether a cell is not an obstacle"""
+        return bool(self.passable[cell])
@@ -0,0 +1,248 @@
+"""
+Hierarchical pathfinding (HPA*): an abstract graph of cluster entrances.
+
+The grid is cut into square clusters. Wherever two neighbouring clusters
+share a run of open border cells, one entrance (two for long runs) links
+them; the cells on both sides of an entrance become abstract nodes. Nodes
+of the same cluster are joined by their exact shortest distance inside that
+cluster, so a query only searches this small graph and then refines the
+few cluster-sized segments of the path it returns.
+
+The abstract graph is built once per distinct grid and cached by the grid's
+fingerprint. Intra-cluster distances for every cluster are computed
+together: clusters are laid out side by side with a ring of obstacles
+around each, and one vectorized BFS wavefront per entrance slot runs in all
+of them at once.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from .caching import ByteBoundedLRU
+from .grid_engine import wavefront_distances
+from .search_state import NO_PARENT
+
+HPA_CLUSTER_SIZE = 16
+HPA_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Border runs at least this long get an entrance at each end, not one
+HPA_LONG_ENTRANCE = 6
+
+_abstract_graphs = ByteBoundedLRU(HPA_CACHE_MAX_BYTES)
+
+
+def _border_entrances(side_a, side_b, cluster_size):
+    """Positions along a border of the entrances between two rows/columns
+
+    ``side_a`` and ``side_b`` are the passable masks on either side of the
+    border. Runs where both are open are split at cluster corners.
+    """
+    both = side_a & side_b
+    positions = np.arange(len(both))
+    first = positions % cluster_size == 0
+    last = (positions % cluster_size == cluster_size - 1) | (positions == len(both) - 1)
+    previous = np.concatenate(([False], both[:-1]))
+    following = np.concatenate((both[1:], [False]))
+    starts = np.flatnonzero(both & (first | ~previous))
+    ends = np.flatnonzero(both & (last | ~following))
+
+    long_runs = ends - starts + 1 >= HPA_LONG_ENTRANCE
+    middles = (starts + ends) // 2
+    return np.concatenate(
+        (middles[~long_runs], starts[long_runs], ends[long_runs])
+    ).astype(np.int64)
+
+
+class AbstractGraph:
+    """Entrance nodes of a clustered grid with inter- and intra-cluster edges
+
+    Nodes are numbered ``0..len(node_cells) - 1`` in order of their cell id;
+    the edges leaving node ``n`` are ``targets[offsets[n]:offsets[n + 1]]``
+    with matching ``costs``.
+    """
+
+    def __init__(self, cluster_size, cols, node_cells, offsets, targets, costs):
+        self.cluster_size = cluster_size
+        self.cols = cols
+        self.cluster_cols = -(-cols // cluster_size)
+        self.node_cells = node_cells
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.node_ids = {cell: node for node, cell in enumerate(node_cells.tolist())}
+        node_rows, node_cols = np.divmod(node_cells, cols)
+        self.node_clusters = (node_rows // cluster_size) * self.cluster_cols + (
+            node_cols // cluster_size
+        )
+        self._offsets = offsets.data
+        self._targets = targets.data
+        self._costs = costs.data
+
+    @property
+    def nbytes(self):
+        arrays = (
+            self.node_cells,
+            self.node_clusters,
+            self.offsets,
+            self.targets,
+            self.costs,
+        )
+        # The id lookup dict costs roughly 100 bytes per node
+        return sum(array.nbytes for array in arrays) + 100 * len(self.node_ids)
+
+    @classmethod
+    def build(cls, engine, cluster_size=HPA_CLUSTER_SIZE):
+        """Find the entrances of ``engine``'s grid and connect them"""
+        rows, cols = engine.rows, engine.cols
+        passable = engine.passable.reshape(rows, cols)
+
+        # Entrance cells on both sides of every vertical and horizontal border
+        node_rows, node_cols = [], []
+        for col in range(cluster_size, cols, cluster_size):
+            at = _border_entrances(passable[:, col - 1], passable[:, col], cluster_size)
+            node_rows += [at, at]
+            node_cols += [np.full_like(at, col - 1), np.full_like(at, col)]
+        for row in range(cluster_size, rows, cluster_size):
+            at = _border_entrances(passable[row - 1], passable[row], cluster_size)
+            node_rows += [np.full_like(at, row - 1), np.full_like(at, row)]
+            node_cols += [at, at]
+        inter_cells = np.concatenate(
+            [np.empty(0, dtype=np.int64)]
+            + [row * cols + col for row, col in zip(node_rows, node_cols)]
+        )
+        if not len(inter_cells):
+            empty = np.empty(0, dtype=np.int32)
+            return cls(cluster_size, cols, empty, np.zeros(1, np.int32), empty, empty)
+
+        node_cells = np.unique(inter_cells)
+
+        # Each entrance is a pair of consecutive node blocks in the lists above
+        sources, targets, costs = [], [], []
+        blocks = np.cumsum([0] + [len(block) for block in node_rows])
+        for first, second, third in zip(blocks[0::2], blocks[1::2], blocks[2::2]):
+            side_a = np.searchsorted(node_cells, inter_cells[first:second])
+            side_b = np.searchsorted(node_cells, inter_cells[second:third])
+            sources += [side_a, side_b]
+            targets += [side_b, side_a]
+            costs += [np.ones(len(side_a), dtype=np.int64)] * 2
+
+        # Intra-cluster edges: one BFS wave per entrance slot, in all clusters
+        cluster_rows = -(-rows // cluster_size)
+        cluster_cols = -(-cols // cluster_size)
+        tile = cluster_size + 2
+        tiled = np.zeros((cluster_rows, tile, cluster_cols, tile), dtype=bool)
+        padded = np.zeros(
+            (cluster_rows * cluster_size, cluster_cols * cluster_size), dtype=bool
+        )
+        padded[:rows, :cols] = passable
+        tiled[:, 1:-1, :, 1:-1] = padded.reshape(
+            cluster_rows, cluster_size, cluster_cols, cluster_size
+        )
+        tiled = tiled.reshape(cluster_rows * tile, cluster_cols * tile)
+
+        node_rows, node_cols = np.divmod(node_cells, cols)
+        clusters = (node_rows // cluster_size) * cluster_cols + (
+            node_cols // cluster_size
+        )
+        tiled_cells = (
+            (node_rows // cluster_size) * tile + node_rows % cluster_size + 1
+        ) * tiled.shape[1] + (node_cols // cluster_size) * tile
+        tiled_cells += node_cols % cluster_size + 1
+
+        order = np.argsort(clusters, kind="stable")
+        cluster_starts = np.searchsorted(clusters[order], clusters[order], "left")
+        slots = np.empty(len(node_cells), dtype=np.int64)
+        slots[order] = np.arange(len(node_cells)) - cluster_starts
+
+        source_of_cluster = np.empty(cluster_rows * cluster_cols, dtype=np.int64)
+        for slot in range(int(slots.max()) + 1):
+            wave_sources = np.flatnonzero(slots == slot)
+            distances = wavefront_distances(tiled, tiled_cells[wave_sources])
+            distances = distances.reshape(-1)[tiled_cells]
+
+            source_of_cluster.fill(-1)
+            source_of_cluster[clusters[wave_sources]] = wave_sources
+            source = source_of_cluster[clusters]
+            linked = (source >= 0) & (distances > 0)
+            sources.append(source[linked])
+            targets.append(np.flatnonzero(linked))
+            costs.append(distances[linked].astype(np.int64))
+
+        sources = np.concatenate(sources)
+        targets = np.concatenate(targets)
+        costs = np.concatenate(costs)
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(len(node_cells) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources, minlength=len(node_cells)), out=offsets[1:])
+        return cls(
+            cluster_size,
+            cols,
+            node_cells.astype(np.int32),
+            offsets,
+            targets[order].astype(np.int32),
+            costs[order].astype(np.int32),
+        )
+
+    def cluster_of(self, cell):
+        row, col = divmod(cell, self.cols)
+        size = self.cluster_size
+        return (row // size) * self.cluster_cols + col // size
+
+    def cluster_nodes(self, cluster):
+        """Abstract nodes lying in a cluster"""
+        return np.flatnonzero(self.node_clusters == cluster).tolist()
+
+    def edges(self, node):
+        """(target node, cost) pairs leaving an abstract node"""
+        start, end = self._offsets[node], self._offsets[node + 1]
+        return zip(self._targets[start:end], self._costs[start:end])
+
+
+def cluster_search(engine, graph, source, targets=()):
+    """BFS from ``source`` that never leaves its cluster
+
+    Stops early once every cell in ``targets`` is reached (or runs to
+    exhaustion when ``targets`` is empty). Returns ``(parents, distances)``
+    dicts over the cells reached; the source's parent is ``NO_PARENT``. A
+    cluster is small, so dicts beat grid-sized arrays here.
+    """
+    offsets, indices = engine._offsets, engine._indices
+    size, cols = graph.cluster_size, engine.cols
+    row, col = divmod(source, cols)
+    top, left = row - row % size, col - col % size
+    bottom, right = top + size, left + size
+
+    parents = {source: NO_PARENT}
+    distances = {source: 0}
+    pending = set(targets)
+    pending.discard(source)
+    if targets and not pending:
+        return parents, distances
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        new_distance = distances[current] + 1
+        for neighbor in indices[offsets[current] : offsets[current + 1]]:
+            if neighbor in parents:
+                continue
+            row, col = divmod(neighbor, cols)
+            if top <= row < bottom and left <= col < right:
+                parents[neighbor] = current
+                distances[neighbor] = new_distance
+                queue.append(neighbor)
+                pending.discard(neighbor)
+                if targets and not pending:
+                    return parents, distances
+    return parents, distances
+
+
+def abstract_graph(engine, cluster_size=HPA_CLUSTER_SIZE):
+    """The cached abstract graph for ``engine``'s grid and whether it was cached"""
+    key = (engine.fingerprint, cluster_size)
+    graph = _abstract_graphs.get(key)
+    if graph is not None:
+        return graph, True
+    graph = AbstractGraph.build(engine, cluster_size)
+    _abstract_graphs.put(key, graph, graph.nbytes)
+    return graph, False
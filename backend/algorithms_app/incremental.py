@@ -0,0 +1,221 @@
+"""
+Incremental replanning with Lifelong Planning A* (LPA*).
+
+A planner keeps its g-values, right-hand-side values (one-step lookahead
+costs) and open list between calls. When cells change, only those cells are
+re-evaluated and the search repairs the part of the tree whose costs
+actually changed, so toggling a few obstacles on a large grid costs a
+fraction of a fresh search.
+
+Planners live in a byte-bounded in-process store keyed by a session id.
+Sessions are local to the worker process that created them.
+"""
+
+import threading
+import uuid
+from array import array
+
+import numpy as np
+
+from .caching import ByteBoundedLRU
+from .grid_engine import OBSTACLE, GridEngine
+from .priority_queues import IndexedHeap
+from .step_trace import StepTrace, encode_trace
+
+INCREMENTAL_SESSIONS_MAX_BYTES = 512 * 1024 * 1024
+
+# Rough per-cell footprint of a planner: g, rhs and cost lists plus the grid
+PLANNER_CELL_BYTES = 40
+
+INFINITY = float("inf")
+
+_sessions = ByteBoundedLRU(INCREMENTAL_SESSIONS_MAX_BYTES)
+
+
+class LPAStarPlanner:
+    """Lifelong Planning A* between a fixed start and goal on an editable grid
+
+    Moves follow the same rules as :class:`AlgorithmRunner`: four
+    directions, entering a cell costs its terrain value and obstacles can be
+    left (a start on one) but never entered.
+
+    Internally the grid is padded with a ring of obstacles, so the four
+    neighbours of padded cell ``c`` are always ``c ± 1`` and ``c ± width``.
+    """
+
+    def __init__(self, grid, start, goal, trace_format="steps"):
+        engine = GridEngine(grid)
+        for name, pos in (("start", start), ("goal", goal)):
+            if not engine.contains(pos):
+                raise ValueError(
+                    f"{name.capitalize()} position {list(pos)} is outside the grid"
+                )
+        self.rows, self.cols = engine.rows, engine.cols
+        self.width = self.cols + 2
+        self.size = (self.rows + 2) * self.width
+
+        costs = np.full((self.rows + 2, self.width), -1, dtype=np.int64)
+        costs[1:-1, 1:-1] = np.where(engine.passable, engine.costs, -1).reshape(
+            self.rows, self.cols
+        )
+        self.cells = engine.cells.tolist()
+        self.costs = [INFINITY if cost < 0 else cost for cost in costs.ravel().tolist()]
+        self.start = self.padded(engine.to_id(start))
+        self.goal = self.padded(engine.to_id(goal))
+        self.goal_row, self.goal_col = divmod(self.goal, self.width)
+        self.trace_format = trace_format
+        self.lock = threading.Lock()
+
+        self.g = [INFINITY] * self.size
+        self.rhs = [INFINITY] * self.size
+        self.rhs[self.start] = 0
+        self.open_set = IndexedHeap()
+        self.open_set.push(self.key(self.start), self.start)
+        self.replans = 0
+        # Steps recorded since the last plan, returned with its result
+        self.steps = StepTrace()
+
+    @property
+    def nbytes(self):
+        return PLANNER_CELL_BYTES * self.size + 100 * len(self.open_set)
+
+    def padded(self, cell):
+        """Padded id of an unpadded flat cell id"""
+        row, col = divmod(cell, self.cols)
+        return (row + 1) * self.width + col + 1
+
+    def unpadded(self, cell):
+        """``[row, col]`` of a padded id"""
+        row, col = divmod(cell, self.width)
+        return [row - 1, col - 1]
+
+    def key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        row, col = divmod(cell, self.width)
+        return (best + abs(row - self.goal_row) + abs(col - self.goal_col), best)
+
+    def update_vertex(self, cell, steps):
+        """Recompute a cell's lookahead cost and (re)queue it if inconsistent"""
+        g, rhs = self.g, self.rhs
+        if cell != self.start:
+            cost = self.costs[cell]
+            if cost == INFINITY:
+                rhs[cell] = INFINITY
+            else:
+                width = self.width
+                rhs[cell] = cost + min(
+                    g[cell + 1], g[cell + width], g[cell - 1], g[cell - width]
+                )
+        if g[cell] != rhs[cell]:
+            self.open_set.push(self.key(cell), cell)
+            steps.explore(cell)
+        elif cell in self.open_set:
+            self.open_set.remove(cell)
+
+    def compute_shortest_path(self, steps):
+        """Expand inconsistent cells until the goal's cost is settled"""
+        g, rhs, goal, open_set = self.g, self.rhs, self.goal, self.open_set
+        update_vertex, width = self.update_vertex, self.width
+        while open_set and (
+            open_set.peek_priority() < self.key(goal) or rhs[goal] != g[goal]
+        ):
+            _, cell = open_set.pop()
+            steps.visit(cell)
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = INFINITY
+                update_vertex(cell, steps)
+            for neighbor in (cell + 1, cell + width, cell - 1, cell - width):
+                update_vertex(neighbor, steps)
+
+    def apply_changes(self, changes):
+        """Set new grid values for ``(row, col, value)`` triples
+
+        Returns how many cells actually changed. Only the changed cells are
+        re-evaluated; the next :meth:`plan` repairs whatever they affect and
+        returns these re-evaluations in its trace too.
+        """
+        updates = {}
+        for row, col, value in changes:
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                raise ValueError(f"Changed cell {[row, col]} is outside the grid")
+            if value < 0:
+                raise ValueError(
+                    "Grid values must be 0 (free), 1 (obstacle) or a terrain cost >= 2"
+                )
+            updates[row * self.cols + col] = value  # The last edit of a cell wins
+
+        steps = self.steps
+        changed = 0
+        for cell, value in updates.items():
+            if self.cells[cell] == value:
+                continue
+            self.cells[cell] = value
+            changed += 1
+            padded = self.padded(cell)
+            self.costs[padded] = INFINITY if value == OBSTACLE else max(value, 1)
+            self.update_vertex(padded, steps)
+        return changed
+
+    def extract_path(self):
+        """Walk back from the goal along cells whose costs explain its g-value"""
+        g, width = self.g, self.width
+        path = [self.goal]
+        current = self.goal
+        while current != self.start:
+            current = min(
+                (current + 1, current + width, current - 1, current - width),
+                key=g.__getitem__,
+            )
+            path.append(current)
+        path.reverse()
+        return path
+
+    def plan(self):
+        """Bring the search up to date and return a run_algorithm-shaped result"""
+        steps, self.steps = self.steps, StepTrace()
+        self.compute_shortest_path(steps)
+        self.replans += 1
+
+        # Traces are recorded in padded ids; re-key them to the real grid
+        padded_cells = np.frombuffer(steps.cells, dtype=np.int32)
+        rows, cols = np.divmod(padded_cells, self.width)
+        steps.cells = array("i", ((rows - 1) * self.cols + cols - 1).tobytes())
+
+        cost = self.g[self.goal]
+        path_found = cost != INFINITY
+        result = {
+            "path_found": path_found,
+            "path": (
+                [self.unpadded(cell) for cell in self.extract_path()]
+                if path_found
+                else None
+            ),
+        }
+        result.update(encode_trace(steps, self.cols, self.trace_format))
+        result["nodes_explored"] = len(steps)
+        result["path_cost"] = int(cost) if path_found else 0
+        result["replans"] = self.replans
+        return result
+
+
+def create_session(planner):
+    """Store a planner and return its new session id"""
+    session_id = uuid.uuid4().hex
+    _sessions.put(session_id, planner, planner.nbytes)
+    return session_id
+
+
+def update_session(session_id, planner):
+    """Re-store a planner after a replan, so the store counts its current size"""
+    _sessions.put(session_id, planner, planner.nbytes)
+
+
+def get_session(session_id):
+    """The planner for a session id, or None if it expired or never existed"""
+    return _sessions.get(session_id)
+
+
+def drop_session(session_id):
+    _sessions.discard(session_id)
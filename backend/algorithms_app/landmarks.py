@@ -0,0 +1,110 @@
+"""
+Landmark (ALT) heuristic: A* lower bounds from precomputed landmark distances.
+
+For a landmark ``L`` the triangle inequality gives two lower bounds on the
+cost of reaching ``t`` from ``v``::
+
+    d(v, t) >= d(L, t) - d(L, v)
+    d(v, t) >= d(v, L) - d(t, L)
+
+Distance tables from and to a handful of landmarks are computed once per
+distinct grid and cached by the grid's fingerprint, so many start/goal queries
+on the same maze share the precomputation.
+"""
+
+import numpy as np
+
+from .caching import ByteBoundedLRU
+from .grid_engine import UNREACHABLE
+
+ALT_LANDMARK_COUNT = 8
+ALT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_landmark_tables = ByteBoundedLRU(ALT_CACHE_MAX_BYTES)
+
+
+class LandmarkTable:
+    """Exact distance tables from and to a set of landmark cells"""
+
+    def __init__(self, landmarks, from_landmarks, to_landmarks):
+        self.landmarks = landmarks
+        self.from_landmarks = from_landmarks  # (k, cells): d(L, v)
+        self.to_landmarks = to_landmarks  # (k, cells): d(v, L)
+
+    @property
+    def nbytes(self):
+        if self.to_landmarks is self.from_landmarks:
+            return self.from_landmarks.nbytes
+        return self.from_landmarks.nbytes + self.to_landmarks.nbytes
+
+    @classmethod
+    def build(cls, engine, count=ALT_LANDMARK_COUNT):
+        """Pick landmarks by farthest-point selection and compute their tables
+
+        The first landmark is the open cell farthest (Manhattan) from the grid
+        centre; each next one is the reachable cell farthest from all
+        landmarks chosen so far.
+        """
+        passable = engine.passable
+        if not passable.any():
+            empty = np.empty((0, engine.size), dtype=np.int32)
+            return cls([], empty, empty)
+
+        rows, cols = np.divmod(np.arange(engine.size), engine.cols)
+        spread = np.abs(rows - engine.rows // 2) + np.abs(cols - engine.cols // 2)
+        landmark = int(np.argmax(np.where(passable, spread, -1)))
+
+        landmarks, tables = [], []
+        nearest = None
+        for _ in range(min(count, int(passable.sum()))):
+            landmarks.append(landmark)
+            distances = engine.distances_from(landmark)
+            tables.append(distances)
+
+            # Cells outside the landmarks' component stay UNREACHABLE
+            nearest = distances if nearest is None else np.minimum(nearest, distances)
+            landmark = int(np.argmax(nearest))
+            if nearest[landmark] <= 0:
+                break
+
+        from_landmarks = np.stack(tables)
+        if engine.weighted:
+            to_landmarks = np.stack(
+                [engine.distances_from(cell, reverse=True) for cell in landmarks]
+            )
+        else:
+            to_landmarks = from_landmarks
+        return cls(landmarks, from_landmarks, to_landmarks)
+
+    def lower_bounds(self, cell, towards=True):
+        """Per-cell lower bounds on d(v, cell), or on d(cell, v) if not ``towards``
+
+        Bounds through a landmark that cannot reach (or be reached from) the
+        cells involved are skipped, so every bound is at least 0.
+        """
+        best = np.zeros(self.from_landmarks.shape[1], dtype=np.int32)
+        for from_l, to_l in zip(self.from_landmarks, self.to_landmarks):
+            from_ok = from_l != UNREACHABLE
+            to_ok = to_l != UNREACHABLE
+            if towards:
+                bounds = (
+                    (from_l[cell] - from_l, from_ok & from_ok[cell]),
+                    (to_l - to_l[cell], to_ok & to_ok[cell]),
+                )
+            else:
+                bounds = (
+                    (from_l - from_l[cell], from_ok & from_ok[cell]),
+                    (to_l[cell] - to_l, to_ok & to_ok[cell]),
+                )
+            for bound, valid in bounds:
+                np.maximum(best, np.where(valid, bound, 0), out=best)
+        return best
+
+
+def landmark_table(engine):
+    """The cached landmark table for ``engine``'s grid, built on first use"""
+    table = _landmark_tables.get(engine.fingerprint)
+    if table is None:
+        table = LandmarkTable.build(engine)
+        _landmark_tables.put(engine.fingerprint, table, table.nbytes)
+    return table
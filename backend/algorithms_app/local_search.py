@@ -0,0 +1,132 @@
+"""
+Multi-restart local search: many seeded hill-climbing or simulated-annealing
+trajectories advanced together as NumPy arrays.
+
+Every restart starts at the start cell and follows its own random draws.
+One step moves every still-active trajectory at once. A trajectory stops
+when it reaches the goal, gets stuck or runs out of schedule. The moves are
+kept as a ``(steps, restarts)`` history, so any trajectory's path can be
+read back afterwards.
+"""
+
+import numpy as np
+
+HILL_CLIMBING_MAX_ITERATIONS = 1000
+
+SA_INITIAL_TEMPERATURE = 100.0
+SA_COOLING_RATE = 0.95
+SA_MIN_TEMPERATURE = 0.01
+
+
+class TrajectoryBatch:
+    """Positions and move history of ``restarts`` simultaneous walks"""
+
+    def __init__(self, neighbours, heuristic, start, goal, restarts, seed):
+        self.neighbours = neighbours
+        self.heuristic = heuristic
+        self.start = start
+        self.goal = goal
+        self.rng = np.random.default_rng(seed)
+        self.position = np.full(restarts, start, dtype=np.int64)
+        self.active = self.position != goal
+        self.history = []
+        self._moves = None
+
+    def random_neighbours(self, allowed):
+        """One uniformly chosen allowed neighbour per trajectory (-1 if none)"""
+        weights = self.rng.random(allowed.shape) * allowed
+        choice = weights.argmax(axis=1)
+        chosen = self.neighbours[self.position, choice]
+        return np.where(allowed.any(axis=1), chosen, -1)
+
+    def move(self, moving, target):
+        """Advance the trajectories in ``moving`` to ``target``"""
+        self.position = np.where(moving, target, self.position)
+        self.history.append(np.where(moving, self.position, -1))
+        self.active &= self.position != self.goal
+
+    @property
+    def moves(self):
+        """``(steps, restarts)`` array of cells moved to, -1 where a walk stood still"""
+        if self._moves is None:
+            self._moves = (
+                np.stack(self.history)
+                if self.history
+                else np.empty((0, len(self.position)), dtype=np.int64)
+            )
+        return self._moves
+
+    def path(self, restart):
+        """Cells visited by one trajectory, starting at the start cell"""
+        moves = self.moves[:, restart]
+        return [self.start] + moves[moves >= 0].tolist()
+
+    def stats(self, path_cost):
+        """Per-restart summary and the index of the best restart
+
+        Restarts that reached the goal rank by path cost, the rest by how
+        close (by heuristic) they ended up.
+        """
+        reached = self.position == self.goal
+        moves = (self.moves >= 0).sum(axis=0)
+        stats = []
+        for restart in range(len(reached)):
+            stats.append(
+                {
+                    "restart": restart,
+                    "reached_goal": bool(reached[restart]),
+                    "moves": int(moves[restart]),
+                    "final_heuristic": float(self.heuristic[self.position[restart]]),
+                    "path_cost": (
+                        path_cost(self.path(restart)) if reached[restart] else None
+                    ),
+                }
+            )
+        best = min(
+            stats,
+            key=lambda stat: (
+                not stat["reached_goal"],
+                (
+                    stat["path_cost"]
+                    if stat["reached_goal"]
+                    else stat["final_heuristic"]
+                ),
+            ),
+        )
+        return stats, best["restart"]
+
+
+def hill_climbing_batch(neighbours, heuristic, start, goal, restarts, seed=None):
+    """Stochastic hill climbing: each step takes a random strictly better neighbour"""
+    batch = TrajectoryBatch(neighbours, heuristic, start, goal, restarts, seed)
+    valid = neighbours >= 0
+    for _ in range(HILL_CLIMBING_MAX_ITERATIONS):
+        if not batch.active.any():
+            break
+        candidates = neighbours[batch.position]
+        improving = valid[batch.position] & (
+            heuristic[candidates] < heuristic[batch.position][:, None]
+        )
+        target = batch.random_neighbours(improving)
+        moving = batch.active & (target >= 0)
+        # A trajectory with no better neighbour is at a local optimum
+        batch.active &= moving
+        batch.move(moving, target)
+    return batch
+
+
+def simulated_annealing_batch(neighbours, heuristic, start, goal, restarts, seed=None):
+    """Simulated annealing with the classic geometric cooling schedule"""
+    batch = TrajectoryBatch(neighbours, heuristic, start, goal, restarts, seed)
+    valid = neighbours >= 0
+    temperature = SA_INITIAL_TEMPERATURE
+    while temperature > SA_MIN_TEMPERATURE and batch.active.any():
+        target = batch.random_neighbours(valid[batch.position])
+        batch.active &= target >= 0
+        delta = heuristic[target] - heuristic[batch.position]
+        accept = (delta < 0) | (
+            batch.rng.random(len(delta)) < np.exp(-np.maximum(delta, 0) / temperature)
+        )
+        batch.move(batch.active & accept, target)
+        temperature *= SA_COOLING_RATE
+    return batch
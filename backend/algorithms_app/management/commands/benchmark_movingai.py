@@ -0,0 +1,172 @@
+"""
+Run a Moving AI ``.scen`` file through AlgorithmRunner and report per bucket.
+
+Example::
+
+    python manage.py benchmark_movingai maps/arena.map.scen -a astar jps bfs
+
+For each algorithm and scenario bucket it reports the queries solved, mean
+nodes explored, latency percentiles and the mean and worst ratio of path
+cost to the reference cost. By default the reference is the scenario's own
+optimal length. That length allows diagonal moves, so even optimal
+4-connected searches score above 1. ``--reference grid`` compares against the
+exact 4-connected optimum instead.
+"""
+
+import json
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from algorithms_app.algorithms import AlgorithmRunner
+from algorithms_app.grid_engine import UNREACHABLE, GridEngine
+from algorithms_app.movingai import load_map, load_scenarios, resolve_map_path
+from algorithms_app.serializers import PATHFINDING_ALGORITHMS
+
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+def summarize(runs):
+    """Aggregate the runs of one algorithm on one bucket"""
+    solved = [run for run in runs if run["path_found"]]
+    latencies = np.array([run["ms"] for run in runs])
+    ratios = [run["ratio"] for run in solved if run["ratio"] is not None]
+    summary = {
+        "queries": len(runs),
+        "solved": len(solved),
+        "mean_nodes": round(float(np.mean([run["nodes"] for run in runs])), 1),
+    }
+    for percentile in LATENCY_PERCENTILES:
+        summary[f"p{percentile}_ms"] = round(
+            float(np.percentile(latencies, percentile)), 3
+        )
+    summary["mean_ratio"] = round(float(np.mean(ratios)), 4) if ratios else None
+    summary["max_ratio"] = round(max(ratios), 4) if ratios else None
+    return summary
+
+
+class Command(BaseCommand):
+    help = "Benchmark pathfinding algorithms on a Moving AI scenario file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenario", help="Path to a .scen file")
+        parser.add_argument(
+            "-a",
+            "--algorithms",
+            nargs="+",
+            default=["astar"],
+            choices=PATHFINDING_ALGORITHMS,
+        )
+        parser.add_argument(
+            "--map", help="Map file to use instead of the one the scenarios name"
+        )
+        parser.add_argument("--limit", type=int, help="Only run the first N scenarios")
+        parser.add_argument(
+            "--reference",
+            choices=["scenario", "grid"],
+            default="scenario",
+            help="Cost that optimality ratios are measured against",
+        )
+        parser.add_argument("--time-budget-ms", type=int)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--json", help="Also write the full report here")
+
+    def handle(self, *args, **options):
+        try:
+            scenarios = load_scenarios(options["scenario"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        if options["limit"] is not None:
+            scenarios = scenarios[: options["limit"]]
+        if not scenarios:
+            raise CommandError("The scenario file has no queries")
+
+        runner_options = {}
+        if options["time_budget_ms"] is not None:
+            runner_options["time_budget_ms"] = options["time_budget_ms"]
+
+        engines = {}  # One engine per map the scenarios name
+        runs = {algorithm: {} for algorithm in options["algorithms"]}
+        for scenario in scenarios:
+            engine = engines.get(scenario.map_name)
+            if engine is None:
+                try:
+                    map_path = options["map"] or resolve_map_path(
+                        options["scenario"], scenario.map_name
+                    )
+                    engine = GridEngine(load_map(map_path))
+                except (OSError, ValueError) as e:
+                    raise CommandError(str(e))
+                engines[scenario.map_name] = engine
+            if not (engine.contains(scenario.start) and engine.contains(scenario.goal)):
+                raise CommandError(
+                    f"Scenario {list(scenario.start)} -> {list(scenario.goal)} "
+                    f"lies outside its {engine.rows}x{engine.cols} map"
+                )
+
+            reference = scenario.optimal_length
+            if options["reference"] == "grid":
+                distances = engine.distances_from(engine.to_id(scenario.start))
+                distance = int(distances[engine.to_id(scenario.goal)])
+                reference = None if distance == UNREACHABLE else distance
+
+            for algorithm in options["algorithms"]:
+                started = time.perf_counter()
+                result = AlgorithmRunner(
+                    algorithm,
+                    engine,
+                    scenario.start,
+                    scenario.goal,
+                    trace_format="compact_base64",
+                    seed=options["seed"],
+                    options=runner_options,
+                ).execute()
+                elapsed = (time.perf_counter() - started) * 1000
+                ratio = None
+                if result["path_found"] and reference:
+                    ratio = result["path_cost"] / reference
+                runs[algorithm].setdefault(scenario.bucket, []).append(
+                    {
+                        "path_found": result["path_found"],
+                        "nodes": result["nodes_explored"],
+                        "ms": elapsed,
+                        "ratio": ratio,
+                    }
+                )
+
+        report = {}
+        for algorithm, buckets in runs.items():
+            report[algorithm] = {
+                bucket: summarize(bucket_runs)
+                for bucket, bucket_runs in sorted(buckets.items())
+            }
+            report[algorithm]["all"] = summarize(
+                [run for bucket_runs in buckets.values() for run in bucket_runs]
+            )
+
+        columns = ["queries", "solved", "mean_nodes"]
+        columns += [f"p{percentile}_ms" for percentile in LATENCY_PERCENTILES]
+        columns += ["mean_ratio", "max_ratio"]
+        self.stdout.write("\t".join(["algorithm", "bucket"] + columns))
+        for algorithm, buckets in report.items():
+            for bucket, summary in buckets.items():
+                values = [summary[column] for column in columns]
+                self.stdout.write(
+                    "\t".join(
+                        [algorithm, str(bucket)]
+                        + ["-" if value is None else str(value) for value in values]
+                    )
+                )
+
+        if options["json"]:
+            with open(options["json"], "w") as output:
+                json.dump(
+                    {
+                        "scenario": options["scenario"],
+                        "reference": options["reference"],
+                        "results": report,
+                    },
+                    output,
+                    indent=2,
+                )
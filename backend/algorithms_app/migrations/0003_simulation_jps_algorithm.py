@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "algorithms_app",
+            "0002_simulation_board_size_simulation_final_state_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="simulation",
+            name="algorithm",
+            field=models.CharField(
+                choices=[
+                    ("astar", "A* Search"),
+                    ("jps", "Jump Point Search"),
+                    ("bfs", "Breadth-First Search"),
+                    ("dfs", "Depth-First Search"),
+                    ("dijkstra", "Dijkstra"),
+                    ("hill_climbing", "Hill Climbing"),
+                    ("simulated_annealing", "Simulated Annealing"),
+                    ("genetic", "Genetic Algorithm"),
+                    ("8-puzzle-astar", "8-Puzzle A*"),
+                    ("8-puzzle-bfs", "8-Puzzle BFS"),
+                    ("n-queens", "N-Queens"),
+                    ("sudoku", "Sudoku"),
+                    ("tic-tac-toe-minimax", "Tic-Tac-Toe Minimax"),
+                    ("tic-tac-toe-alphabeta", "Tic-Tac-Toe Alpha-Beta"),
+                    ("tower-of-hanoi", "Tower of Hanoi"),
+                    ("connect4", "Connect 4"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
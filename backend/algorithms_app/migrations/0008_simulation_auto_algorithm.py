@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("algorithms_app", "0007_simulation_ida_star_fringe_algorithms"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="simulation",
+            name="algorithm",
+            field=models.CharField(
+                choices=[
+                    ("astar", "A* Search"),
+                    ("ara_star", "Anytime Repairing A* (ARA*)"),
+                    ("ida_star", "Iterative Deepening A* (IDA*)"),
+                    ("fringe", "Fringe Search"),
+                    ("jps", "Jump Point Search"),
+                    ("hpa", "Hierarchical A* (HPA*)"),
+                    ("bfs", "Breadth-First Search"),
+                    ("bidirectional_bfs", "Bidirectional BFS"),
+                    ("bidirectional_astar", "Bidirectional A*"),
+                    ("dfs", "Depth-First Search"),
+                    ("dijkstra", "Dijkstra"),
+                    ("hill_climbing", "Hill Climbing"),
+                    ("simulated_annealing", "Simulated Annealing"),
+                    ("genetic", "Genetic Algorithm"),
+                    ("auto", "Automatic (cost model)"),
+                    ("8-puzzle-astar", "8-Puzzle A*"),
+                    ("8-puzzle-bfs", "8-Puzzle BFS"),
+                    ("n-queens", "N-Queens"),
+                    ("sudoku", "Sudoku"),
+                    ("tic-tac-toe-minimax", "Tic-Tac-Toe Minimax"),
+                    ("tic-tac-toe-alphabeta", "Tic-Tac-Toe Alpha-Beta"),
+                    ("tower-of-hanoi", "Tower of Hanoi"),
+                    ("connect4", "Connect 4"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
@@ -7,12 +7,20 @@ class Simulation(models.Model):
 
     ALGORITHM_CHOICES = [
         ("astar", "A* Search"),
+        ("ara_star", "Anytime Repairing A* (ARA*)"),
+        ("ida_star", "Iterative Deepening A* (IDA*)"),
+        ("fringe", "Fringe Search"),
+        ("jps", "Jump Point Search"),
+        ("hpa", "Hierarchical A* (HPA*)"),
         ("bfs", "Breadth-First Search"),
+        ("bidirectional_bfs", "Bidirectional BFS"),
+        ("bidirectional_astar", "Bidirectional A*"),
         ("dfs", "Depth-First Search"),
         ("dijkstra", "Dijkstra"),
         ("hill_climbing", "Hill Climbing"),
         ("simulated_annealing", "Simulated Annealing"),
         ("genetic", "Genetic Algorithm"),
+        ("auto", "Automatic (cost model)"),
         # Puzzle algorithms
         ("8-puzzle-astar", "8-Puzzle A*"),
         ("8-puzzle-bfs", "8-Puzzle BFS"),
@@ -48,7 +56,8 @@ class Simulation(models.Model):
     algorithm = models.CharField(max_length=50, choices=ALGORITHM_CHOICES)
 
     # Pathfinding specific fields
-    grid_data = models.JSONField(null=True, blank=True)  # Store grid configuration
+    # Grid configuration: nested lists or a compact grid (see grid_codec)
+    grid_data = models.JSONField(null=True, blank=True)
     start_position = models.JSONField(null=True, blank=True)  # [x, y]
     goal_position = models.JSONField(null=True, blank=True)  # [x, y]
     heuristic = models.CharField(
@@ -0,0 +1,127 @@
+"""
+Loader for the Moving AI Lab pathfinding benchmark formats.
+
+A ``.map`` file is a short header followed by one text row per grid row::
+
+    type octile
+    height 512
+    width 512
+    map
+    @@@@....TT..
+
+``.`` and ``G`` are open ground and ``S`` swamp, which this 4-connected
+grid treats as open too. ``@``/``O`` (out of bounds), ``T`` (trees) and ``W``
+(water) are obstacles. Rows are read one at a time straight into a bit-packed
+:class:`~.grid_codec.PackedGrid`, so a large map never exists as nested
+lists.
+
+A ``.scen`` file lists one query per line after a ``version`` line, with
+tab-separated fields: bucket, map file, map width and height, start x and
+y, goal x and y, and the optimal path length. Coordinates are
+``(x, y) = (column, row)``. The reference lengths are for 8-connected
+movement with diagonals costing sqrt(2), so they can be shorter than the
+best 4-connected path.
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from .grid_codec import MAX_PACKED_CELLS, PackedGrid
+
+# Map characters that are open ground for a 4-connected searcher
+MOVINGAI_OPEN = b".GS"
+
+
+@dataclass
+class Scenario:
+    """One query of a ``.scen`` file, with positions as (row, col)"""
+
+    bucket: int
+    map_name: str
+    start: tuple
+    goal: tuple
+    optimal_length: float
+
+
+def load_map(path):
+    """Read a ``.map`` file into a :class:`PackedGrid`; ValueError if malformed"""
+    open_codes = np.frombuffer(MOVINGAI_OPEN, dtype=np.uint8)
+    with open(path, "rb") as lines:
+        header = {}
+        for line in lines:
+            line = line.strip()
+            if line == b"map":
+                break
+            key, _, value = line.partition(b" ")
+            header[key.decode("ascii", "replace")] = value.strip()
+        try:
+            rows, cols = int(header["height"]), int(header["width"])
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"{path}: map header needs height and width") from e
+        if rows < 1 or cols < 1 or rows * cols > MAX_PACKED_CELLS:
+            raise ValueError(f"{path}: unsupported map size {rows}x{cols}")
+
+        # Pack eight rows' worth of cells at a time; bits run on across rows
+        bits = np.zeros(-(-rows * cols // 8), dtype=np.uint8)
+        block_rows = max(1, 4096 // cols) * 8
+        block = np.empty((block_rows, cols), dtype=bool)
+        row = 0
+        for line in lines:
+            line = line.rstrip(b"\r\n")
+            if not line and row == rows:
+                continue
+            if len(line) != cols or row == rows:
+                raise ValueError(f"{path}: row {row} does not match width {cols}")
+            cells = np.frombuffer(line, dtype=np.uint8)
+            block[row % block_rows] = ~np.isin(cells, open_codes)
+            row += 1
+            if row % block_rows == 0 or row == rows:
+                filled = (row - 1) % block_rows + 1
+                first = (row - filled) * cols // 8
+                packed = np.packbits(block[:filled].reshape(-1))
+                bits[first : first + len(packed)] = packed
+        if row != rows:
+            raise ValueError(f"{path}: expected {rows} rows, found {row}")
+    return PackedGrid(rows, cols, bits)
+
+
+def load_scenarios(path):
+    """Read the queries of a ``.scen`` file; ValueError if malformed"""
+    scenarios = []
+    with open(path) as lines:
+        for number, line in enumerate(lines, 1):
+            fields = line.split("\t") if "\t" in line else line.split()
+            if not fields or fields[0] == "version":
+                continue
+            try:
+                bucket, map_name = int(fields[0]), fields[1]
+                start_x, start_y, goal_x, goal_y = map(int, fields[4:8])
+                optimal_length = float(fields[8])
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"{path}:{number}: malformed scenario line") from e
+            scenarios.append(
+                Scenario(
+                    bucket,
+                    map_name,
+                    (start_y, start_x),
+                    (goal_y, goal_x),
+                    optimal_length,
+                )
+            )
+    return scenarios
+
+
+def resolve_map_path(scenario_path, map_name):
+    """Find a scenario's map: as written, next to the ``.scen`` file, or by name"""
+    directory = os.path.dirname(scenario_path)
+    candidates = (
+        map_name,
+        os.path.join(directory, map_name),
+        os.path.join(directory, os.path.basename(map_name)),
+    )
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError(f"Map {map_name} for {scenario_path} not found")
@@ -0,0 +1,320 @@
+"""
+Multi-agent pathfinding: conflict-free timed paths for agents sharing a grid.
+
+Time advances in unit steps; each step an agent moves to a neighbouring
+cell or waits where it is. Two agents may never occupy the same cell at
+the same time nor swap cells in one step, and an agent that has arrived
+stays on its goal for good.
+
+Cooperative A* plans the agents one after another. Each agent runs a
+space-time A* (states are ``(cell, time)``) that avoids everything the
+agents planned before it reserved. The reservation table is hashed by
+integer keys (``time * size + cell``), so a lookup is one dict probe
+whatever the number of agents. Planning in priority order is fast but may
+fail to route an agent that a different order could have.
+
+Conflict-based search (CBS) is complete and optimal for the sum of arrival
+times. It plans every agent alone, then repeatedly finds the first
+collision and branches on which of the two agents must avoid it. Its
+search tree grows quickly with the number of agents, so it is only offered
+for small groups.
+
+Terrain costs do not slow agents down; a path's reported cost still sums
+the costs of the cells it enters (waits are free).
+"""
+
+import heapq
+from itertools import count
+
+from .budget import SearchBudgetExceeded
+from .grid_engine import UNREACHABLE
+
+MULTI_AGENT_SOLVERS = ("cooperative", "cbs")
+
+# CBS is refused for larger groups, and gives up after this many conflicts
+CBS_MAX_AGENTS = 16
+CBS_MAX_EXPANSIONS = 1000
+
+
+class ReservationTable:
+    """Cells and moves that are off limits at given times
+
+    ``vertices`` holds ``time * size + cell`` keys, ``edges`` holds moves
+    ``from -> to`` arriving at ``time`` as ``(time * size + from) * size + to``
+    and ``parked`` maps a cell to the time from which it is taken for good.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.vertices = set()
+        self.edges = set()
+        self.parked = {}
+        # Latest reserved time of each cell, for agents that want to stop
+        self.last_reserved = {}
+
+    def reserve_vertex(self, cell, time):
+        self.vertices.add(time * self.size + cell)
+        if time > self.last_reserved.get(cell, -1):
+            self.last_reserved[cell] = time
+
+    def reserve_edge(self, source, target, time):
+        """Forbid moving from ``source`` to ``target`` to arrive at ``time``"""
+        self.edges.add((time * self.size + source) * self.size + target)
+
+    def reserve_path(self, path):
+        """Reserve a timed path of cell ids, its swaps and its goal from arrival on"""
+        for time, cell in enumerate(path):
+            self.reserve_vertex(cell, time)
+            if time:
+                self.reserve_edge(cell, path[time - 1], time)
+        self.parked[path[-1]] = len(path) - 1
+
+    def is_free(self, cell, time):
+        if time * self.size + cell in self.vertices:
+            return False
+        parked = self.parked.get(cell)
+        return parked is None or time < parked
+
+    def can_move(self, source, target, time):
+        return (time * self.size + source) * self.size + target not in self.edges
+
+
+class SpaceTimeSearch:
+    """Space-time A* for single agents, with exact distance-to-goal heuristics
+
+    ``nodes_explored`` totals the states expanded by every search. When a
+    ``budget`` is given it is checked as often as it asks to be.
+    """
+
+    def __init__(self, engine, horizon, budget=None):
+        self.engine = engine
+        self.horizon = horizon
+        self.budget = budget
+        self.nodes_explored = 0
+        self.next_check = budget.steps_until_check(0) if budget else None
+        self._distances = {}
+
+    def distances_to(self, goal):
+        """Steps from every cell to ``goal`` (cached per goal)"""
+        distances = self._distances.get(goal)
+        if distances is None:
+            distances = self.engine.wavefront_distances(goal).data
+            self._distances[goal] = distances
+        return distances
+
+    def find(self, start, goal, reservations):
+        """Shortest timed path of cell ids from ``start`` to ``goal``, or None
+
+        The agent may only stop at the goal once no reservation there is
+        left, and may not run past the planning horizon.
+        """
+        engine, size = self.engine, self.engine.size
+        offsets, indices = engine._offsets, engine._indices
+        heuristic = self.distances_to(goal)
+        if heuristic[start] == UNREACHABLE or not reservations.is_free(start, 0):
+            return None
+        settle_after = reservations.last_reserved.get(goal, -1)
+        # No plan ends before the goal is free for good, so f never drops
+        # below that; ties then go to the deepest state instead of flooding
+        # every cheaper one
+        earliest_end = settle_after + 1
+        budget = self.budget
+
+        parents = {start: None}  # The start at time 0
+        tie = count()
+        open_set = [(max(heuristic[start], earliest_end), 0, next(tie), start)]
+        while open_set:
+            # Every state is reached at its own time, so the first parent
+            # recorded is as good as any and no state is pushed twice
+            _, time, _, cell = heapq.heappop(open_set)
+            time = -time
+            key = time * size + cell
+            self.nodes_explored += 1
+            if self.nodes_explored == self.next_check:
+                budget.check(self.nodes_explored)
+                self.next_check += budget.steps_until_check(self.nodes_explored)
+
+            if cell == goal and time > settle_after:
+                path = []
+                while key is not None:
+                    path.append(key % size)
+                    key = parents[key]
+                path.reverse()
+                return path
+            if time >= self.horizon:
+                continue
+
+            arrival = time + 1
+            moves = indices[offsets[cell] : offsets[cell + 1]].tolist()
+            moves.append(cell)  # Waiting in place
+            for neighbor in moves:
+                next_key = arrival * size + neighbor
+                if next_key in parents or heuristic[neighbor] == UNREACHABLE:
+                    continue
+                if not reservations.is_free(neighbor, arrival):
+                    continue
+                if neighbor != cell and not reservations.can_move(
+                    cell, neighbor, arrival
+                ):
+                    continue
+                parents[next_key] = key
+                heapq.heappush(
+                    open_set,
+                    (
+                        max(arrival + heuristic[neighbor], earliest_end),
+                        -arrival,
+                        next(tie),
+                        neighbor,
+                    ),
+                )
+        return None
+
+
+def first_conflict(paths):
+    """The earliest collision between two timed paths, or None
+
+    Returns ``(time, a, b, cells)`` where ``cells`` is ``(cell,)`` for two
+    agents on one cell and ``(from_a, to_a)`` for a swap in the step
+    arriving at ``time``. Agents without a path are ignored; finished agents
+    wait on their goal.
+    """
+
+    def position(path, time):
+        return path[min(time, len(path) - 1)]
+
+    agents = [agent for agent, path in enumerate(paths) if path is not None]
+    makespan = max((len(paths[agent]) for agent in agents), default=0)
+    for time in range(makespan):
+        occupied = {}
+        for agent in agents:
+            cell = position(paths[agent], time)
+            if cell in occupied:
+                return time, occupied[cell], agent, (cell,)
+            occupied[cell] = agent
+        if time == 0:
+            continue
+        for agent in agents:
+            source = position(paths[agent], time - 1)
+            target = position(paths[agent], time)
+            other = occupied.get(source)
+            if (
+                source != target
+                and other is not None
+                and other != agent
+                and position(paths[other], time - 1) == target
+            ):
+                return time, agent, other, (source, target)
+    return None
+
+
+def cooperative_astar(search, agents):
+    """Plan ``agents`` (start, goal) pairs in order, each avoiding the ones before
+
+    Returns one timed path per agent, None for agents that could not be
+    routed around the others within the horizon. If the budget runs out,
+    the agents not planned yet get None too.
+    """
+    reservations = ReservationTable(search.engine.size)
+    paths = [None] * len(agents)
+    for agent, (start, goal) in enumerate(agents):
+        try:
+            path = search.find(start, goal, reservations)
+        except SearchBudgetExceeded:
+            break
+        if path is not None:
+            reservations.reserve_path(path)
+        paths[agent] = path
+    return paths
+
+
+def conflict_based_search(search, agents):
+    """Optimal conflict-free paths by conflict-based search, or None
+
+    Each node of the constraint tree holds per-agent constraints and the
+    paths that satisfy them, ordered by the sum of arrival times. Returns
+    None if no solution was found within ``CBS_MAX_EXPANSIONS`` nodes or
+    the budget.
+    """
+    size = search.engine.size
+
+    def plan(agent, constraints):
+        table = ReservationTable(size)
+        for kind, cells, time in constraints:
+            if kind == "vertex":
+                table.reserve_vertex(cells[0], time)
+            else:
+                table.reserve_edge(cells[0], cells[1], time)
+        start, goal = agents[agent]
+        return search.find(start, goal, table)
+
+    def total_time(paths):
+        return sum(len(path) - 1 for path in paths)
+
+    try:
+        paths = [plan(agent, ()) for agent in range(len(agents))]
+        if any(path is None for path in paths):
+            return None
+        tie = count()
+        open_set = [(total_time(paths), next(tie), ((),) * len(agents), paths)]
+        for _ in range(CBS_MAX_EXPANSIONS):
+            if not open_set:
+                return None
+            _, _, constraints, paths = heapq.heappop(open_set)
+            conflict = first_conflict(paths)
+            if conflict is None:
+                return paths
+            time, first, second, cells = conflict
+            kind = "vertex" if len(cells) == 1 else "edge"
+            for agent, blocked in ((first, cells), (second, cells[::-1])):
+                agent_constraints = constraints[agent] + ((kind, blocked, time),)
+                path = plan(agent, agent_constraints)
+                if path is None:
+                    continue
+                child_paths = list(paths)
+                child_paths[agent] = path
+                child_constraints = list(constraints)
+                child_constraints[agent] = agent_constraints
+                heapq.heappush(
+                    open_set,
+                    (
+                        total_time(child_paths),
+                        next(tie),
+                        tuple(child_constraints),
+                        child_paths,
+                    ),
+                )
+    except SearchBudgetExceeded:
+        pass
+    return None
+
+
+def plan_agents(engine, agents, solver="cooperative", horizon=None, budget=None):
+    """Conflict-free timed paths for ``agents``, a list of (start, goal) cell ids
+
+    ``horizon`` caps the time steps of any path; by default it is twice the
+    longest single-agent distance plus two steps per agent. Returns the
+    paths (None for agents that could not be routed) and the number of
+    states explored. Raises ValueError for obstacle or shared endpoints, or
+    for CBS on too many agents.
+    """
+    starts = [start for start, _ in agents]
+    goals = [goal for _, goal in agents]
+    for name, cells in (("start", starts), ("goal", goals)):
+        if len(set(cells)) != len(cells):
+            raise ValueError(f"Two agents share a {name} cell")
+        for cell in cells:
+            if not engine.is_passable(cell):
+                raise ValueError(f"Agent {name} {engine.to_pos(cell)} is an obstacle")
+    if solver == "cbs" and len(agents) > CBS_MAX_AGENTS:
+        raise ValueError(f"CBS handles at most {CBS_MAX_AGENTS} agents")
+
+    search = SpaceTimeSearch(engine, horizon, budget)
+    if horizon is None:
+        longest = max(search.distances_to(goal)[start] for start, goal in agents)
+        search.horizon = 2 * max(longest, 0) + 2 * len(agents)
+
+    if solver == "cbs":
+        paths = conflict_based_search(search, agents) or [None] * len(agents)
+    else:
+        paths = cooperative_astar(search, agents)
+    return paths, search.nodes_explored
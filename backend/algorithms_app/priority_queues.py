@@ -0,0 +1,231 @@
+"""
+Addressable priority queues used by the best-first pathfinding searches
+
+The heap and bucket queues hold each item at most once. Pushing an item
+that is already queued changes its priority in place (decrease-key)
+instead of adding a duplicate entry, so the open list never grows past the
+number of distinct items and a search never pops an outdated copy of a
+node. Every such update is counted in ``decrease_keys``: it is a stale pop
+the search no longer has to make.
+"""
+
+import heapq
+from collections import deque
+
+
+class IndexedHeap:
+    """Binary heap of (priority, item) pairs with an item -> position index
+
+    Ties are broken by comparing items, like a ``heapq`` of tuples, so
+    priorities may be any numbers and items any orderable hashables.
+    """
+
+    kind = "indexed_heap"
+
+    def __init__(self):
+        self.heap = []
+        self.positions = {}
+        self.decrease_keys = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def push(self, priority, item):
+        """Insert ``item``, or move it to ``priority`` if it is already queued"""
+        position = self.positions.get(item)
+        if position is None:
+            self.heap.append((priority, item))
+            self._sift_up(len(self.heap) - 1)
+            return
+        old_priority = self.heap[position][0]
+        self.heap[position] = (priority, item)
+        if priority < old_priority:
+            self.decrease_keys += 1
+            self._sift_up(position)
+        elif priority > old_priority:
+            self._sift_down(position)
+
+    def pop(self):
+        """Remove and return the (priority, item) pair with the lowest priority"""
+        heap = self.heap
+        last = heap.pop()
+        if not heap:
+            del self.positions[last[1]]
+            return last
+        top = heap[0]
+        heap[0] = last
+        del self.positions[top[1]]
+        self._sift_down(0)
+        return top
+
+    def peek_priority(self):
+        return self.heap[0][0]
+
+    def peek(self):
+        """The (priority, item) pair with the lowest priority, left queued"""
+        return self.heap[0]
+
+    def remove(self, item):
+        """Drop a queued item"""
+        heap = self.heap
+        position = self.positions.pop(item)
+        last = heap.pop()
+        if position < len(heap):
+            heap[position] = last
+            self.positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self.positions[last[1]])
+
+    def priority(self, item):
+        """Current priority of a queued item"""
+        return self.heap[self.positions[item]][0]
+
+    def reprioritize(self, priority, added=()):
+        """Queue ``added`` items too and give every item ``priority(item)``
+
+        The heap is rebuilt in linear time rather than sifted item by item.
+        """
+        items = [*(item for _, item in self.heap), *added]
+        heap = [(priority(item), item) for item in items]
+        heapq.heapify(heap)
+        self.heap = heap
+        self.positions = {item: position for position, (_, item) in enumerate(heap)}
+
+    def _sift_up(self, position):
+        heap, positions = self.heap, self.positions
+        entry = heap[position]
+        while position:
+            parent = (position - 1) >> 1
+            parent_entry = heap[parent]
+            if entry >= parent_entry:
+                break
+            heap[position] = parent_entry
+            positions[parent_entry[1]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def _sift_down(self, position):
+        heap, positions = self.heap, self.positions
+        size = len(heap)
+        entry = heap[position]
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            child_entry = heap[child]
+            if entry <= child_entry:
+                break
+            heap[position] = child_entry
+            positions[child_entry[1]] = position
+            position = child
+            child = 2 * position + 1
+        heap[position] = entry
+        positions[entry[1]] = position
+
+
+class BucketQueue:
+    """Monotone integer priority queue (Dial's algorithm) with decrease-key
+
+    Items are kept in a circular array of ``max_step + 1`` buckets indexed by
+    priority, so push and pop are O(1) as long as every pushed priority lies
+    in ``[last popped, last popped + max_step]``. That holds for Dijkstra with
+    integer edge costs up to ``max_step`` and for A* with an integer,
+    consistent heuristic when ``max_step`` is the largest cost plus one.
+    A re-pushed item is swap-removed from its old bucket in O(1).
+    """
+
+    kind = "bucket"
+
+    def __init__(self, max_step):
+        self.buckets = [[] for _ in range(max_step + 1)]
+        self.cursor = 0
+        self.size = 0
+        self.entries = {}  # item -> (priority, index within its bucket)
+        self.decrease_keys = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def push(self, priority, item):
+        """Insert ``item``, or move it to ``priority`` if it is already queued"""
+        if priority < self.cursor:
+            raise ValueError("Bucket queue priorities must be monotone")
+        entry = self.entries.get(item)
+        if entry is not None:
+            if entry[0] == priority:
+                return
+            if priority < entry[0]:
+                self.decrease_keys += 1
+            self._remove(entry)
+        else:
+            self.size += 1
+        bucket = self.buckets[priority % len(self.buckets)]
+        self.entries[item] = (priority, len(bucket))
+        bucket.append(item)
+
+    def _remove(self, entry):
+        priority, index = entry
+        bucket = self.buckets[priority % len(self.buckets)]
+        last = bucket.pop()
+        if index < len(bucket):
+            bucket[index] = last
+            self.entries[last] = (priority, index)
+
+    def _advance(self):
+        if not self.size:
+            raise IndexError("pop from an empty bucket queue")
+        buckets, count = self.buckets, len(self.buckets)
+        while not buckets[self.cursor % count]:
+            self.cursor += 1
+        return buckets[self.cursor % count]
+
+    def pop(self):
+        """Remove and return the (priority, item) pair with the lowest priority"""
+        item = self._advance().pop()
+        del self.entries[item]
+        self.size -= 1
+        return self.cursor, item
+
+    def peek_priority(self):
+        self._advance()
+        return self.cursor
+
+    def priority(self, item):
+        """Current priority of a queued item"""
+        return self.entries[item][0]
+
+
+class FifoQueue:
+    """First-in, first-out queue for Dijkstra on unit-cost grids
+
+    When every move costs 1, cells are reached in order of their cost, so
+    arrival order already is priority order. The first cost found for a
+    cell is final, which means no item is ever pushed twice and push and
+    pop are single C-level deque operations.
+    """
+
+    kind = "fifo"
+
+    def __init__(self):
+        self.queue = deque()
+        self.decrease_keys = 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, priority, item):
+        self.queue.append((priority, item))
+
+    def pop(self):
+        """Remove and return the oldest (priority, item) pair"""
+        return self.queue.popleft()
+
+    def peek_priority(self):
+        return self.queue[0][0]
@@ -4,9 +4,10 @@ Includes: 8-Puzzle, N-Queens, Sudoku, etc.
 """
 
 import copy
-import heapq
 from typing import Any, Dict, List, Optional, Tuple
 
+from .priority_queues import IndexedHeap
+
 
 class PuzzleSolver:
     """Base class for puzzle-solving algorithms"""
@@ -75,20 +76,27 @@ class EightPuzzleSolver(PuzzleSolver):
         return tuple(tuple(row) for row in state)
 
     def solve_astar(self) -> Dict[str, Any]:
-        """Solve 8-puzzle using A* algorithm"""
-        open_set = []
-        heapq.heappush(
-            open_set,
-            (self.manhattan_distance(self.initial_state), 0, self.initial_state, []),
-        )
-
-        visited = set()
-        visited.add(self.state_to_tuple(self.initial_state))
+        """Solve 8-puzzle using A* algorithm
+
+        The open list is an indexed heap: reaching a queued state by a
+        shorter path lowers its priority in place, and expanded states are
+        closed, so every state is expanded at most once.
+        """
+        start = self.state_to_tuple(self.initial_state)
+        goal = self.state_to_tuple(self.goal_state)
+        open_set = IndexedHeap()
+        # Priorities are (f, g): among equal f, prefer the shallower state
+        open_set.push((self.manhattan_distance(self.initial_state), 0), start)
+        came_from = {start: None}
+        g_scores = {start: 0}
+        closed = set()
         steps = []
         nodes_explored = 0
 
         while open_set:
-            f_score, g_score, current_state, path = heapq.heappop(open_set)
+            (f_score, g_score), current = open_set.pop()
+            closed.add(current)
+            current_state = [list(row) for row in current]
             nodes_explored += 1
 
             steps.append(
@@ -96,27 +104,33 @@ class EightPuzzleSolver(PuzzleSolver):
             )
 
             # Check if goal reached
-            if current_state == self.goal_state:
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append([list(row) for row in current])
+                    current = came_from[current]
+                path.reverse()
                 return {
                     "solved": True,
                     "steps": steps,
-                    "path": path + [current_state],
+                    "path": path,
                     "nodes_explored": nodes_explored,
-                    "moves": len(path),
+                    "moves": len(path) - 1,
                     "algorithm": "astar",
+                    "stale_pops_avoided": open_set.decrease_keys,
                 }
 
             # Explore neighbors
+            new_g = g_score + 1
             for neighbor in self.get_neighbors(current_state):
                 neighbor_tuple = self.state_to_tuple(neighbor)
-                if neighbor_tuple not in visited:
-                    visited.add(neighbor_tuple)
-                    new_g = g_score + 1
+                if neighbor_tuple in closed:
+                    continue
+                if new_g < g_scores.get(neighbor_tuple, new_g + 1):
+                    g_scores[neighbor_tuple] = new_g
+                    came_from[neighbor_tuple] = current
                     h = self.manhattan_distance(neighbor)
-                    f = new_g + h
-                    heapq.heappush(
-                        open_set, (f, new_g, neighbor, path + [current_state])
-                    )
+                    open_set.push((new_g + h, new_g), neighbor_tuple)
 
             # Limit to prevent infinite loops
             if nodes_explored > 10000:
@@ -129,6 +143,7 @@ class EightPuzzleSolver(PuzzleSolver):
             "nodes_explored": nodes_explored,
             "moves": 0,
             "algorithm": "astar",
+            "stale_pops_avoided": open_set.decrease_keys,
             "message": "No solution found or puzzle is unsolvable",
         }
 
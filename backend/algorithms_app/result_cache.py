@@ -0,0 +1,98 @@
+"""
+Result cache for run_algorithm, keyed by a stable hash of the request inputs.
+
+Results are kept in an in-process LRU bounded in bytes and, when
+``ALGORITHM_RESULT_CACHE["BACKEND"]`` names a Django cache alias, also in that
+shared cache so every worker benefits from a hit.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .caching import ByteBoundedLRU
+
+# Algorithms whose result depends on random draws; cached only with a seed
+STOCHASTIC_ALGORITHMS = {"simulated_annealing", "genetic"}
+
+# Rough in-memory footprint of the parts of a result that grow with the search
+STEP_BYTES = 320
+PATH_CELL_BYTES = 100
+BASE_RESULT_BYTES = 1024
+
+
+def _config():
+    return getattr(settings, "ALGORITHM_RESULT_CACHE", {})
+
+
+_local_results = ByteBoundedLRU(_config().get("MAX_BYTES", 64 * 1024 * 1024))
+
+
+def _shared_cache():
+    alias = _config().get("BACKEND")
+    return caches[alias] if alias else None
+
+
+def result_cache_key(data, engine, options):
+    """Stable key for a validated run_algorithm request, or None if uncacheable
+
+    ``engine`` is the request's :class:`GridEngine`; the key uses its
+    fingerprint, so the grid is not parsed a second time. ``options`` are
+    the runner options the run gets, after server-side caps, so requests
+    that run identically share a key and a changed cap makes a new one.
+    """
+    stochastic = data["algorithm"] in STOCHASTIC_ALGORITHMS or (
+        data["algorithm"] == "hill_climbing" and data.get("restarts", 1) > 1
+    )
+    if stochastic and data.get("seed") is None:
+        return None
+
+    params = {
+        "algorithm": data["algorithm"],
+        "heuristic": data.get("heuristic", "manhattan"),
+        "start": list(data["start"]),
+        "goal": list(data["goal"]),
+        "trace_format": data.get("trace_format", "steps"),
+        "seed": data.get("seed"),
+        "options": options,
+    }
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(engine.fingerprint.encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return f"run-algorithm:{digest.hexdigest()}"
+
+
+def estimate_result_bytes(result):
+    """Approximate memory held by a result dict"""
+    size = BASE_RESULT_BYTES
+    size += STEP_BYTES * len(result.get("steps") or ())
+    size += PATH_CELL_BYTES * len(result.get("path") or ())
+    trace = result.get("trace")
+    if trace:
+        for column in ("cells", "types", "sides"):
+            values = trace.get(column) or ()
+            size += len(values) if isinstance(values, str) else 36 * len(values)
+    return size
+
+
+def get_cached_result(key):
+    """Look a result up locally, then in the shared backend; None on a miss"""
+    result = _local_results.get(key)
+    if result is None:
+        shared = _shared_cache()
+        if shared is not None:
+            result = shared.get(key)
+            if result is not None:
+                _local_results.put(key, result, estimate_result_bytes(result))
+    return dict(result) if result is not None else None
+
+
+def store_result(key, result):
+    """Cache a copy of a result in the local LRU and the shared backend"""
+    result = dict(result)
+    _local_results.put(key, result, estimate_result_bytes(result))
+    shared = _shared_cache()
+    if shared is not None:
+        shared.set(key, result, timeout=_config().get("TIMEOUT", 3600))
@@ -0,0 +1,62 @@
+"""
+Flat per-search bookkeeping over cell ids.
+
+Instead of dicts and sets keyed by cell, which allocate an entry for every
+cell a search touches, a :class:`SearchState` preallocates one flat array
+each for parent links, best known costs and visited flags. Its memory is
+fixed by the grid size and leaves nothing per cell for the garbage
+collector. The arrays are NumPy buffers accessed through memoryviews, so
+reads hand back plain ints.
+"""
+
+import numpy as np
+
+# Parent of the root and of cells not reached yet
+NO_PARENT = -1
+
+INT32_MAX = np.iinfo(np.int32).max
+
+
+class SearchState:
+    """Parent index, best known cost and visited flag of every cell
+
+    ``parents[c]`` is the cell ``c`` was reached from (``NO_PARENT`` for the
+    root and unreached cells), ``distances[c]`` the best known cost to ``c``
+    (``unreached`` until a path gets there) and ``visited[c]`` is non-zero
+    once the search has marked ``c``. Costs are int32 unless ``wide``.
+    The visited flags take one byte per cell: testing a packed bit costs
+    several Python operations per neighbour.
+    """
+
+    __slots__ = (
+        "size",
+        "unreached",
+        "parent_array",
+        "distance_array",
+        "parents",
+        "distances",
+        "visited",
+    )
+
+    def __init__(self, size, wide=False):
+        dtype = np.int64 if wide else np.int32
+        self.size = size
+        self.unreached = int(np.iinfo(dtype).max)
+        self.parent_array = np.full(size, NO_PARENT, dtype=np.int32)
+        self.distance_array = np.full(size, self.unreached, dtype=dtype)
+        self.parents = self.parent_array.data
+        self.distances = self.distance_array.data
+        self.visited = bytearray(size)
+
+    @property
+    def nbytes(self):
+        return self.parent_array.nbytes + self.distance_array.nbytes + self.size
+
+    def reset(self):
+        """Forget every cell, for reuse by another search on the same grid"""
+        self.parent_array.fill(NO_PARENT)
+        self.distance_array.fill(self.unreached)
+        self.visited = bytearray(self.size)
+
+    def reached(self, cell):
+        return self.distances[cell] != self.unreached
@@ -3,11 +3,79 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from .generators import (
+    GENERATORS,
+    MAX_GENERATED_SIDE,
+    MAX_INLINE_GENERATED_SIDE,
+    generated_grid,
+)
+from .grid_codec import PackedGrid
 from .models import Simulation
+from .multi_agent import MULTI_AGENT_SOLVERS
+from .step_trace import TRACE_FORMATS
 
 User = get_user_model()
 
 
+class GridField(serializers.Field):
+    """A grid as nested lists of ints or as a compact obstacle mask
+
+    Values are 0 = free, 1 = obstacle, 2..K = terrain cost of entering the
+    cell. Nested lists are validated cell by cell; the compact format (see
+    ``grid_codec``) is decoded straight into a :class:`PackedGrid`. A dict
+    with a ``generator`` key is a seeded grid spec (see
+    :class:`GeneratedGridSerializer`), generated on the server; inline specs
+    are limited to ``MAX_INLINE_GENERATED_SIDE`` a side, and larger grids
+    are fetched from the generate-grid endpoint and sent in compact form.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rows_field = serializers.ListField(
+            child=serializers.ListField(child=serializers.IntegerField(min_value=0))
+        )
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and "generator" in data:
+            spec = GeneratedGridSerializer(data=data)
+            if not spec.is_valid():
+                raise serializers.ValidationError(spec.errors)
+            params = spec.validated_data
+            if max(params["rows"], params["cols"]) > MAX_INLINE_GENERATED_SIDE:
+                raise serializers.ValidationError(
+                    "Inline generated grids are limited to "
+                    f"{MAX_INLINE_GENERATED_SIDE} cells a side; generate larger "
+                    "ones with generate-grid and send the compact grid"
+                )
+            return generated_grid(*(params[key] for key in GENERATED_GRID_PARAMETERS))
+        if isinstance(data, dict):
+            try:
+                return PackedGrid.decode(data)
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+        return self.rows_field.run_validation(data)
+
+    def to_representation(self, value):
+        return value.encode() if isinstance(value, PackedGrid) else value
+
+
+class GeneratedGridSerializer(serializers.Serializer):
+    """Serializer for a seeded maze or random obstacle grid"""
+
+    generator = serializers.ChoiceField(choices=GENERATORS)
+    rows = serializers.IntegerField(min_value=1, max_value=MAX_GENERATED_SIDE)
+    cols = serializers.IntegerField(min_value=1, max_value=MAX_GENERATED_SIDE)
+    seed = serializers.IntegerField(min_value=0, default=0)
+    # Obstacle probability of the "random" generator; mazes ignore it
+    density = serializers.FloatField(min_value=0, max_value=1, default=0.3)
+    encoding = serializers.ChoiceField(
+        choices=["bitpacked", "rle"], default="bitpacked"
+    )
+
+
+GENERATED_GRID_PARAMETERS = ("generator", "rows", "cols", "seed", "density")
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model - returns basic user info"""
 
@@ -112,24 +180,40 @@ class SimulationSerializer(serializers.ModelSerializer):
             "algorithm_display",
         ]
 
+    def validate_grid_data(self, value):
+        """Accept grids as nested lists or in the compact wire format"""
+        if isinstance(value, dict):
+            try:
+                PackedGrid.decode(value)
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+        return value
+
+
+PATHFINDING_ALGORITHMS = [
+    "astar",
+    "ara_star",
+    "ida_star",
+    "fringe",
+    "jps",
+    "hpa",
+    "bfs",
+    "bidirectional_bfs",
+    "bidirectional_astar",
+    "dfs",
+    "dijkstra",
+    "hill_climbing",
+    "simulated_annealing",
+    "genetic",
+    "auto",
+]
+
 
 class AlgorithmExecutionSerializer(serializers.Serializer):
     """Serializer for algorithm execution requests"""
 
-    algorithm = serializers.ChoiceField(
-        choices=[
-            "astar",
-            "bfs",
-            "dfs",
-            "dijkstra",
-            "hill_climbing",
-            "simulated_annealing",
-            "genetic",
-        ]
-    )
-    grid = serializers.ListField(
-        child=serializers.ListField(child=serializers.IntegerField())
-    )
+    algorithm = serializers.ChoiceField(choices=PATHFINDING_ALGORITHMS)
+    grid = GridField()
     start = serializers.ListField(
         child=serializers.IntegerField(), min_length=2, max_length=2
     )
@@ -137,4 +221,153 @@ class AlgorithmExecutionSerializer(serializers.Serializer):
         child=serializers.IntegerField(), min_length=2, max_length=2
     )
     heuristic = serializers.CharField(required=False, default="manhattan")
+    # "steps" returns a list of step dicts; the compact formats return a
+    # columnar "trace" object (see step_trace.COMPACT_TRACE_DECODER)
+    trace_format = serializers.ChoiceField(choices=TRACE_FORMATS, default="steps")
+    # Stream steps in chunks as NDJSON lines or server-sent events
+    stream = serializers.ChoiceField(choices=["none", "ndjson", "sse"], default="none")
+    # Seeds simulated_annealing / genetic; only seeded stochastic runs are cached
+    seed = serializers.IntegerField(required=False, allow_null=True, default=None)
+    # Genetic algorithm tuning; omitted values use the engine defaults
+    population_size = serializers.IntegerField(
+        required=False, min_value=2, max_value=100000
+    )
+    generations = serializers.IntegerField(
+        required=False, min_value=1, max_value=100000
+    )
+    mutation_rate = serializers.FloatField(required=False, min_value=0.0, max_value=1.0)
+    # Processes used to evaluate GA fitness; 0 or 1 evaluates in-process
+    workers = serializers.IntegerField(required=False, min_value=0, max_value=64)
+    # Independent trajectories for hill_climbing / simulated_annealing
+    restarts = serializers.IntegerField(required=False, min_value=1, max_value=10000)
+    # Initial heuristic inflation for ara_star
+    epsilon = serializers.FloatField(required=False, min_value=1.0, max_value=100.0)
+    # Caps on any search; see budget.SearchBudget
+    time_budget_ms = serializers.IntegerField(
+        required=False, min_value=1, max_value=600000
+    )
+    max_nodes = serializers.IntegerField(required=False, min_value=1)
     save_simulation = serializers.BooleanField(default=False)
+
+
+class AlgorithmComparisonSerializer(AlgorithmExecutionSerializer):
+    """Serializer for running several algorithms on one grid side by side
+
+    Every option of a single run applies to each algorithm; comparisons are
+    neither streamed nor saved.
+    """
+
+    algorithm = None
+    stream = None
+    save_simulation = None
+    algorithms = serializers.ListField(
+        child=serializers.ChoiceField(choices=PATHFINDING_ALGORITHMS),
+        min_length=1,
+        max_length=32,
+    )
+    # Return each algorithm's path and steps / trace, not just the summary
+    include_traces = serializers.BooleanField(default=False)
+    # Worker processes; defaults to one per algorithm, capped at the CPU count
+    processes = serializers.IntegerField(required=False, min_value=1, max_value=64)
+
+
+class DistanceFieldSerializer(serializers.Serializer):
+    """Serializer for whole-grid distance field requests"""
+
+    grid = GridField()
+    source = serializers.ListField(
+        child=serializers.IntegerField(), min_length=2, max_length=2
+    )
+    # "binary" returns the raw little-endian int32 buffer, row-major
+    format = serializers.ChoiceField(choices=["binary", "json"], default="binary")
+
+
+class IncrementalSessionSerializer(serializers.Serializer):
+    """Serializer for starting an incremental (LPA*) planning session"""
+
+    grid = GridField()
+    start = serializers.ListField(
+        child=serializers.IntegerField(), min_length=2, max_length=2
+    )
+    goal = serializers.ListField(
+        child=serializers.IntegerField(), min_length=2, max_length=2
+    )
+    trace_format = serializers.ChoiceField(choices=TRACE_FORMATS, default="steps")
+
+
+class CellChangeSerializer(serializers.Serializer):
+    """A single edited grid cell"""
+
+    position = serializers.ListField(
+        child=serializers.IntegerField(), min_length=2, max_length=2
+    )
+    value = serializers.IntegerField(min_value=0)
+
+
+class IncrementalUpdateSerializer(serializers.Serializer):
+    """Serializer for replanning an incremental session after grid edits"""
+
+    changes = CellChangeSerializer(many=True)
+    trace_format = serializers.ChoiceField(
+        choices=TRACE_FORMATS, required=False, allow_null=True, default=None
+    )
+
+
+class BatchPathfindingSerializer(serializers.Serializer):
+    """Serializer for many start/goal queries on one grid"""
+
+    algorithm = serializers.ChoiceField(choices=["dijkstra", "bfs"], default="dijkstra")
+    grid = GridField()
+    # Each pair is [[start_row, start_col], [goal_row, goal_col]]
+    pairs = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.ListField(
+                child=serializers.IntegerField(), min_length=2, max_length=2
+            ),
+            min_length=2,
+            max_length=2,
+        ),
+        min_length=1,
+    )
+
+
+class FlowFieldSerializer(serializers.Serializer):
+    """Serializer for routing many agents to one goal along a flow field"""
+
+    grid = GridField()
+    goal = serializers.ListField(
+        child=serializers.IntegerField(), min_length=2, max_length=2
+    )
+    starts = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.IntegerField(), min_length=2, max_length=2
+        ),
+        default=list,
+    )
+    # Also return the direction bytes, base64-encoded in row-major order
+    include_field = serializers.BooleanField(default=False)
+
+
+class MultiAgentSerializer(serializers.Serializer):
+    """Serializer for conflict-free paths of several agents on one grid"""
+
+    grid = GridField()
+    # Each agent is [[start_row, start_col], [goal_row, goal_col]]
+    agents = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.ListField(
+                child=serializers.IntegerField(), min_length=2, max_length=2
+            ),
+            min_length=2,
+            max_length=2,
+        ),
+        min_length=1,
+        max_length=1000,
+    )
+    solver = serializers.ChoiceField(choices=MULTI_AGENT_SOLVERS, default="cooperative")
+    # Longest plan in time steps; see multi_agent.plan_agents for the default
+    horizon = serializers.IntegerField(required=False, min_value=1)
+    time_budget_ms = serializers.IntegerField(
+        required=False, min_value=1, max_value=600000
+    )
+    max_nodes = serializers.IntegerField(required=False, min_value=1)
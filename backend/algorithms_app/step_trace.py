@@ -0,0 +1,149 @@
+"""
+Columnar recording and encoding of search step traces
+"""
+
+import base64
+import gc
+import sys
+from array import array
+from contextlib import contextmanager
+
+import numpy as np
+
+STEP_TYPES = ("visiting", "exploring")
+VISITING, EXPLORING = 0, 1
+
+SIDES = ("forward", "backward")
+FORWARD, BACKWARD = 0, 1
+
+TRACE_FORMATS = ("steps", "compact_json", "compact_base64")
+
+COMPACT_TRACE_VERSION = "columnar-v1"
+COMPACT_TRACE_DECODER = (
+    "Step i is at position [cells[i] // cols, cells[i] % cols] with type "
+    "type_codes[types[i]] (and side side_codes[sides[i]] when sides is present). "
+    "With encoding 'base64', cells is little-endian int32 and types/sides are "
+    "uint8, each base64-encoded; with encoding 'json' they are plain arrays."
+)
+
+
+@contextmanager
+def gc_paused():
+    """Suspend cyclic garbage collection while many small containers are built
+
+    Each burst of new dicts and lists otherwise triggers a collection that
+    rescans every step built so far, though none can be part of a cycle.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class StepTrace:
+    """Steps recorded as parallel arrays of flat cell ids and one-byte type codes
+
+    Searches call :meth:`visit` / :meth:`explore` (or :meth:`record` when
+    steps carry a side), which append two machine integers instead of
+    allocating a dict per step. The trace is turned into the response shape
+    only once, by :meth:`to_steps` or :meth:`to_compact`.
+
+    When streaming, searches yield the trace whenever it holds
+    ``chunk_size`` steps and the consumer takes the buffered steps with
+    :meth:`drain`; ``len()`` still counts every step ever recorded.
+    """
+
+    __slots__ = ("cells", "types", "sides", "chunk_size", "drained")
+
+    def __init__(self, sided=False, chunk_size=sys.maxsize):
+        self.cells = array("i")
+        self.types = bytearray()
+        self.sides = bytearray() if sided else None
+        self.chunk_size = chunk_size
+        self.drained = 0
+
+    def __len__(self):
+        return self.drained + len(self.cells)
+
+    def visit(self, cell):
+        self.cells.append(cell)
+        self.types.append(VISITING)
+
+    def explore(self, cell):
+        self.cells.append(cell)
+        self.types.append(EXPLORING)
+
+    def record(self, cell, kind, side):
+        """Record a step of a bidirectional search"""
+        self.cells.append(cell)
+        self.types.append(kind)
+        self.sides.append(side)
+
+    def drain(self):
+        """Hand over the buffered steps as a new trace and start a fresh buffer"""
+        chunk = StepTrace(sided=self.sides is not None)
+        chunk.cells, chunk.types, chunk.sides = self.cells, self.types, self.sides
+        self.drained += len(self.cells)
+        self.cells = array("i")
+        self.types = bytearray()
+        if self.sides is not None:
+            self.sides = bytearray()
+        return chunk
+
+    def to_steps(self, cols):
+        """Expand to the classic list of ``{"position", "type"[, "side"]}`` dicts"""
+        with gc_paused():
+            cells = np.frombuffer(self.cells, dtype=np.int32)
+            positions = np.stack(np.divmod(cells, cols), axis=1).tolist()
+            if self.sides is None:
+                return [
+                    {"position": position, "type": STEP_TYPES[kind]}
+                    for position, kind in zip(positions, self.types)
+                ]
+            return [
+                {"position": position, "type": STEP_TYPES[kind], "side": SIDES[side]}
+                for position, kind, side in zip(positions, self.types, self.sides)
+            ]
+
+    def to_compact(self, cols, encoding="json"):
+        """Encode as a columnar trace; ``encoding`` is ``"json"`` or ``"base64"``"""
+        if encoding == "base64":
+            cells = base64.b64encode(
+                np.frombuffer(self.cells, dtype=np.int32).astype("<i4").tobytes()
+            ).decode("ascii")
+
+            def encode_codes(codes):
+                return base64.b64encode(bytes(codes)).decode("ascii")
+
+        else:
+            cells = self.cells.tolist()
+
+            def encode_codes(codes):
+                return list(codes)
+
+        compact = {
+            "format": COMPACT_TRACE_VERSION,
+            "encoding": encoding,
+            "length": len(self.cells),
+            "cols": cols,
+            "cells": cells,
+            "types": encode_codes(self.types),
+            "type_codes": list(STEP_TYPES),
+            "decoder": COMPACT_TRACE_DECODER,
+        }
+        if self.sides is not None:
+            compact["sides"] = encode_codes(self.sides)
+            compact["side_codes"] = list(SIDES)
+        return compact
+
+
+def encode_trace(trace, cols, trace_format):
+    """Encode a trace as ``{"steps": [...]}`` or a compact ``{"trace": {...}}``"""
+    if trace_format == "compact_json":
+        return {"trace": trace.to_compact(cols, encoding="json")}
+    if trace_format == "compact_base64":
+        return {"trace": trace.to_compact(cols, encoding="base64")}
+    return {"steps": trace.to_steps(cols)}
@@ -3,14 +3,22 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     SimulationViewSet,
+    compare_algorithms,
+    create_incremental_session,
     dashboard_stats,
+    distance_field,
+    generate_grid,
     get_algorithms,
     get_current_user,
     get_simulation_types,
+    plan_multi_agent,
     play_game,
     register_user,
+    route_with_flow_field,
     run_algorithm,
+    run_batch_queries,
     solve_puzzle,
+    update_incremental_session,
 )
 
 router = DefaultRouter()
@@ -20,6 +28,18 @@ urlpatterns = [
     path("auth/register/", register_user, name="register"),
     path("auth/me/", get_current_user, name="current-user"),
     path("run-algorithm/", run_algorithm, name="run-algorithm"),
+    path("run-batch/", run_batch_queries, name="run-batch"),
+    path("compare/", compare_algorithms, name="compare"),
+    path("distance-field/", distance_field, name="distance-field"),
+    path("flow-field/", route_with_flow_field, name="flow-field"),
+    path("multi-agent/", plan_multi_agent, name="multi-agent"),
+    path("generate-grid/", generate_grid, name="generate-grid"),
+    path("incremental/", create_incremental_session, name="incremental"),
+    path(
+        "incremental/<str:session_id>/",
+        update_incremental_session,
+        name="incremental-session",
+    ),
     path("algorithms/", get_algorithms, name="algorithms"),
     path("simulation-types/", get_simulation_types, name="simulation-types"),
     path("solve-puzzle/", solve_puzzle, name="solve-puzzle"),
@@ -1,17 +1,42 @@
+import base64
+import json
 import time
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.db.models import Avg, Count, Q, Sum
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .algorithms import AlgorithmRunner
+from .algorithms import RUNNER_OPTIONS, AlgorithmRunner
+from .comparison import run_comparison
+from .generators import generated_grid
+from .grid_codec import PackedGrid
+from .grid_engine import UNREACHABLE, GridEngine
+from .incremental import (
+    LPAStarPlanner,
+    create_session,
+    drop_session,
+    get_session,
+    update_session,
+)
 from .models import Simulation
+from .result_cache import get_cached_result, result_cache_key, store_result
 from .serializers import (
+    GENERATED_GRID_PARAMETERS,
+    AlgorithmComparisonSerializer,
     AlgorithmExecutionSerializer,
+    BatchPathfindingSerializer,
+    DistanceFieldSerializer,
+    FlowFieldSerializer,
+    GeneratedGridSerializer,
+    IncrementalSessionSerializer,
+    IncrementalUpdateSerializer,
+    MultiAgentSerializer,
     RegisterSerializer,
     SimulationSerializer,
     UserSerializer,
@@ -19,6 +44,11 @@ from .serializers import (
 
 User = get_user_model()
 
+STREAM_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
 
 @api_view(["POST"])
 @permission_classes([permissions.AllowAny])
@@ -60,50 +90,452 @@ def run_algorithm(request):
     data = serializer.validated_data
 
     try:
-        # Run the algorithm
+        stream_format = data.get("stream", "none")
+        if stream_format != "none":
+            # Streams are never cached: their steps are not kept
+            start_time = time.time()
+            runner = build_runner(data)
+            response = StreamingHttpResponse(
+                stream_algorithm_events(
+                    runner, data, request.user, stream_format, start_time
+                ),
+                content_type=STREAM_CONTENT_TYPES[stream_format],
+            )
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"  # Don't let nginx buffer chunks
+            return response
+
+        # The engine validates the grid and is shared by the key and the run
         start_time = time.time()
+        engine = GridEngine(data["grid"])
+        options = runner_options(data)
+        cache_key = result_cache_key(data, engine, options)
+        result = get_cached_result(cache_key) if cache_key else None
+
+        if result is not None:
+            # This request's time is the lookup; keep the original run's too
+            result["cached_execution_time"] = result["execution_time"]
+            result["execution_time"] = time.time() - start_time
+            result["cached"] = True
+        else:
+            # Run the algorithm
+            runner = build_runner(data, engine, options)
+            result = runner.execute()
+            execution_time = time.time() - start_time
+
+            result["execution_time"] = execution_time
+            # Where a deadline cut the search short the result is not repeatable
+            if cache_key and result.get("budget", {}).get("exhausted") != "time":
+                store_result(cache_key, result)
+            result["cached"] = False
+
+        # Save simulation if requested and user is authenticated
+        if data.get("save_simulation") and request.user.is_authenticated:
+            simulation = save_pathfinding_simulation(
+                request.user, data, result, result.get("steps", result.get("trace"))
+            )
+            result["simulation_id"] = simulation.id
+
+        return Response(result, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+def compare_algorithms(request):
+    """Run several algorithms on one grid concurrently and summarise them"""
+    serializer = AlgorithmComparisonSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+
+    try:
+        start_time = time.time()
+        engine = GridEngine(data["grid"])
+        grid_parse_time = time.time() - start_time
+        params = {
+            "start": tuple(data["start"]),
+            "goal": tuple(data["goal"]),
+            "heuristic": data.get("heuristic", "manhattan"),
+            "trace_format": data.get("trace_format", "steps"),
+            "seed": data.get("seed"),
+            "options": runner_options(data),
+        }
+        results, processes = run_comparison(
+            engine,
+            data["algorithms"],
+            params,
+            include_traces=data["include_traces"],
+            processes=data.get("processes"),
+        )
+        return Response(
+            {
+                "results": results,
+                "processes": processes,
+                "grid_parse_time": grid_parse_time,
+                "execution_time": time.time() - start_time,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+def run_batch_queries(request):
+    """Answer a batch of start/goal queries on one grid with shared search trees"""
+    serializer = BatchPathfindingSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+
+    try:
+        start_time = time.time()
+        pairs = [(tuple(start), tuple(goal)) for start, goal in data["pairs"]]
         runner = AlgorithmRunner(
             algorithm=data["algorithm"],
             grid=data["grid"],
-            start=tuple(data["start"]),
-            goal=tuple(data["goal"]),
-            heuristic=data.get("heuristic", "manhattan"),
+            start=pairs[0][0],
+            goal=pairs[0][1],
         )
-        result = runner.execute()
-        execution_time = time.time() - start_time
+        result = runner.execute_batch(pairs)
+        result["execution_time"] = time.time() - start_time
+        return Response(result, status=status.HTTP_200_OK)
 
-        result["execution_time"] = execution_time
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        # Save simulation if requested and user is authenticated
-        if data.get("save_simulation") and request.user.is_authenticated:
-            simulation = Simulation.objects.create(
-                user=request.user,
-                algorithm=data["algorithm"],
-                grid_data=data["grid"],
-                start_position=data["start"],
-                goal_position=data["goal"],
-                heuristic=data.get("heuristic", "manhattan"),
-                path_found=result["path_found"],
-                path=result.get("path"),
-                steps=result.get("steps"),
-                nodes_explored=result.get("nodes_explored", 0),
-                path_cost=result.get("path_cost", 0.0),
-                execution_time=execution_time,
+
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+def distance_field(request):
+    """Path cost from one cell to every cell of the grid
+
+    Uniform grids use the vectorized BFS wavefront; weighted grids honour
+    terrain costs. Unreachable cells hold -1.
+    """
+    serializer = DistanceFieldSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+
+    try:
+        engine = GridEngine(data["grid"])
+        if not engine.contains(data["source"]):
+            raise ValueError(f"Source position {data['source']} is outside the grid")
+        distances = engine.distances_from(engine.to_id(data["source"]))
+
+        if data["format"] == "binary":
+            response = HttpResponse(
+                distances.astype("<i4").tobytes(),
+                content_type="application/octet-stream",
             )
-            result["simulation_id"] = simulation.id
+            response["X-Grid-Rows"] = engine.rows
+            response["X-Grid-Cols"] = engine.cols
+            response["X-Distance-Dtype"] = "int32-le"
+            return response
+
+        return Response(
+            {
+                "rows": engine.rows,
+                "cols": engine.cols,
+                "distances": distances.reshape(engine.rows, engine.cols).tolist(),
+                "reachable": int((distances != UNREACHABLE).sum()),
+                "max_distance": int(distances.max()) if engine.size else UNREACHABLE,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+def route_with_flow_field(request):
+    """Route agents to one goal along a cached per-grid, per-goal flow field
+
+    The direction bytes (see ``flow_field``) are returned base64-encoded
+    when ``include_field`` is set, for clients that walk agents themselves.
+    """
+    serializer = FlowFieldSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    data = serializer.validated_data
+
+    try:
+        start_time = time.time()
+        engine = GridEngine(data["grid"])
+        goal = tuple(data["goal"])
+        if not engine.contains(goal):
+            raise ValueError(f"Goal position {list(goal)} is outside the grid")
+        runner = AlgorithmRunner(
+            algorithm="dijkstra", grid=engine, start=goal, goal=goal
+        )
+        result = runner.execute_flow_field([tuple(start) for start in data["starts"]])
+        field = result.pop("field")
+        result["rows"], result["cols"] = runner.rows, runner.cols
+        if data["include_field"]:
+            result["directions"] = base64.b64encode(field.directions).decode("ascii")
+        result["execution_time"] = time.time() - start_time
         return Response(result, status=status.HTTP_200_OK)
 
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+def plan_multi_agent(request):
+    """Plan conflict-free timed paths for several agents on one grid"""
+    serializer = MultiAgentSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+
+    try:
+        start_time = time.time()
+        agents = [(tuple(start), tuple(goal)) for start, goal in data["agents"]]
+        runner = AlgorithmRunner(
+            algorithm="astar",
+            grid=data["grid"],
+            start=agents[0][0],
+            goal=agents[0][1],
+            options=runner_options(data),
+        )
+        result = runner.execute_multi_agent(agents, data["solver"], data.get("horizon"))
+        result["execution_time"] = time.time() - start_time
+        return Response(result, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+def generate_grid(request):
+    """Generate a seeded maze or obstacle grid in the compact grid format
+
+    The same spec, up to ``MAX_INLINE_GENERATED_SIDE`` a side, can be sent
+    as the ``grid`` of any pathfinding request, so a workload is
+    reproducible from its seed alone.
+    """
+    serializer = GeneratedGridSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+
+    try:
+        start_time = time.time()
+        grid = generated_grid(*(data[key] for key in GENERATED_GRID_PARAMETERS))
+        result = {
+            "generator": data["generator"],
+            "seed": data["seed"],
+            "grid": grid.encode(data["encoding"]),
+            "open_cells": grid.size - int(grid.obstacles().sum()),
+            "generation_time": time.time() - start_time,
+        }
+        return Response(result, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+def create_incremental_session(request):
+    """Plan a path with LPA* and keep the search state for later edits"""
+    serializer = IncrementalSessionSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+
+    try:
+        start_time = time.time()
+        planner = LPAStarPlanner(
+            data["grid"],
+            tuple(data["start"]),
+            tuple(data["goal"]),
+            trace_format=data["trace_format"],
+        )
+        with planner.lock:
+            result = planner.plan()
+        result["session_id"] = create_session(planner)
+        result["execution_time"] = time.time() - start_time
+        return Response(result, status=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST", "DELETE"])
+@permission_classes([permissions.AllowAny])
+def update_incremental_session(request, session_id):
+    """Apply changed cells to a session and repair its path, or end the session"""
+    planner = get_session(session_id)
+    if planner is None:
+        return Response(
+            {"error": "Unknown or expired session"}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    if request.method == "DELETE":
+        drop_session(session_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    serializer = IncrementalUpdateSerializer(data=request.data)
+
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+
+    try:
+        start_time = time.time()
+        with planner.lock:
+            if data["trace_format"]:
+                planner.trace_format = data["trace_format"]
+            cells_changed = planner.apply_changes(
+                (*change["position"], change["value"]) for change in data["changes"]
+            )
+            result = planner.plan()
+            update_session(session_id, planner)
+        result["session_id"] = session_id
+        result["cells_changed"] = cells_changed
+        result["execution_time"] = time.time() - start_time
+        return Response(result, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def runner_options(data):
+    """Runner options from validated request data
+
+    The server-wide ``ALGORITHM_TIME_BUDGET_MS`` setting caps the time
+    budget a request may ask for.
+    """
+    options = {key: data[key] for key in RUNNER_OPTIONS if key in data}
+    time_limit = getattr(settings, "ALGORITHM_TIME_BUDGET_MS", None)
+    if time_limit is not None:
+        options["time_budget_ms"] = min(
+            options.get("time_budget_ms", time_limit), time_limit
+        )
+    return options
+
+
+def build_runner(data, engine=None, options=None):
+    """Create an AlgorithmRunner from validated AlgorithmExecutionSerializer data
+
+    ``engine`` is an already built :class:`GridEngine` for ``data["grid"]``
+    and ``options`` the request's :func:`runner_options`, when the caller
+    already has them.
+    """
+    return AlgorithmRunner(
+        algorithm=data["algorithm"],
+        grid=data["grid"] if engine is None else engine,
+        start=tuple(data["start"]),
+        goal=tuple(data["goal"]),
+        heuristic=data.get("heuristic", "manhattan"),
+        trace_format=data.get("trace_format", "steps"),
+        seed=data.get("seed"),
+        options=runner_options(data) if options is None else options,
+    )
+
+
+def save_pathfinding_simulation(user, data, result, steps):
+    """Store a pathfinding run for the user's history"""
+    return Simulation.objects.create(
+        user=user,
+        algorithm=data["algorithm"],
+        grid_data=(
+            data["grid"].encode()
+            if isinstance(data["grid"], PackedGrid)
+            else data["grid"]
+        ),
+        start_position=data["start"],
+        goal_position=data["goal"],
+        heuristic=data.get("heuristic", "manhattan"),
+        path_found=result["path_found"],
+        path=result.get("path"),
+        steps=steps,
+        nodes_explored=result.get("nodes_explored", 0),
+        path_cost=result.get("path_cost", 0.0),
+        execution_time=result["execution_time"],
+    )
+
+
+def stream_algorithm_events(runner, data, user, stream_format, start_time):
+    """Serialize the runner's step/result events as NDJSON lines or SSE messages
+
+    Steps are flushed in chunks as the search produces them, so they are not
+    kept for saving: a streamed simulation is stored without its steps.
+    """
+
+    def encode(event):
+        payload = json.dumps(event)
+        if stream_format == "sse":
+            return f"event: {event['event']}\ndata: {payload}\n\n"
+        return payload + "\n"
+
+    try:
+        for event in runner.stream():
+            if event["event"] == "result":
+                event["execution_time"] = time.time() - start_time
+                if data.get("save_simulation") and user.is_authenticated:
+                    simulation = save_pathfinding_simulation(user, data, event, None)
+                    event["simulation_id"] = simulation.id
+            yield encode(event)
+    except Exception as e:
+        yield encode({"event": "error", "error": str(e)})
+
+
 @api_view(["GET"])
 def get_algorithms(request):
     """Return list of available algorithms"""
     algorithms = [
         {"id": "astar", "name": "A* Search", "category": "Informed"},
+        {
+            "id": "ara_star",
+            "name": "Anytime Repairing A* (ARA*)",
+            "category": "Informed",
+        },
+        {
+            "id": "ida_star",
+            "name": "Iterative Deepening A* (IDA*)",
+            "category": "Informed",
+        },
+        {"id": "fringe", "name": "Fringe Search", "category": "Informed"},
+        {"id": "jps", "name": "Jump Point Search", "category": "Informed"},
+        {"id": "hpa", "name": "Hierarchical A* (HPA*)", "category": "Informed"},
         {"id": "bfs", "name": "Breadth-First Search", "category": "Uninformed"},
+        {
+            "id": "bidirectional_bfs",
+            "name": "Bidirectional BFS",
+            "category": "Uninformed",
+        },
+        {
+            "id": "bidirectional_astar",
+            "name": "Bidirectional A*",
+            "category": "Informed",
+        },
         {"id": "dfs", "name": "Depth-First Search", "category": "Uninformed"},
         {"id": "dijkstra", "name": "Dijkstra", "category": "Informed"},
         {"id": "hill_climbing", "name": "Hill Climbing", "category": "Local Search"},
@@ -113,6 +545,7 @@ def get_algorithms(request):
             "category": "Local Search",
         },
         {"id": "genetic", "name": "Genetic Algorithm", "category": "Evolutionary"},
+        {"id": "auto", "name": "Automatic (cost model)", "category": "Automatic"},
     ]
     return Response(algorithms)
 
@@ -127,11 +560,19 @@ def get_simulation_types(request):
             "description": "Find shortest path in a grid with obstacles",
             "algorithms": [
                 "astar",
+                "ara_star",
+                "ida_star",
+                "fringe",
+                "jps",
+                "hpa",
                 "bfs",
+                "bidirectional_bfs",
+                "bidirectional_astar",
                 "dfs",
                 "dijkstra",
                 "hill_climbing",
                 "simulated_annealing",
+                "auto",
             ],
             "icon": "map",
         },